@@ -10,3 +10,36 @@ class RequestFailedException(APIBaseException):
 
 class InvalidResponseException(APIBaseException):
     pass
+
+
+class InvalidFieldsException(APIBaseException):
+    pass
+
+
+class SessionExpiredException(APIBaseException):
+    pass
+
+
+class LoginChallengeException(APIBaseException):
+    pass
+
+
+class LoginFailedException(APIBaseException):
+    pass
+
+
+class ThrottledException(APIBaseException):
+    def __init__(self, message: str = "", retry_after: float = None):
+        self.retry_after = retry_after
+        super().__init__(message)
+
+
+class NotFoundException(APIBaseException):
+    pass
+
+
+class CircuitOpenException(APIBaseException):
+    def __init__(self, message: str = "", retry_after: float = None, circuit: str = None):
+        self.retry_after = retry_after
+        self.circuit = circuit
+        super().__init__(message)
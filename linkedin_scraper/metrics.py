@@ -0,0 +1,79 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    In-process metrics registry with counters, gauges and timings.
+    Every metric is identified by a name and a set of labels.
+    The data is exposed through the admin metrics endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timings = {}
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = self._make_key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = self._make_key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """
+        Records a duration in seconds, keeping count, total and max.
+        """
+        key = self._make_key(name, labels)
+        with self._lock:
+            timing = self._timings.setdefault(key, {"count": 0, "total": 0.0, "max": 0.0})
+            timing["count"] += 1
+            timing["total"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Times the wrapped block and records it with `observe`.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start_time, **labels)
+
+    def snapshot(self) -> dict:
+        """
+        Returns all the metrics as a JSON serializable dict.
+        """
+        with self._lock:
+            counters = [self._format(key, {"value": value}) for key, value in self._counters.items()]
+            gauges = [self._format(key, {"value": value}) for key, value in self._gauges.items()]
+            timings = [
+                self._format(key, {
+                    "count": timing["count"],
+                    "total": round(timing["total"], 6),
+                    "mean": round(timing["total"] / timing["count"], 6),
+                    "max": round(timing["max"], 6),
+                })
+                for key, timing in self._timings.items()
+            ]
+        return {"counters": counters, "gauges": gauges, "timings": timings}
+
+    @staticmethod
+    def _make_key(name: str, labels: dict) -> tuple:
+        return name, tuple(sorted(labels.items()))
+
+    @staticmethod
+    def _format(key: tuple, values: dict) -> dict:
+        name, labels = key
+        return {"name": name, "labels": dict(labels), **values}
+
+
+METRICS = Metrics()
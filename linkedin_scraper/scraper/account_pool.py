@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+
+from dynaconf_config import settings
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         NotFoundException,
+                                         RequestFailedException,
+                                         SessionExpiredException,
+                                         ThrottledException)
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.requests import Request
+from linkedin_scraper.scraper.requests.response import Response
+from linkedin_scraper.scraper.sessions import SESSION_REGISTRY
+from linkedin_scraper.scraper.voyager import fetch_voyager
+
+logger = logging.getLogger("linkedin-scraper")
+
+
+@dataclass
+class PooledAccount:
+    email: str
+    password: str
+    account_id: str
+    request: Request
+    in_flight: int = 0
+    latency: float = None
+    error_rate: float = 0.0
+    throttles: int = 0
+    cooldown_until: float = 0.0
+
+
+class AccountPool:
+    """
+    Service accounts the profile fetches are spread across, so the
+    throughput isn't capped by the rate limit of a single account.
+
+    Every call goes to the least-loaded healthy account, scored by its
+    calls in flight, its latency and its error rate (moving averages).
+    Throttled accounts (429/999) and accounts with too many errors cool
+    down, for a time that doubles with every throttle in a row.
+    """
+
+    def __init__(self, accounts: list, cooldown: float, max_cooldown: float,
+                 max_error_rate: float, smoothing: float):
+        """
+        Args:
+            accounts (list): Dicts with the `email` and `password` of the accounts.
+            cooldown (float): Seconds an account rests after its first throttle.
+            max_cooldown (float): Max seconds an account rests.
+            max_error_rate (float): Error rate from which an account rests.
+            smoothing (float): Weight of the last call in the moving averages.
+        """
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.max_error_rate = max_error_rate
+        self.smoothing = smoothing
+        self.accounts = [
+            self._make_account(account["email"], account["password"])
+            for account in accounts
+        ]
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.accounts)
+
+    def pick(self) -> PooledAccount:
+        """
+        Returns the least-loaded healthy account,
+        None if every account is cooling down.
+        """
+        now = time.monotonic()
+        healthy_accounts = [
+            account for account in self.accounts if account.cooldown_until <= now
+        ]
+        METRICS.set_gauge("account_pool_healthy_accounts", len(healthy_accounts))
+        if not healthy_accounts:
+            return None
+
+        # Accounts without any latency yet are scored with the average one
+        latencies = [account.latency for account in self.accounts if account.latency]
+        default_latency = sum(latencies) / len(latencies) if latencies else 1.0
+        return min(healthy_accounts, key=lambda account: (
+            (account.in_flight + 1)
+            * (account.latency or default_latency)
+            * (1 + account.error_rate)
+        ))
+
+    async def fetch_voyager(self, account: PooledAccount, url: str,
+                            params: dict = None) -> Response:
+        """
+        Sends a Voyager API request with the session of a pooled account,
+        and records its latency and outcome.
+
+        Raises:
+            ThrottledException: If LinkedIn throttles the account.
+            RequestFailedException: If the request failed, LinkedIn rejected
+                the session of the account or its circuit is open. All are
+                worth a retry, which picks another account.
+        """
+        account.in_flight += 1
+        start_time = time.perf_counter()
+        try:
+            session = await SESSION_REGISTRY.get_session(
+                email=account.email, password=account.password
+            )
+            response = await fetch_voyager(account.request, session, url, params=params)
+
+        except ThrottledException:
+            self._record_throttle(account)
+            raise
+
+        except CircuitOpenException as exe:
+            if exe.circuit != "account:%s" % account.account_id:
+                raise
+            # Resting the account as long as its circuit is open,
+            # the retry picks another one
+            self._cool_down(account, exe.retry_after or self.cooldown)
+            raise RequestFailedException("Pooled account circuit open - %s" % exe.message)
+
+        except NotFoundException:
+            # Not a failure of the account
+            raise
+
+        except SessionExpiredException as exe:
+            # The session is dropped by `fetch_voyager`, the account
+            # logs in again the next time it is picked.
+            self._record_error(account)
+            raise RequestFailedException("Pooled account session rejected - %s" % exe.message)
+
+        except Exception:
+            self._record_error(account)
+            raise
+
+        finally:
+            account.in_flight -= 1
+
+        self._record_success(account, time.perf_counter() - start_time)
+        return response
+
+    def _record_success(self, account: PooledAccount, latency: float):
+        account.throttles = 0
+        account.error_rate *= 1 - self.smoothing
+        if account.latency is None:
+            account.latency = latency
+        else:
+            account.latency += self.smoothing * (latency - account.latency)
+
+    def _record_error(self, account: PooledAccount):
+        account.error_rate += self.smoothing * (1 - account.error_rate)
+        if account.error_rate >= self.max_error_rate:
+            # Starting over once rested, else it would never be picked again
+            account.error_rate = 0.0
+            self._cool_down(account, self.cooldown)
+
+    def _record_throttle(self, account: PooledAccount):
+        account.throttles += 1
+        METRICS.increment("account_pool_throttles_total", account=account.account_id)
+        cooldown = self.cooldown * 2 ** (account.throttles - 1)
+        self._cool_down(account, min(cooldown, self.max_cooldown))
+
+    def _cool_down(self, account: PooledAccount, seconds: float):
+        account.cooldown_until = max(account.cooldown_until, time.monotonic() + seconds)
+        logger.warning("Pooled account %s cooling down for %.0fs", account.account_id, seconds)
+
+    @staticmethod
+    def _make_account(email: str, password: str) -> PooledAccount:
+        # Same identifier as the session registry and the logs
+        credentials = f"{email}|{password}"
+        account_id = hashlib.md5(credentials.encode()).hexdigest()
+        return PooledAccount(
+            email=email,
+            password=password,
+            account_id=account_id,
+            request=Request(account=account_id),
+        )
+
+
+ACCOUNT_POOL = AccountPool(
+    accounts=settings.ACCOUNT_POOL,
+    cooldown=settings.ACCOUNT_POOL_COOLDOWN,
+    max_cooldown=settings.ACCOUNT_POOL_MAX_COOLDOWN,
+    max_error_rate=settings.ACCOUNT_POOL_MAX_ERROR_RATE,
+    smoothing=settings.ACCOUNT_POOL_SMOOTHING,
+)
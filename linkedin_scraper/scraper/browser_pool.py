@@ -0,0 +1,260 @@
+import logging
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from selenium import webdriver
+from selenium_stealth import stealth
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+
+logger = logging.getLogger("linkedin-scraper")
+
+# Resources the login page doesn't need to work
+BLOCKED_URLS = [
+    "*.css", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg",
+    "*.webp", "*.ico", "*.woff", "*.woff2", "*.ttf",
+]
+
+
+@dataclass
+class PooledDriver:
+    driver: object
+    profile_dir: str
+    uses: int = 0
+    released_at: float = 0
+
+
+class BrowserPool:
+    """
+    Thread-safe pool of warm, headless Chrome drivers for the selenium logins.
+
+    Every driver has its own profile directory and is reset between two
+    logins. Images, stylesheets and fonts are blocked and pages are loaded
+    with the `eager` strategy. Drivers are recycled after `max_uses` logins
+    to limit the leaks of long-running Chrome processes, and quit once idle
+    for `idle_timeout` seconds, so the pool fills and empties with the logins.
+    """
+
+    def __init__(self, size: int, max_uses: int, idle_timeout: float = 600):
+        """
+        Args:
+            size (int): Max number of drivers alive at the same time.
+            max_uses (int): Logins done by a driver before it is replaced.
+            idle_timeout (float): Seconds after which an unused driver is quit, 0 to keep them.
+        """
+        self.size = size
+        self.max_uses = max_uses
+        self.idle_timeout = idle_timeout
+        self._idle_drivers = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._alive_drivers = 0
+        self._idle_timer = None
+        self._closed = False
+
+    def warm_up(self):
+        """
+        Launches the drivers up front, so the first logins don't pay
+        the Chrome startup. Blocking, until the pool is full or closed.
+        """
+        while True:
+            with self._lock:
+                if self._closed or self._alive_drivers >= self.size:
+                    return
+                self._alive_drivers += 1
+
+            try:
+                pooled_driver = self._launch_driver()
+            except Exception:
+                with self._lock:
+                    self._alive_drivers -= 1
+                raise
+
+            with self._lock:
+                closed = self._closed
+            if closed:
+                # The pool was closed while the driver was launching
+                self._discard(pooled_driver)
+                return
+
+            pooled_driver.released_at = time.monotonic()
+            self._idle_drivers.put(pooled_driver)
+            self._schedule_idle_check()
+
+    @contextmanager
+    def driver(self):
+        """
+        Lends a driver for one login. Blocks while all the drivers are busy.
+        A driver that raised is quit instead of being reused.
+        """
+        with METRICS.timer("browser_pool_wait_seconds"):
+            pooled_driver = self._acquire()
+
+        try:
+            yield pooled_driver.driver
+        except Exception:
+            self._discard(pooled_driver)
+            raise
+
+        pooled_driver.uses += 1
+        self._release(pooled_driver)
+
+    def close(self):
+        """
+        Quits the idle drivers and stops the warm-up. Called on application shutdown.
+        """
+        with self._lock:
+            self._closed = True
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+
+        while True:
+            try:
+                pooled_driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(pooled_driver)
+
+    def _acquire(self) -> PooledDriver:
+        while True:
+            try:
+                return self._idle_drivers.get_nowait()
+            except queue.Empty:
+                pass
+
+            # Launching a new driver if the pool isn't full, else waiting for one
+            with self._lock:
+                can_launch = self._alive_drivers < self.size
+                if can_launch:
+                    self._alive_drivers += 1
+
+            if can_launch:
+                try:
+                    return self._launch_driver()
+                except Exception:
+                    with self._lock:
+                        self._alive_drivers -= 1
+                    raise
+
+            try:
+                # Checking again from time to time, as a busy driver
+                # may be discarded instead of coming back
+                return self._idle_drivers.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def _release(self, pooled_driver: PooledDriver):
+        if pooled_driver.uses >= self.max_uses:
+            self._discard(pooled_driver)
+            return
+
+        try:
+            self._reset_driver(pooled_driver.driver)
+        except Exception:
+            logger.exception("Failed to reset a pooled Chrome driver")
+            self._discard(pooled_driver)
+            return
+
+        pooled_driver.released_at = time.monotonic()
+        self._idle_drivers.put(pooled_driver)
+        METRICS.set_gauge("browser_pool_idle_drivers", self._idle_drivers.qsize())
+        self._schedule_idle_check()
+
+    def _schedule_idle_check(self):
+        """
+        Checks for idle drivers `idle_timeout` seconds after the last release.
+        """
+        if self.idle_timeout <= 0:
+            return
+
+        with self._lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+            self._idle_timer = threading.Timer(self.idle_timeout, self._close_idle_drivers)
+            self._idle_timer.daemon = True
+            self._idle_timer.start()
+
+    def _close_idle_drivers(self):
+        expired_at = time.monotonic() - self.idle_timeout
+        kept_drivers = []
+        while True:
+            try:
+                pooled_driver = self._idle_drivers.get_nowait()
+            except queue.Empty:
+                break
+
+            if pooled_driver.released_at > expired_at:
+                kept_drivers.append(pooled_driver)
+            else:
+                self._discard(pooled_driver)
+                METRICS.increment("browser_pool_idle_closed_total")
+
+        # Putting the kept drivers back in their order, the most recently used last
+        for pooled_driver in reversed(kept_drivers):
+            self._idle_drivers.put(pooled_driver)
+        METRICS.set_gauge("browser_pool_idle_drivers", self._idle_drivers.qsize())
+
+    def _discard(self, pooled_driver: PooledDriver):
+        try:
+            pooled_driver.driver.quit()
+        except Exception:
+            logger.exception("Failed to quit a pooled Chrome driver")
+        finally:
+            shutil.rmtree(pooled_driver.profile_dir, ignore_errors=True)
+            with self._lock:
+                self._alive_drivers -= 1
+
+    def _launch_driver(self) -> PooledDriver:
+        """
+        Launches a headless Chrome instance with anti-detection settings,
+        in an isolated profile directory.
+        """
+        start_time = time.perf_counter()
+        profile_dir = tempfile.mkdtemp(prefix="linkedin-chrome-")
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option("useAutomationExtension", False)
+        options.page_load_strategy = "eager"
+        try:
+            driver = webdriver.Chrome(options=options)
+            stealth(driver, languages=["en-US", "en"], platform="Linux")
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        except Exception:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+            raise
+
+        METRICS.observe("browser_launch_seconds", time.perf_counter() - start_time)
+        return PooledDriver(driver=driver, profile_dir=profile_dir)
+
+    @staticmethod
+    def _reset_driver(driver):
+        """
+        Clears the cookies and storage of the previous login.
+        """
+        driver.delete_all_cookies()
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+            "origin": "https://www.linkedin.com",
+            "storageTypes": "all",
+        })
+        driver.get("about:blank")
+
+
+BROWSER_POOL = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    max_uses=settings.BROWSER_POOL_MAX_USES,
+    idle_timeout=settings.BROWSER_POOL_IDLE_TIMEOUT,
+)
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.requests.rate_limiter import TokenBucket
+
+logger = logging.getLogger("linkedin-scraper")
+
+
+@dataclass
+class _Prefetch:
+    task: asyncio.Task
+    timer: asyncio.TimerHandle
+
+
+class ConnectionsPrefetcher:
+    """
+    Scrapes the next connections page in the background once a page is
+    returned, so the profiles are in the profile cache when the client
+    asks for it.
+
+    Every account has a budget of `pages_per_hour` prefetched pages, with
+    at most `burst` at once. A prefetch the client didn't ask for within
+    `ttl` seconds is cancelled.
+
+    The prefetch runs in the gunicorn worker that returned the page, and so
+    do its budgets. The next request only uses it if it lands on the same
+    worker, or if the profile cache has its disk tier (`PROFILE_CACHE_DISK`),
+    which all the workers of the host read.
+    """
+
+    def __init__(self, pages_per_hour: float, burst: float, ttl: float):
+        """
+        Args:
+            pages_per_hour (float): Pages an account can prefetch per hour.
+            burst (float): Pages an account can prefetch at once.
+            ttl (float): Seconds a prefetched page waits for the client.
+        """
+        self.pages_per_hour = pages_per_hour
+        self.burst = burst
+        self.ttl = ttl
+        self._budgets = {}
+        self._prefetches = {}
+
+    def schedule(self, account_id: str, snapshot_id: str, offset: int, func, *args) -> bool:
+        """
+        Runs `func(*args)` in the background to prefetch the page at `offset`
+        of the snapshot. Returns False if the budget of the account is spent.
+        """
+        key = (account_id, snapshot_id, offset)
+        if key in self._prefetches:
+            return True
+
+        budget = self._budgets.get(account_id)
+        if budget is None:
+            budget = TokenBucket(rate=self.pages_per_hour / 3600, burst=self.burst)
+            self._budgets[account_id] = budget
+        if budget.reserve() > 0:
+            budget.refund()
+            METRICS.increment("connections_prefetch_skipped_total")
+            return False
+
+        loop = asyncio.get_running_loop()
+        self._prefetches[key] = _Prefetch(
+            task=loop.create_task(self._run(func, *args)),
+            timer=loop.call_later(self.ttl, self._expire, key),
+        )
+        METRICS.increment("connections_prefetch_started_total")
+        return True
+
+    def claim(self, account_id: str, snapshot_id: str, offset: int):
+        """
+        Marks the prefetched page as asked for by the client. A prefetch still
+        running is left running, the client joins its calls.
+        """
+        prefetch = self._prefetches.pop((account_id, snapshot_id, offset), None)
+        if prefetch is None:
+            return
+
+        prefetch.timer.cancel()
+        METRICS.increment("connections_prefetch_claimed_total")
+
+    async def stop(self):
+        prefetches = list(self._prefetches.values())
+        self._prefetches.clear()
+        for prefetch in prefetches:
+            prefetch.timer.cancel()
+            prefetch.task.cancel()
+        await asyncio.gather(*[prefetch.task for prefetch in prefetches], return_exceptions=True)
+
+    def _expire(self, key: tuple):
+        prefetch = self._prefetches.pop(key, None)
+        if prefetch is None:
+            return
+
+        if prefetch.task.done():
+            METRICS.increment("connections_prefetch_wasted_total")
+        else:
+            METRICS.increment("connections_prefetch_cancelled_total")
+            prefetch.task.cancel()
+
+    @staticmethod
+    async def _run(func, *args):
+        try:
+            await func(*args)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exe:
+            # The client scrapes the page itself when it comes
+            logger.warning("Connections prefetch failed - %s", exe)
+
+
+CONNECTIONS_PREFETCHER = ConnectionsPrefetcher(
+    pages_per_hour=settings.CONNECTIONS_PREFETCH_PAGES_PER_HOUR,
+    burst=settings.CONNECTIONS_PREFETCH_BURST,
+    ttl=settings.CONNECTIONS_PREFETCH_TTL,
+)
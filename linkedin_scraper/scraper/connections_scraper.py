@@ -1,36 +1,85 @@
 import asyncio
-from copy import deepcopy
-
-from tenacity import retry, stop_after_attempt
+import logging
+from contextlib import nullcontext
+from dataclasses import dataclass
 
 from dynaconf_config import settings
-from linkedin_scraper.scraper.login import Login
+from linkedin_scraper.exceptions import SessionExpiredException
+from linkedin_scraper.scraper.account_pool import ACCOUNT_POOL
+from linkedin_scraper.scraper.connections_prefetcher import \
+    CONNECTIONS_PREFETCHER
+from linkedin_scraper.scraper.connections_snapshots import (
+    CONNECTIONS_SNAPSHOTS, LISTING_PAGE_SIZE)
+from linkedin_scraper.scraper.fields import keep_identifier, plan_endpoints
 from linkedin_scraper.scraper.parser import LinkedinParser
+from linkedin_scraper.scraper.profile_cache import PROFILE_CACHE
 from linkedin_scraper.scraper.profile_scraper import LinkedinProfileScraper
 from linkedin_scraper.scraper.requests import Request
+from linkedin_scraper.scraper.retry_policy import (RetryBudget,
+                                                   retry_budget,
+                                                   retry_voyager_call)
+from linkedin_scraper.scraper.sessions import SESSION_REGISTRY
 from linkedin_scraper.scraper.utils import (decode_pagination_id,
-                                            encode_pagination_id, get_headers)
+                                            encode_pagination_id)
+from linkedin_scraper.scraper.voyager import fetch_voyager
+
+logger = logging.getLogger("linkedin-scraper")
+
+
+@dataclass
+class CrawlResult:
+    """
+    Outcome of a crawled connection: its profile data, or the error
+    message if it failed. Listing failures have no public identifier.
+    """
+
+    public_identifier: str = None
+    profile: dict = None
+    error: str = None
 
 
 class LinkedinConnectionsScraper:
-    def __init__(self, email, password, pagination_id: str = None):
+    def __init__(self, email=None, password=None, pagination_id: str = None,
+                 fields: list = None, cookies: dict = None,
+                 max_age: float = None, no_cache: bool = False,
+                 prefetch: bool = False):
         self.email = email
         self.password = password
+        self.session_cookies = cookies
         self.pagination_id = pagination_id
-        self.session = Login(email=self.email, password=self.password)
-        self.cookies = self.session.get_cookie()
-        self.request = Request()
+        self.fields = fields
+        self.max_age = max_age
+        self.no_cache = no_cache
+        self.prefetch = prefetch
+        self.session = None
+        self.cookies = None
+        self.request = None
+
+    async def login(self):
+        """
+        Gets the session of the request from the session registry
+        (see `SessionRegistry.resolve`). It is awaited by the scraping
+        methods, so the constructor never blocks.
+        """
+        if self.session:
+            return
+
+        self.session = await SESSION_REGISTRY.resolve(
+            email=self.email, password=self.password, cookies=self.session_cookies
+        )
+        self.cookies = self.session.cookies
+        self.request = Request(account=self.session.account_id)
 
-    @retry(stop=stop_after_attempt(10))
-    async def _get_listing_data(self, page_number):
+    @retry_voyager_call
+    async def _get_listing_data(self, start_index):
         """
-        Extracts the connections profile IDs
+        Extracts the connections profile IDs of the
+        listing page starting at `start_index`
         and returns it as a list
         """
-        start_index = 40 * page_number
         params = {
             "decorationId": "com.linkedin.voyager.dash.deco.web.mynetwork.ConnectionListWithProfile-16",
-            "count": "40",
+            "count": str(LISTING_PAGE_SIZE),
             "q": "search",
             "sortType": "RECENTLY_ADDED",
             "start": str(start_index),
@@ -38,11 +87,7 @@ class LinkedinConnectionsScraper:
 
         # Sending API request
         api_url = "https://www.linkedin.com/voyager/api/relationships/dash/connections"
-        headers = deepcopy(get_headers(header_type="profile_page"))
-        headers["csrf-token"] = self.cookies["JSESSIONID"].replace('"', "").strip()
-        response = await self.request.fetch(
-            url=api_url, params=params, headers=headers, cookies=self.cookies
-        )
+        response = await fetch_voyager(self.request, self.session, api_url, params=params)
 
         # Extracting profiles-ids of the connections
         parser = LinkedinParser(response)
@@ -51,25 +96,33 @@ class LinkedinConnectionsScraper:
 
     async def get_connections_data(self):
         """
-        This is the main function that calls the `_get_listing_data`
-        and sending async-requests with thread-lock to scrape all the data.
+        This is the main function that takes a page of the connections from
+        the listing snapshot of the account (see `ConnectionsSnapshots`)
+        and sending async-requests to scrape all the data.
+        The pagination ID carries the snapshot and the offset of the next page.
+
+        With `prefetch`, the next page is scraped in the background into the
+        profile cache once this one is returned (see `ConnectionsPrefetcher`).
         """
 
-        # Getting pagenumber from pagination_id
-        page_number = (
-            decode_pagination_id(self.pagination_id)
-            if self.pagination_id
-            else 0
-        )
+        # Rejecting unknown fields before sending any request
+        plan_endpoints(self.fields)
+        await self.login()
 
-        # Extracting the listings of the profiles in the connections
-        connections_profile_ids = await self._get_listing_data(page_number=page_number)
-        # Scraping all the profile data
-        profile_data = await self.scrape_profile_data(connections_profile_ids)
+        # Getting the snapshot and offset from pagination_id
+        snapshot, offset = self._get_snapshot()
+
+        # The listing and profile calls share one retry budget
+        with retry_budget():
+            # Extracting the listings of the profiles in the connections
+            connections_profile_ids = await CONNECTIONS_SNAPSHOTS.get_profile_ids(
+                snapshot, offset, LISTING_PAGE_SIZE, self._get_listing_data
+            )
+            # Scraping all the profile data
+            profile_data = await self.scrape_profile_data(connections_profile_ids)
 
         # Setting up next pagination ID
-        next_page_number = page_number + 1
-        next_pagination_id = encode_pagination_id(next_page_number)
+        next_pagination_id = self._end_page(snapshot, offset, connections_profile_ids)
 
         connections_data = {
             "profiles": profile_data,
@@ -79,18 +132,321 @@ class LinkedinConnectionsScraper:
 
     async def scrape_profile_data(self, connections_profile_ids):
         """
-        Scraping a list of profile pages, with thread-locking system
-        `Semaphone`. Max-Worker is 5. It will return the profile data
-        as list.
+        Scraping a list of profile pages. The concurrency is set by the
+        adaptive windows of the accounts and proxies (see `ConcurrencyLimiter`).
+        It will return the profile data as list, with only the requested `fields`
+        and the `public_id` of each connection.
+
+        When service accounts are registered in the `ACCOUNT_POOL` setting,
+        the profile calls are spread across them (see `AccountPool`).
+        """
+        await self.login()
+        scraper = self._get_profile_scraper()
+
+        tasks = [
+            scraper.get_profile_data(
+                public_identifier=profile_id, fields=self.fields,
+                max_age=self.max_age, no_cache=self.no_cache,
+            )
+            for profile_id in connections_profile_ids
+        ]
+        all_profile_data = await asyncio.gather(*tasks)
+        return [
+            keep_identifier(profile_data, profile_id)
+            for profile_id, profile_data in zip(connections_profile_ids, all_profile_data)
+        ]
+
+    async def crawl_connections(self):
+        """
+        Crawls all the connections of the account, yielding a `CrawlResult`
+        per connection as soon as its profile is scraped (not in listing order).
+
+        The listing pages are fetched by a producer into a bounded queue, read
+        by the profile workers (see `_stream_profiles`). So the next listing page
+        is fetched while the profiles of the current one are in flight, and the
+        throughput is only set by the rate limiter and the concurrency windows.
+        The crawl stops on the first empty listing page. A listing page failing
+        after the first one ends the crawl with an error result. LinkedIn
+        rejecting the session stops the whole crawl.
+
+        Raises:
+            SessionExpiredException: If LinkedIn rejected the session of the account.
+            Exception: The error of the first listing page, if it failed.
+        """
+        # Rejecting unknown fields before sending any request
+        plan_endpoints(self.fields)
+        await self.login()
+
+        results = self._stream_profiles(self._crawl_listing)
+        try:
+            async for result in results:
+                yield result
+        finally:
+            await results.aclose()
+
+    async def crawl_connections_data(self):
+        """
+        Crawls all the connections of the account (see `crawl_connections`).
+
+        Returns:
+            dict: The `profiles` and the `errors` of the failed connections.
+        """
+        profiles = []
+        errors = []
+        async for result in self.crawl_connections():
+            if result.error is None:
+                profiles.append(result.profile)
+            else:
+                errors.append({"public_identifier": result.public_identifier, "error": result.error})
+        return {"profiles": profiles, "errors": errors}
+
+    async def stream_crawl_records(self):
+        """
+        Streaming variant of `crawl_connections_data`. It yields a `{"profile": ...}`
+        record per connection as soon as its profile is scraped, a `{"failed": ...}`
+        record with the `public_identifier` and `error` of every failed connection,
+        then a last record with the number of `profiles` and `errors`. Nothing is
+        kept in memory, however many connections the account has.
+        """
+        profiles = 0
+        errors = 0
+        results = self.crawl_connections()
+        try:
+            async for result in results:
+                if result.error is None:
+                    profiles += 1
+                    yield {"profile": result.profile}
+                else:
+                    errors += 1
+                    yield {"failed": {"public_identifier": result.public_identifier, "error": result.error}}
+        finally:
+            await results.aclose()
+
+        yield {"profiles": profiles, "errors": errors}
+
+    async def stream_connections_data(self):
+        """
+        Streaming variant of `get_connections_data`. It yields a `{"profile": ...}`
+        record per connection of the page as soon as its profile is scraped
+        (not in listing order), then a last record with the next `pagination_id`
+        and the `errors` of the failed connections.
+
+        The profiles are scraped by the profile workers (see `_stream_profiles`).
+        As in `get_connections_data`, the listing and profile calls of the page
+        share one retry budget.
+        """
+        # Rejecting unknown fields before sending any request
+        plan_endpoints(self.fields)
+        await self.login()
+
+        snapshot, offset = self._get_snapshot()
+        with retry_budget() as budget:
+            connections_profile_ids = await CONNECTIONS_SNAPSHOTS.get_profile_ids(
+                snapshot, offset, LISTING_PAGE_SIZE, self._get_listing_data
+            )
+
+        async def put_profile_ids(profile_ids: asyncio.Queue, results: asyncio.Queue):
+            for profile_id in connections_profile_ids:
+                await profile_ids.put(profile_id)
+
+        errors = []
+        results = self._stream_profiles(put_profile_ids, budget=budget)
+        try:
+            async for result in results:
+                if result.error is None:
+                    yield {"profile": result.profile}
+                else:
+                    errors.append({"public_identifier": result.public_identifier, "error": result.error})
+        finally:
+            await results.aclose()
+
+        yield {
+            "pagination_id": self._end_page(snapshot, offset, connections_profile_ids),
+            "errors": errors,
+        }
+
+    def _get_snapshot(self) -> tuple:
+        """
+        Returns the listing snapshot and the offset of the page to scrape.
+        """
+        cursor = (
+            decode_pagination_id(self.pagination_id)
+            if self.pagination_id
+            else {"snapshot_id": None, "offset": 0}
+        )
+        snapshot = CONNECTIONS_SNAPSHOTS.get_snapshot(
+            self.session.account_id, snapshot_id=cursor["snapshot_id"], offset=cursor["offset"]
+        )
+        CONNECTIONS_PREFETCHER.claim(self.session.account_id, snapshot.snapshot_id, cursor["offset"])
+        return snapshot, cursor["offset"]
+
+    def _end_page(self, snapshot, offset: int, connections_profile_ids: list) -> str:
+        """
+        Returns the pagination ID of the next page,
+        and starts its prefetch if asked for.
+        """
+        next_offset = offset + len(connections_profile_ids)
+
+        # Only worth it if the next request can use the prefetched profiles
+        if self.prefetch and connections_profile_ids and PROFILE_CACHE.enabled and not self.no_cache:
+            CONNECTIONS_PREFETCHER.schedule(
+                self.session.account_id, snapshot.snapshot_id, next_offset,
+                self._prefetch_page, snapshot, next_offset,
+            )
+
+        return encode_pagination_id(
+            next_offset // LISTING_PAGE_SIZE,
+            snapshot_id=snapshot.snapshot_id,
+            offset=next_offset,
+        )
+
+    async def _stream_profiles(self, produce, budget: RetryBudget = None):
         """
-        scraper = LinkedinProfileScraper(email=self.email, password=self.password)
+        Scrapes the profiles put in a bounded queue by `produce`, with
+        `CONNECTIONS_CRAWL_WORKERS` workers, and yields a `CrawlResult` per
+        profile as soon as it is scraped. The results go through a bounded
+        queue too, so the memory stays flat however many profiles there are.
 
-        semaphore = asyncio.Semaphore(6)
-        async def worker(profile_id):
+        Args:
+            produce: Async function putting the profile ids in the queue
+                it is given, and the `CrawlResult` of its own errors in
+                the results queue.
+            budget (RetryBudget, optional): Retry budget shared by all the
+                profiles. Without it, every profile gets its own budget.
+        """
+        profile_ids = asyncio.Queue(maxsize=settings.CONNECTIONS_CRAWL_QUEUE_SIZE)
+        results = asyncio.Queue(maxsize=settings.CONNECTIONS_CRAWL_QUEUE_SIZE)
+        pipeline = asyncio.ensure_future(
+            self._run_pipeline(produce, profile_ids, results, budget=budget)
+        )
+        get_result = None
+        try:
+            while True:
+                get_result = asyncio.ensure_future(results.get())
+                await asyncio.wait({get_result, pipeline}, return_when=asyncio.FIRST_COMPLETED)
+                if get_result.done():
+                    yield get_result.result()
+                    continue
+
+                # Pipeline over, yielding what is left
+                get_result.cancel()
+                while not results.empty():
+                    yield results.get_nowait()
+                pipeline.result()
+                return
+        finally:
+            if get_result is not None:
+                get_result.cancel()
+            pipeline.cancel()
+            await asyncio.gather(pipeline, return_exceptions=True)
+
+    async def _run_pipeline(self, produce, profile_ids: asyncio.Queue, results: asyncio.Queue,
+                            budget: RetryBudget = None):
+        scraper = self._get_profile_scraper()
+
+        # The workers copy the context, so they all see the shared budget
+        with retry_budget(budget=budget) if budget else nullcontext():
+            workers = [
+                asyncio.ensure_future(self._crawl_profiles(scraper, profile_ids, results))
+                for _ in range(settings.CONNECTIONS_CRAWL_WORKERS)
+            ]
+
+        async def produce_all():
+            await produce(profile_ids, results)
+            # Waiting for the workers to scrape the last profiles
+            await profile_ids.join()
+
+        producer = asyncio.ensure_future(produce_all())
+        try:
+            # The workers only stop on an error that ends the pipeline
+            done, _ = await asyncio.wait({producer, *workers}, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        finally:
+            for task in (producer, *workers):
+                task.cancel()
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+
+    async def _crawl_listing(self, profile_ids: asyncio.Queue, results: asyncio.Queue):
+        seen_profile_ids = set()
+        start_index = 0
+        while True:
+            try:
+                with retry_budget():
+                    page_profile_ids = await self._get_listing_data(start_index)
+            except SessionExpiredException:
+                raise
+            except Exception as exe:
+                if not start_index:
+                    raise
+                # Keeping the profiles crawled so far
+                logger.warning("Connections crawl stopped at %s - %s", start_index, exe)
+                await results.put(CrawlResult(error=getattr(exe, "message", None) or str(exe)))
+                return
+
+            if not page_profile_ids:
+                return
+
+            # The connections added mid-crawl shift the listing
+            for profile_id in page_profile_ids:
+                if profile_id not in seen_profile_ids:
+                    seen_profile_ids.add(profile_id)
+                    await profile_ids.put(profile_id)
+            start_index += LISTING_PAGE_SIZE
+
+    async def _crawl_profiles(self, scraper: LinkedinProfileScraper,
+                              profile_ids: asyncio.Queue, results: asyncio.Queue):
+        while True:
+            profile_id = await profile_ids.get()
+            try:
+                # Every profile gets the retry budget of an API request,
+                # unless the pipeline shares one across the profiles
+                with retry_budget():
+                    profile = await scraper.get_profile_data(
+                        public_identifier=profile_id, fields=self.fields,
+                        max_age=self.max_age, no_cache=self.no_cache,
+                    )
+                result = CrawlResult(
+                    public_identifier=profile_id, profile=keep_identifier(profile, profile_id)
+                )
+            except SessionExpiredException:
+                # Every other profile would be rejected too, stopping the pipeline
+                raise
+            except Exception as exe:
+                error = getattr(exe, "message", None) or str(exe)
+                result = CrawlResult(public_identifier=profile_id, error=error)
+
+            try:
+                await results.put(result)
+            finally:
+                profile_ids.task_done()
+
+    async def _prefetch_page(self, snapshot, offset):
+        """
+        Scrapes the connections page at `offset` of the snapshot into the
+        profile cache, `CONNECTIONS_PREFETCH_CONCURRENCY` profiles at a time,
+        so the requests of the clients keep most of the rate of the account.
+        """
+        scraper = self._get_profile_scraper()
+        semaphore = asyncio.Semaphore(settings.CONNECTIONS_PREFETCH_CONCURRENCY)
+
+        async def prefetch_profile(profile_id):
             async with semaphore:
-                profile_data = await scraper.get_profile_data(public_identifier=profile_id)
-                return profile_data
+                await scraper.get_profile_data(public_identifier=profile_id, fields=self.fields)
 
-        tasks = [worker(profile_id) for profile_id in connections_profile_ids]
-        all_profile_data = await asyncio.gather(*tasks)
-        return all_profile_data
+        with retry_budget():
+            connections_profile_ids = await CONNECTIONS_SNAPSHOTS.get_profile_ids(
+                snapshot, offset, LISTING_PAGE_SIZE, self._get_listing_data
+            )
+            # A failed profile is scraped again by the client request
+            await asyncio.gather(
+                *[prefetch_profile(profile_id) for profile_id in connections_profile_ids],
+                return_exceptions=True,
+            )
+
+    def _get_profile_scraper(self) -> LinkedinProfileScraper:
+        account_pool = ACCOUNT_POOL if ACCOUNT_POOL.enabled else None
+        return LinkedinProfileScraper(
+            email=self.email, password=self.password, session=self.session,
+            account_pool=account_pool,
+        )
@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+
+logger = logging.getLogger("linkedin-scraper")
+
+# Connections per listing page of the Voyager API
+LISTING_PAGE_SIZE = 40
+
+
+@dataclass
+class ConnectionsSnapshot:
+    """
+    Connections listing of an account, as fetched so far. `profile_ids[i]`
+    is at offset `base + i` of the listing, and the listing pages are
+    fetched from `next_start` on. It is `paginating` once a pagination ID
+    brought the client back to it.
+    """
+
+    snapshot_id: str
+    account_id: str
+    base: int
+    next_start: int
+    profile_ids: list = field(default_factory=list)
+    complete: bool = False
+    paginating: bool = False
+    used_at: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def add_profile_ids(self, profile_ids: list):
+        # The connections added mid-crawl shift the listing, so the
+        # later pages repeat some profiles already in the snapshot
+        seen_profile_ids = set(self.profile_ids)
+        self.profile_ids.extend(
+            profile_id for profile_id in profile_ids if profile_id not in seen_profile_ids
+        )
+
+
+class ConnectionsSnapshots:
+    """
+    Snapshots of the connections listings, so the pages of a crawl are
+    cut from the same listing and only the missing listing pages are
+    fetched. A new snapshot fetches one listing page at a time, and
+    `batch_pages` at once when the client paginates through it.
+
+    The snapshots are kept in the process, the `max_size` most recently
+    used ones, until unused for `ttl` seconds. They aren't shared by the
+    gunicorn workers: a pagination ID served by another worker misses
+    its snapshot, and the page is cut from a new one of the live listing.
+    """
+
+    def __init__(self, max_size: int, ttl: float, batch_pages: int):
+        """
+        Args:
+            max_size (int): Max snapshots kept.
+            ttl (float): Seconds an unused snapshot is kept.
+            batch_pages (int): Listing pages fetched at once.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.batch_pages = batch_pages
+        self._snapshots = OrderedDict()
+
+    def get_snapshot(self, account_id: str, snapshot_id: str = None,
+                     offset: int = 0) -> ConnectionsSnapshot:
+        """
+        Returns the snapshot of the account, or a new one starting at `offset`
+        of the listing if it is unknown (expired, or made by another worker).
+        """
+        self._drop_expired_snapshots()
+
+        snapshot = self._snapshots.get(snapshot_id)
+        if snapshot is not None and snapshot.account_id == account_id and offset >= snapshot.base:
+            self._snapshots.move_to_end(snapshot_id)
+            snapshot.used_at = time.monotonic()
+            snapshot.paginating = True
+            return snapshot
+
+        if snapshot_id:
+            METRICS.increment("connections_snapshot_misses_total")
+            logger.debug("Connections snapshot %s not found, starting at %s", snapshot_id, offset)
+
+        snapshot = ConnectionsSnapshot(
+            snapshot_id=uuid.uuid4().hex,
+            account_id=account_id,
+            base=offset,
+            next_start=offset,
+        )
+        self._snapshots[snapshot.snapshot_id] = snapshot
+        while len(self._snapshots) > self.max_size:
+            self._snapshots.popitem(last=False)
+        return snapshot
+
+    async def get_profile_ids(self, snapshot: ConnectionsSnapshot, offset: int,
+                              count: int, fetch_listing_page) -> list:
+        """
+        Returns the profile ids at `offset` to `offset + count` of the listing,
+        fetching the listing pages the snapshot is missing.
+
+        Args:
+            snapshot (ConnectionsSnapshot): Snapshot of the listing.
+            offset (int): Offset in the listing.
+            count (int): Number of profile ids.
+            fetch_listing_page: Async function returning the profile ids
+                of the listing page starting at a given offset.
+        """
+        start = offset - snapshot.base
+        async with snapshot.lock:
+            while len(snapshot.profile_ids) < start + count and not snapshot.complete:
+                await self._fetch_listing_pages(snapshot, fetch_listing_page)
+        return snapshot.profile_ids[start:start + count]
+
+    async def _fetch_listing_pages(self, snapshot: ConnectionsSnapshot, fetch_listing_page):
+        # Not fetching ahead for a client that may never ask for the next page
+        batch_pages = self.batch_pages if snapshot.paginating else 1
+        starts = [
+            snapshot.next_start + LISTING_PAGE_SIZE * page for page in range(batch_pages)
+        ]
+        tasks = [asyncio.ensure_future(fetch_listing_page(start)) for start in starts]
+        try:
+            pages = await asyncio.gather(*tasks)
+        except BaseException:
+            # Not leaving the other pages fetching if one of them failed
+            for task in tasks:
+                task.cancel()
+            raise
+        METRICS.increment("connections_listing_pages_total", len(pages))
+
+        snapshot.next_start += LISTING_PAGE_SIZE * len(pages)
+        for profile_ids in pages:
+            if not profile_ids:
+                # End of the listing
+                snapshot.complete = True
+                break
+            snapshot.add_profile_ids(profile_ids)
+
+    def _drop_expired_snapshots(self):
+        expired_at = time.monotonic() - self.ttl
+        while self._snapshots:
+            snapshot = next(iter(self._snapshots.values()))
+            if snapshot.used_at > expired_at:
+                break
+            self._snapshots.popitem(last=False)
+
+
+CONNECTIONS_SNAPSHOTS = ConnectionsSnapshots(
+    max_size=settings.CONNECTIONS_SNAPSHOT_MAX_SIZE,
+    ttl=settings.CONNECTIONS_SNAPSHOT_TTL,
+    batch_pages=settings.CONNECTIONS_LISTING_BATCH_PAGES,
+)
@@ -0,0 +1,55 @@
+import os
+
+from dynaconf_config import settings
+from linkedin_scraper.scraper.cookie_stores.abstract import CookieStore
+from linkedin_scraper.scraper.cookie_stores.cached import CachedCookieStore
+from linkedin_scraper.scraper.cookie_stores.file import FileCookieStore
+from linkedin_scraper.scraper.cookie_stores.key_value import (
+    KeyValueCookieStore, LocalKeyValueClient)
+from linkedin_scraper.scraper.cookie_stores.memory import MemoryCookieStore
+from linkedin_scraper.scraper.cookie_stores.sqlite import SQLiteCookieStore
+
+# Default location of the file and SQLite stores
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache")
+
+
+def get_cookie_store() -> CookieStore:
+    """
+    Builds the cookie store picked by the `COOKIE_STORE` setting:
+        - "file": One JSON file per account, in `COOKIE_STORE_PATH`.
+        - "memory": In-process LRU of `COOKIE_STORE_MAX_SIZE` accounts.
+        - "sqlite": SQLite database at `COOKIE_STORE_PATH`.
+        - "key_value": Redis at `COOKIE_STORE_URL`, or an in-process
+          stand-in when no URL is set.
+
+    The persistent stores are wrapped in a `CachedCookieStore`.
+    """
+    store_type = settings.COOKIE_STORE
+    store_path = settings.COOKIE_STORE_PATH
+
+    if store_type == "memory":
+        return MemoryCookieStore(max_size=settings.COOKIE_STORE_MAX_SIZE)
+
+    if store_type == "file":
+        store = FileCookieStore(directory=store_path or CACHE_DIR)
+
+    elif store_type == "sqlite":
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        store = SQLiteCookieStore(path=store_path or os.path.join(CACHE_DIR, "cookies.db"))
+
+    elif store_type == "key_value":
+        if settings.COOKIE_STORE_URL:
+            # Only needed by this store
+            import redis
+            client = redis.Redis.from_url(settings.COOKIE_STORE_URL)
+        else:
+            client = LocalKeyValueClient()
+        store = KeyValueCookieStore(client=client)
+
+    else:
+        raise ValueError("Unknown cookie store - %s" % store_type)
+
+    return CachedCookieStore(store)
+
+
+COOKIE_STORE = get_cookie_store()
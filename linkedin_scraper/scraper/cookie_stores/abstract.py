@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+
+
+class CookieStore(ABC):
+    """
+    Storage of the raw selenium cookies of the accounts,
+    keyed by the credentials hash.
+    """
+
+    @abstractmethod
+    def get(self, account_id: str) -> list:
+        raise NotImplementedError("`get` Not implemented")
+
+    @abstractmethod
+    def set(self, account_id: str, raw_cookies: list):
+        raise NotImplementedError("`set` Not implemented")
+
+    @abstractmethod
+    def delete(self, account_id: str):
+        raise NotImplementedError("`delete` Not implemented")
+
+    @abstractmethod
+    def version(self, account_id: str):
+        """
+        Returns a marker that changes every time the cookies of the account
+        change, and is cheaper to read than the cookies themselves.
+        """
+        raise NotImplementedError("`version` Not implemented")
@@ -0,0 +1,49 @@
+import threading
+from copy import deepcopy
+
+from linkedin_scraper.scraper.cookie_stores.abstract import CookieStore
+
+
+class CachedCookieStore(CookieStore):
+    """
+    Keeps the last cookies read from another store in process. The
+    cookies are read again only when the version of the account changed
+    in the store (new mtime, new row version...), so the hot path only
+    pays for the version check.
+    """
+
+    def __init__(self, store: CookieStore):
+        self.store = store
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def get(self, account_id: str) -> list:
+        version = self.store.version(account_id)
+        if version is None:
+            self._forget(account_id)
+            return None
+
+        with self._lock:
+            cached = self._cache.get(account_id)
+        if cached and cached[0] == version:
+            return deepcopy(cached[1])
+
+        raw_cookies = self.store.get(account_id)
+        with self._lock:
+            self._cache[account_id] = (version, deepcopy(raw_cookies))
+        return raw_cookies
+
+    def set(self, account_id: str, raw_cookies: list):
+        self.store.set(account_id, raw_cookies)
+        self._forget(account_id)
+
+    def delete(self, account_id: str):
+        self.store.delete(account_id)
+        self._forget(account_id)
+
+    def version(self, account_id: str):
+        return self.store.version(account_id)
+
+    def _forget(self, account_id: str):
+        with self._lock:
+            self._cache.pop(account_id, None)
@@ -0,0 +1,45 @@
+import json
+import os
+
+from linkedin_scraper.scraper.cookie_stores.abstract import CookieStore
+from linkedin_scraper.scraper.utils import dump_json_atomically
+
+
+class FileCookieStore(CookieStore):
+    """
+    Stores the cookies of every account as a JSON file in a local directory.
+    Only shared by the processes of the same host.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def get(self, account_id: str) -> list:
+        # Checking if the file exists
+        cookie_cache_path = self._get_path(account_id)
+        if not os.path.exists(cookie_cache_path):
+            return None
+
+        # Reading the cookie only if exists.
+        with open(cookie_cache_path, "r") as file:
+            return json.load(file)
+
+    def set(self, account_id: str, raw_cookies: list):
+        # Writing cookie-dict as JSON file
+        os.makedirs(self.directory, exist_ok=True)
+        dump_json_atomically(raw_cookies, self._get_path(account_id))
+
+    def delete(self, account_id: str):
+        cookie_cache_path = self._get_path(account_id)
+        if os.path.exists(cookie_cache_path):
+            os.remove(cookie_cache_path)
+
+    def version(self, account_id: str):
+        # Files are replaced atomically, so a new write means a new mtime
+        try:
+            return os.stat(self._get_path(account_id)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _get_path(self, account_id: str) -> str:
+        return os.path.join(self.directory, f"{account_id}.json")
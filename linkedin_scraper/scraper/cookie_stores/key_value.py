@@ -0,0 +1,69 @@
+import json
+import threading
+import uuid
+
+from linkedin_scraper.scraper.cookie_stores.abstract import CookieStore
+
+
+class KeyValueCookieStore(CookieStore):
+    """
+    Stores the cookies in a network key-value store shared by every node,
+    like Redis. The client only needs `get`, `set` and `delete` methods,
+    so `redis.Redis` works as is and `LocalKeyValueClient` can stand in
+    for it locally.
+    """
+
+    def __init__(self, client, prefix: str = "linkedin-scraper:cookies"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, account_id: str) -> list:
+        raw_value = self.client.get(self._get_key(account_id))
+        return json.loads(raw_value) if raw_value else None
+
+    def set(self, account_id: str, raw_cookies: list):
+        # Writing the cookies before the version, so a reader
+        # that sees the new version also sees the new cookies
+        self.client.set(self._get_key(account_id), json.dumps(raw_cookies))
+        self.client.set(self._get_version_key(account_id), self._new_version())
+
+    def delete(self, account_id: str):
+        self.client.delete(self._get_key(account_id))
+        self.client.delete(self._get_version_key(account_id))
+
+    def version(self, account_id: str):
+        version = self.client.get(self._get_version_key(account_id))
+        return version.decode() if isinstance(version, bytes) else version
+
+    def _get_key(self, account_id: str) -> str:
+        return f"{self.prefix}:{account_id}"
+
+    def _get_version_key(self, account_id: str) -> str:
+        return f"{self.prefix}:{account_id}:version"
+
+    @staticmethod
+    def _new_version() -> str:
+        return uuid.uuid4().hex
+
+
+class LocalKeyValueClient:
+    """
+    In-process stand-in for the key-value client, with the same
+    `get`/`set`/`delete` methods.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            return self._values.get(key)
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._values[key] = value
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
@@ -0,0 +1,49 @@
+import itertools
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+
+from linkedin_scraper.scraper.cookie_stores.abstract import CookieStore
+
+
+class MemoryCookieStore(CookieStore):
+    """
+    In-process LRU store, keeping the cookies of at most `max_size` accounts.
+    Not shared between processes, the cookies are lost on restart.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._cookies = OrderedDict()
+        self._versions = {}
+        # Never reusing a version, even for an account deleted and set again
+        self._next_version = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, account_id: str) -> list:
+        with self._lock:
+            raw_cookies = self._cookies.get(account_id)
+            if raw_cookies is None:
+                return None
+            self._cookies.move_to_end(account_id)
+            return deepcopy(raw_cookies)
+
+    def set(self, account_id: str, raw_cookies: list):
+        with self._lock:
+            self._cookies[account_id] = deepcopy(raw_cookies)
+            self._cookies.move_to_end(account_id)
+            self._versions[account_id] = next(self._next_version)
+
+            # Evicting the least recently used accounts
+            while len(self._cookies) > self.max_size:
+                evicted_account_id, _ = self._cookies.popitem(last=False)
+                self._versions.pop(evicted_account_id, None)
+
+    def delete(self, account_id: str):
+        with self._lock:
+            self._cookies.pop(account_id, None)
+            self._versions.pop(account_id, None)
+
+    def version(self, account_id: str):
+        with self._lock:
+            return self._versions.get(account_id)
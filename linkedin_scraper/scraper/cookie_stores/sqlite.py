@@ -0,0 +1,52 @@
+import json
+import time
+import uuid
+
+from linkedin_scraper.scraper.cookie_stores.abstract import CookieStore
+from linkedin_scraper.scraper.sqlite_database import SQLiteDatabase
+
+
+class SQLiteCookieStore(CookieStore):
+    """
+    Stores the cookies in a SQLite database in WAL mode, so that the
+    gunicorn workers of a host can read and write it concurrently.
+    Every write gives the account a new random version, so a version is
+    never reused, even after the row was deleted and inserted again.
+    """
+
+    def __init__(self, path: str, timeout: float = 10):
+        self.path = path
+        self._database = SQLiteDatabase(path, timeout=timeout)
+        self._database.execute(
+            "CREATE TABLE IF NOT EXISTS cookies ("
+            "account_id TEXT PRIMARY KEY, "
+            "raw_cookies TEXT NOT NULL, "
+            "version TEXT NOT NULL, "
+            "updated_at REAL NOT NULL)"
+        )
+
+    def get(self, account_id: str) -> list:
+        row = self._database.execute(
+            "SELECT raw_cookies FROM cookies WHERE account_id = ?", (account_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, account_id: str, raw_cookies: list):
+        self._database.execute(
+            "INSERT INTO cookies (account_id, raw_cookies, version, updated_at) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (account_id) DO UPDATE SET "
+            "raw_cookies = excluded.raw_cookies, "
+            "version = excluded.version, "
+            "updated_at = excluded.updated_at",
+            (account_id, json.dumps(raw_cookies), uuid.uuid4().hex, time.time()),
+        )
+
+    def delete(self, account_id: str):
+        self._database.execute("DELETE FROM cookies WHERE account_id = ?", (account_id,))
+
+    def version(self, account_id: str):
+        row = self._database.execute(
+            "SELECT version FROM cookies WHERE account_id = ?", (account_id,)
+        ).fetchone()
+        return row[0] if row else None
@@ -0,0 +1,71 @@
+from linkedin_scraper.exceptions import InvalidFieldsException
+
+# Fields returned by each Voyager endpoint, in the order they are scraped
+ENDPOINT_FIELDS = {
+    "profileView": [
+        "public_id",
+        "full_name",
+        "headline",
+        "summary",
+        "industry_name",
+        "location",
+        "skills",
+        "experience",
+        "education",
+    ],
+    "profileContactInfo": [
+        "email",
+        "phone",
+    ],
+}
+
+# Endpoints whose parsed results are the same whoever the viewer is. The
+# contact info is only shown to the 1st-degree connections of the viewer.
+SHARED_ENDPOINTS = ("profileView",)
+
+
+def plan_endpoints(fields: list = None) -> list:
+    """
+    Decides which Voyager endpoints have to be called
+    to scrape the requested fields.
+
+    Args:
+        fields (list, optional): Requested fields. All the fields if not given.
+
+    Returns:
+        list: Names of the endpoints to call.
+    """
+    if not fields:
+        return list(ENDPOINT_FIELDS)
+
+    # Rejecting the fields that no endpoint provides
+    available_fields = [field for endpoint_fields in ENDPOINT_FIELDS.values() for field in endpoint_fields]
+    unknown_fields = [field for field in fields if field not in available_fields]
+    if unknown_fields:
+        error_message = "Unknown fields: %s" % ", ".join(unknown_fields)
+        raise InvalidFieldsException(error_message)
+
+    return [
+        endpoint for endpoint, endpoint_fields in ENDPOINT_FIELDS.items()
+        if any(field in endpoint_fields for field in fields)
+    ]
+
+
+def select_fields(profile_data: dict, fields: list = None) -> dict:
+    """
+    Keeps only the requested fields of the scraped profile data.
+    """
+    if not fields:
+        return profile_data
+    return {field: profile_data.get(field) for field in fields}
+
+
+def keep_identifier(profile_data: dict, public_identifier: str) -> dict:
+    """
+    Adds the `public_id` to the profile data if the requested fields left
+    it out, so the profiles of a list can still be told apart. The public
+    identifier is already known, so no endpoint is called for it.
+    """
+    if "public_id" in profile_data:
+        return profile_data
+    return {"public_id": public_identifier, **profile_data}
@@ -0,0 +1,96 @@
+from copy import deepcopy
+
+from linkedin_scraper.exceptions import (LoginChallengeException,
+                                         LoginFailedException)
+from linkedin_scraper.scraper.requests import Request
+from linkedin_scraper.scraper.utils import extract_hidden_inputs, get_headers
+
+
+class HttpLogin:
+    """
+    Logs in to LinkedIn without a browser, by submitting the login form
+    with the curl_cffi impersonation stack used for the Voyager calls.
+    It only works when LinkedIn doesn't ask for a challenge (captcha,
+    e-mail PIN...), in which case a browser login is needed.
+    """
+
+    login_page_url = "https://www.linkedin.com/login"
+    login_submit_url = "https://www.linkedin.com/checkpoint/lg/login-submit"
+
+    def __init__(self, email, password, account_id: str = None):
+        self.email = email
+        self.password = password
+        self.request = Request(account=account_id)
+
+    async def login(self) -> list:
+        """
+        Runs the `/login` -> `/checkpoint/lg/login-submit` form flow.
+        Returns:
+            list: Raw cookies, in the same format as selenium's `get_cookies`.
+        Raises:
+            LoginChallengeException: If LinkedIn answered with a challenge,
+                or with a page the flow doesn't recognise.
+            LoginFailedException: If LinkedIn rejected the credentials.
+        """
+
+        # Loading the login page for the form parameters and the first cookies
+        headers = deepcopy(get_headers(header_type="homepage"))
+        response = await self.request.fetch(url=self.login_page_url, headers=headers)
+        form_data = extract_hidden_inputs(response)
+        if "loginCsrfParam" not in form_data:
+            raise LoginChallengeException("Login form not found in the login page")
+
+        login_page_cookies = response.cookies
+        cookies = {cookie.name: cookie.value for cookie in login_page_cookies.jar}
+
+        # Submitting the credentials, without following the redirect,
+        # so the redirect location tells how the login went.
+        form_data["session_key"] = self.email
+        form_data["session_password"] = self.password
+        headers = deepcopy(get_headers(header_type="homepage"))
+        headers["Content-Type"] = "application/x-www-form-urlencoded"
+        headers["Origin"] = "https://www.linkedin.com"
+        headers["Referer"] = self.login_page_url
+        headers["Sec-Fetch-Site"] = "same-origin"
+        response = await self.request.fetch(
+            method="POST",
+            url=self.login_submit_url,
+            data=form_data,
+            headers=headers,
+            cookies=cookies,
+            allow_redirects=False,
+        )
+
+        location = response.headers.get("location") or ""
+        raw_cookies = self._to_raw_cookies(login_page_cookies, response.cookies)
+        if "/checkpoint/challenge" in location or "/checkpoint/challenge" in response.text:
+            raise LoginChallengeException("Login challenge requested - %s" % location)
+
+        if any(cookie["name"] == "li_at" for cookie in raw_cookies):
+            return raw_cookies
+
+        # The login form is sent back with an error for wrong credentials
+        if "error-for-username" in response.text or "error-for-password" in response.text:
+            raise LoginFailedException("LinkedIn rejected the credentials")
+        raise LoginChallengeException("Unexpected login response - %s" % response.status_code)
+
+    @staticmethod
+    def _to_raw_cookies(*response_cookies) -> list:
+        """
+        Merges the cookies set by the login page and the login submit,
+        as selenium-like dicts so they carry their expiry.
+        """
+        raw_cookies = {}
+        cookie_jar = [cookie for cookies in response_cookies for cookie in cookies.jar]
+        for cookie in cookie_jar:
+            raw_cookie = {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+            }
+            if cookie.expires:
+                raw_cookie["expiry"] = cookie.expires
+            raw_cookies[cookie.name] = raw_cookie
+        return list(raw_cookies.values())
@@ -1,63 +1,142 @@
+import asyncio
 import hashlib
-import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
-from selenium_stealth import stealth
 
-from linkedin_scraper.scraper.validator import validate_session_cookies
+from dynaconf_config import settings
+from linkedin_scraper.exceptions import LoginChallengeException
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.browser_pool import BROWSER_POOL
+from linkedin_scraper.scraper.cookie_stores import (CACHE_DIR, COOKIE_STORE,
+                                                    CookieStore)
+from linkedin_scraper.scraper.http_login import HttpLogin
+from linkedin_scraper.scraper.utils import async_file_lock
+from linkedin_scraper.scraper.validator import (get_session_expiry,
+                                                validate_session_cookies)
+
+# Bounded pool for the blocking selenium logins
+LOGIN_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.LOGIN_WORKERS, thread_name_prefix="linkedin-login"
+)
 
 
 class Login:
     """
-    Handles LinkedIn login and session management using Selenium.
-    Caches session cookies to minimize re-authentication.
+    Handles LinkedIn login and session management, with a browserless
+    HTTP login or with Selenium. Caches session cookies in the cookie
+    store to minimize re-authentication.
     """
 
-    def __init__(self, email, password):
+    def __init__(self, email, password, cookie_store: CookieStore = None):
+        """
+        Args:
+            email (str): Account e-mail.
+            password (str): Account password.
+            cookie_store (CookieStore, optional): Store of the session cookies.
+                Defaults to the store picked by the `COOKIE_STORE` setting.
+        """
         self.email = email
         self.password = password
-        self.cookies = self.get_cookie()
+        self.account_id = self._convert_credentials_to_hash()
+        self.cookie_store = cookie_store or COOKIE_STORE
 
-    def get_cookie(self) -> dict:
+    async def aget_cached_cookie(self) -> dict:
+        """
+        Returns the cached cookies if they are not expired, else an empty dict.
+        The cache is read off the event loop.
         """
-        Retrieves LinkedIn session cookies,
-        either from cache or by logging in.
+        return await asyncio.to_thread(self._load_cookies_from_cache)
+
+    async def alogin(self, min_expiry: float = None) -> dict:
+        """
+        Logs in and returns the cookies, with the `LOGIN_STRATEGY` setting:
+            - "http": Browserless login only (see `HttpLogin`).
+            - "selenium": Browser login only, in the login thread pool.
+            - "http_first": Browserless login, and browser login only
+              if LinkedIn asks for a challenge.
+
+        The login is guarded by a lock file next to the cookie cache, so only
+        one process logs in an account at a time. The processes that waited
+        for the lock use the cookies cached by the one that logged in.
+
+        Args:
+            min_expiry (float, optional): Cached cookies are only reused if the
+                session expires after this timestamp. Used to refresh sessions
+                before they expire.
         Returns:
             dict: Cookies
         """
-
-        # Fetching cookies from cache
-        cached_cookies = self._load_cookies_from_cache()
-        valid = validate_session_cookies(cached_cookies)
-        if cached_cookies and valid:
-            # If cookies existed in the cache
-            # and it's valid, return it.
-            return cached_cookies
-
-        # Initiating the login process with selenium
-        driver = self._launch_browser()
-        cookies = self._authenticate(driver=driver)
-        driver.close()
+        async with async_file_lock(self._get_lock_path()):
+            cached_cookies = await asyncio.to_thread(
+                self._load_fresh_cookies_from_cache, min_expiry
+            )
+            if cached_cookies:
+                # Another process logged in while waiting for the lock
+                return cached_cookies
+
+            strategy = settings.LOGIN_STRATEGY
+            if strategy in ("http", "http_first"):
+                try:
+                    return await self._login_with_http()
+                except LoginChallengeException:
+                    if strategy == "http":
+                        raise
+
+            # Waiting for a free login thread
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(LOGIN_EXECUTOR, self._login_with_browser)
+
+    async def _login_with_http(self) -> dict:
+        """
+        Logs in with `HttpLogin` and caches the cookies.
+        """
+        http_login = HttpLogin(
+            email=self.email, password=self.password, account_id=self.account_id
+        )
+        try:
+            with METRICS.timer("login_seconds", strategy="http"):
+                raw_cookies = await http_login.login()
+        except LoginChallengeException:
+            METRICS.increment("login_total", strategy="http", outcome="challenge")
+            raise
+        except Exception:
+            METRICS.increment("login_total", strategy="http", outcome="failed")
+            raise
+
+        METRICS.increment("login_total", strategy="http", outcome="success")
+        await asyncio.to_thread(self._cache_cookies, raw_cookies)
+        return self._clean_cookies(raw_cookies)
+
+    def _login_with_browser(self) -> dict:
+        """
+        Logs in with a driver of the browser pool and returns the cookies.
+        Blocking, it must not run on the event loop.
+        """
+        try:
+            with METRICS.timer("login_seconds", strategy="selenium"):
+                with BROWSER_POOL.driver() as driver:
+                    cookies = self._authenticate(driver=driver)
+        except Exception:
+            METRICS.increment("login_total", strategy="selenium", outcome="failed")
+            raise
+
+        METRICS.increment("login_total", strategy="selenium", outcome="success")
         return cookies
 
-    def _launch_browser(self) -> object:
+    def _load_fresh_cookies_from_cache(self, min_expiry: float = None) -> dict:
         """
-        Launches a Chrome browser instance with anti-detection settings.
-        Returns:
-            object: Driver object
+        Loads the cached cookies, only if the session expires
+        after `min_expiry` when it is given.
         """
-
-        options = webdriver.ChromeOptions()
-        options.add_argument("start-maximized")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option("useAutomationExtension", False)
-        driver = webdriver.Chrome(options=options)
-        stealth(driver, languages=["en-US", "en"], platform="Linux")
-        return driver
+        cached_cookies = self._load_cookies_from_cache()
+        session_expiry = self.get_session_expiry()
+        if min_expiry and session_expiry and session_expiry <= min_expiry:
+            return {}
+        return cached_cookies
 
     def _authenticate(self, driver):
         """
@@ -97,41 +176,49 @@ class Login:
         credentials = f"{self.email}|{self.password}"
         return hashlib.md5(credentials.encode()).hexdigest()
 
+    def _get_lock_path(self):
+        # The lock stays on the local disk, whatever the cookie store
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        return os.path.join(CACHE_DIR, f"{self.account_id}.lock")
+
     def _cache_cookies(self, cookies):
         """
-        Stores authentication cookies in a local JSON cache file.
+        Stores authentication cookies in the cookie store.
         """
-
-        # Setting up the path
-        BASE_PATH = os.path.dirname(__file__)
-        filaname_id = self._convert_credentials_to_hash()
-        filaname = f".cache/{filaname_id}.json"
-        cookie_cache_path = os.path.join(BASE_PATH, filaname)
-
-        # Writing cookie-dict as JSON file
-        with open(cookie_cache_path, "w") as file:
-            json.dump(cookies, file, indent=4)
+        self.cookie_store.set(self.account_id, cookies)
 
     def _load_cookies_from_cache(self):
         """
-        Loads cached authentication cookies if available.
+        Loads cached authentication cookies if available and not expired.
+        """
+        raw_cookies = self._load_raw_cookies_from_cache()
+        if not validate_session_cookies(raw_cookies):
+            return {}
+        return self._clean_cookies(raw_cookies)
+
+    def _load_raw_cookies_from_cache(self):
         """
+        Loads the cached selenium cookies, with their expiry metadata.
+        """
+        return self.cookie_store.get(self.account_id) or []
 
-        # Setting up the path
-        BASE_PATH = os.path.dirname(__file__)
-        filaname_id = self._convert_credentials_to_hash()
-        filaname = f".cache/{filaname_id}.json"
-        cookie_cache_path = os.path.join(BASE_PATH, filaname)
+    def get_session_expiry(self) -> float:
+        """
+        Returns the expiry timestamp of the cached session, if known.
+        """
+        return get_session_expiry(self._load_raw_cookies_from_cache())
 
-        # Checking if the file exists
-        if not os.path.exists(cookie_cache_path):
-            return {}
+    def discard_cached_cookies(self, cookies: dict):
+        """
+        Removes the cached cookies if they are the given ones,
+        so that rejected cookies are not loaded again.
+        """
+        cached_cookies = self._clean_cookies(self._load_raw_cookies_from_cache())
+        if not cached_cookies or cached_cookies.get("li_at") != cookies.get("li_at"):
+            # The cache already holds other cookies
+            return
 
-        # Reading the cookie only if exists.
-        with open(cookie_cache_path, "r") as file:
-            raw_cookies = json.load(file)
-            cookies = self._clean_cookies(raw_cookies)
-            return cookies
+        self.cookie_store.delete(self.account_id)
 
     def _clean_cookies(self, raw_cookies):
         """
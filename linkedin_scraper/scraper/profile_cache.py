@@ -0,0 +1,211 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.cookie_stores import CACHE_DIR
+from linkedin_scraper.scraper.fields import ENDPOINT_FIELDS, SHARED_ENDPOINTS
+from linkedin_scraper.scraper.sqlite_database import SQLiteDatabase
+
+logger = logging.getLogger("linkedin-scraper")
+
+
+class SQLiteProfileStore:
+    """
+    Disk tier of the profile cache, a SQLite database shared by the
+    gunicorn workers of a host. The expired rows are purged every
+    `purge_interval` writes. Its methods block, the profile cache
+    calls them off the event loop.
+    """
+
+    def __init__(self, path: str, timeout: float = 10, purge_interval: int = 1000):
+        self.path = path
+        self.purge_interval = purge_interval
+        self._writes = 0
+        self._database = SQLiteDatabase(path, timeout=timeout)
+        self._database.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "key TEXT PRIMARY KEY, "
+            "data TEXT NOT NULL, "
+            "stored_at REAL NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> tuple:
+        """
+        Returns the data of the key and when it was stored, None if missing or expired.
+        """
+        row = self._database.execute(
+            "SELECT data, stored_at FROM profiles WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key: str, data: dict, stored_at: float, expires_at: float):
+        self._database.execute(
+            "INSERT OR REPLACE INTO profiles (key, data, stored_at, expires_at) "
+            "VALUES (?, ?, ?, ?)",
+            (key, json.dumps(data), stored_at, expires_at),
+        )
+
+        self._writes += 1
+        if self._writes % self.purge_interval == 0:
+            self.purge()
+
+    def purge(self) -> int:
+        """
+        Deletes the expired rows and returns how many were deleted.
+        """
+        cursor = self._database.execute("DELETE FROM profiles WHERE expires_at <= ?", (time.time(),))
+        if cursor.rowcount:
+            METRICS.increment("profile_cache_evictions_total", cursor.rowcount, tier="disk")
+        return cursor.rowcount
+
+
+class ProfileCache:
+    """
+    Cache of the parsed Voyager results, one entry per endpoint and profile,
+    and per account scope for the viewer-dependent endpoints. The results of
+    the `SHARED_ENDPOINTS` are served to every account. It has an in-memory
+    LRU tier of `max_size` entries, in front of an optional disk tier.
+
+    Every field has its own TTL (`field_ttls`, else `ttl`). An entry is
+    fresh for a request while it is younger than the shortest TTL of the
+    requested fields it holds, and is kept until the longest one is over.
+    So a request for the contact info can still be served from an entry
+    too old for the headline.
+    """
+
+    def __init__(self, enabled: bool, max_size: int, ttl: float,
+                 field_ttls: dict = None, disk_store: SQLiteProfileStore = None):
+        """
+        Args:
+            enabled (bool): Serves and stores the results.
+            max_size (int): Max entries of the memory tier.
+            ttl (float): Seconds the fields are fresh for.
+            field_ttls (dict, optional): Seconds per field, overriding `ttl`.
+            disk_store (SQLiteProfileStore, optional): Disk tier.
+        """
+        self.enabled = enabled
+        self.max_size = max_size
+        self.ttl = ttl
+        self.field_ttls = dict(field_ttls or {})
+        self.disk_store = disk_store
+        self._entries = OrderedDict()
+
+    async def get(self, scope: str, endpoint: str, public_identifier: str,
+                  fields: list = None, max_age: float = None) -> dict:
+        """
+        Returns the cached result of an endpoint call,
+        None if it isn't cached or is too old for the request.
+
+        Args:
+            scope (str): Account scope of the call, ignored for the `SHARED_ENDPOINTS`.
+            endpoint (str): Voyager endpoint name.
+            public_identifier (str): Profile of the call.
+            fields (list, optional): Requested fields. All the fields if not given.
+            max_age (float, optional): Max age accepted by the caller, in seconds.
+        """
+        if not self.enabled:
+            return None
+
+        key = self._make_key(scope, endpoint, public_identifier)
+        fresh_ttl = self._get_fresh_ttl(endpoint, fields)
+        if max_age is not None:
+            fresh_ttl = min(fresh_ttl, max_age)
+
+        entry = self._entries.get(key)
+        tier = "memory"
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.disk_store is not None:
+            tier = "disk"
+            try:
+                entry = await asyncio.to_thread(self.disk_store.get, key)
+            except sqlite3.Error:
+                logger.exception("Profile cache disk tier read failed")
+            if entry is not None:
+                # Promoting it to the memory tier
+                self._store_in_memory(key, entry)
+
+        if entry is None or time.time() - entry[1] > fresh_ttl:
+            METRICS.increment("profile_cache_misses_total", endpoint=endpoint)
+            return None
+
+        METRICS.increment("profile_cache_hits_total", endpoint=endpoint, tier=tier)
+        return entry[0]
+
+    async def set(self, scope: str, endpoint: str, public_identifier: str, data: dict):
+        """
+        Caches the result of an endpoint call, in all the tiers.
+        The disk tier is written off the event loop.
+        """
+        if not self.enabled:
+            return
+
+        key = self._make_key(scope, endpoint, public_identifier)
+        stored_at = time.time()
+        self._store_in_memory(key, (data, stored_at))
+
+        if self.disk_store is not None:
+            expires_at = stored_at + self._get_kept_ttl(endpoint)
+            try:
+                await asyncio.to_thread(self.disk_store.set, key, data, stored_at, expires_at)
+            except sqlite3.Error:
+                logger.exception("Profile cache disk tier write failed")
+
+    def _store_in_memory(self, key: str, entry: tuple):
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        # Evicting the least recently used entries
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            METRICS.increment("profile_cache_evictions_total", tier="memory")
+
+    def _get_fresh_ttl(self, endpoint: str, fields: list = None) -> float:
+        endpoint_fields = [
+            field for field in ENDPOINT_FIELDS[endpoint] if not fields or field in fields
+        ]
+        return min(self.field_ttls.get(field, self.ttl) for field in endpoint_fields)
+
+    def _get_kept_ttl(self, endpoint: str) -> float:
+        return max(self.field_ttls.get(field, self.ttl) for field in ENDPOINT_FIELDS[endpoint])
+
+    @staticmethod
+    def _make_key(scope: str, endpoint: str, public_identifier: str) -> str:
+        if endpoint in SHARED_ENDPOINTS:
+            return f"{endpoint}|{public_identifier}"
+        return f"{scope}|{endpoint}|{public_identifier}"
+
+
+def get_profile_cache() -> ProfileCache:
+    """
+    Builds the profile cache from the `PROFILE_CACHE_*` settings. The disk
+    tier is only used when `PROFILE_CACHE_DISK` is set, at `PROFILE_CACHE_PATH`.
+    """
+    disk_store = None
+    if settings.PROFILE_CACHE_DISK:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        disk_store = SQLiteProfileStore(
+            path=settings.PROFILE_CACHE_PATH or os.path.join(CACHE_DIR, "profiles.db")
+        )
+
+    return ProfileCache(
+        enabled=settings.PROFILE_CACHE_ENABLED,
+        max_size=settings.PROFILE_CACHE_MAX_SIZE,
+        ttl=settings.PROFILE_CACHE_TTL,
+        field_ttls=settings.PROFILE_CACHE_FIELD_TTLS,
+        disk_store=disk_store,
+    )
+
+
+PROFILE_CACHE = get_profile_cache()
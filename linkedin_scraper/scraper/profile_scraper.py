@@ -1,63 +1,175 @@
+import asyncio
+import logging
+import time
 from copy import deepcopy
 
-from tenacity import retry, stop_after_attempt
-
 from dynaconf_config import settings
-from linkedin_scraper.scraper.login import Login
+from linkedin_scraper.exceptions import ThrottledException
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.account_pool import AccountPool
+from linkedin_scraper.scraper.fields import plan_endpoints, select_fields
 from linkedin_scraper.scraper.parser import LinkedinParser
+from linkedin_scraper.scraper.profile_cache import PROFILE_CACHE
 from linkedin_scraper.scraper.requests import Request
+from linkedin_scraper.scraper.retry_policy import (retry_budget,
+                                                   retry_voyager_call)
+from linkedin_scraper.scraper.sessions import (SESSION_REGISTRY,
+                                               LinkedinSession)
+from linkedin_scraper.scraper.single_flight import VOYAGER_CALLS
 from linkedin_scraper.scraper.utils import (extract_public_identifier,
                                             get_headers)
+from linkedin_scraper.scraper.voyager import fetch_voyager
+
+logger = logging.getLogger("linkedin-scraper")
+
+# Endpoints the account pool may call. The contact info is only shown to the
+# 1st-degree connections of the caller, so it always uses the caller's session.
+POOLED_ENDPOINTS = ("profileView",)
+
+# Account scope of the calls made with the accounts of the account pool
+POOL_SCOPE = "account_pool"
 
 
 class LinkedinProfileScraper:
 
-    def __init__(self, email, password):
+    def __init__(self, email=None, password=None, session: LinkedinSession = None,
+                 cookies: dict = None, account_pool: AccountPool = None):
         self.email = email
         self.password = password
-        self.session = Login(email=self.email, password=self.password)
-        self.cookies = self.session.get_cookie()
-        self.request = Request()
+        self.session_cookies = cookies
+        self.account_pool = account_pool
+        self.session = None
+        self.cookies = None
+        self.request = None
+        if session:
+            self._use_session(session)
+
+    async def login(self):
+        """
+        Gets the session of the request from the session registry
+        (see `SessionRegistry.resolve`). It is awaited by the scraping
+        methods, so the constructor never blocks.
+        """
+        if self.session:
+            return
+
+        session = await SESSION_REGISTRY.resolve(
+            email=self.email, password=self.password, cookies=self.session_cookies
+        )
+        self._use_session(session)
+
+    def _use_session(self, session: LinkedinSession):
+        self.session = session
+        self.cookies = session.cookies
+        self.request = Request(account=session.account_id)
 
-    @retry(stop=stop_after_attempt(10))
     async def get_profile_data(self, public_identifier: str=None,
-                               uri: str=None):
+                               uri: str=None, fields: list=None,
+                               max_age: float=None, no_cache: bool=False):
         """
         Main function to extract the profile data
             - If public_id/uri not given, assume that it should scrape the logged-in user.
             - In the above case, it will send a homepage request to extract the public-id.
-            - It will scrape basic details and contact details and return as a string
+            - It will only call the Voyager endpoints needed for the requested `fields`,
+              concurrently and each with its own retries, and merge them once all finished.
+            - The retries of all the calls share the retry budget of the API request.
+            - The endpoint results still fresh in the `PROFILE_CACHE` are not fetched
+              again, unless they are older than `max_age` seconds or `no_cache` is set.
+            - A call already in flight for the same account scope, endpoint and
+              profile is joined instead of being sent again.
+            - The contact info is always fetched with the caller's session, only
+              the profile view may go through the account pool.
 
         Returns: dict: Scraped Data
         """
+        # Planning the endpoints before sending any request
+        endpoints = plan_endpoints(fields)
+        await self.login()
+
         if not public_identifier and not uri:
             # If public id is not provided, Assume that
             # It should scrape the profile of the logged in user.
             public_identifier = await self._get_public_identifier()
 
+        # Taking what the cache already has
+        scopes = {endpoint: self._get_account_scope(endpoint) for endpoint in endpoints}
+        results = {}
+        if not no_cache:
+            for endpoint in endpoints:
+                cached_data = await PROFILE_CACHE.get(
+                    scopes[endpoint], endpoint, public_identifier, fields=fields, max_age=max_age
+                )
+                if cached_data is not None:
+                    results[endpoint] = cached_data
+        missing_endpoints = [endpoint for endpoint in endpoints if endpoint not in results]
+
+        # All the calls only need the public identifier, so sending them together
+        timings = {}
+        start_time = time.perf_counter()
+        with retry_budget():
+            tasks = [
+                asyncio.ensure_future(self._timed(
+                    endpoint, timings, VOYAGER_CALLS.run,
+                    (scopes[endpoint], endpoint, public_identifier),
+                    self._fetch_endpoint, scopes[endpoint], endpoint, public_identifier,
+                ))
+                for endpoint in missing_endpoints
+            ]
+            try:
+                fetched_results = await asyncio.gather(*tasks)
+            except Exception:
+                # Not leaving the other calls running if one of them failed
+                for task in tasks:
+                    task.cancel()
+                raise
+        results.update(zip(missing_endpoints, fetched_results))
+
+        if missing_endpoints:
+            total_time = time.perf_counter() - start_time
+            METRICS.observe("profile_fetch_seconds", total_time)
+            logger.debug(
+                "Profile %s scraped in %.3fs (%s)", public_identifier, total_time,
+                ", ".join("%s: %.3fs" % (endpoint, timings[endpoint]) for endpoint in missing_endpoints),
+            )
+
+        # Merging the data of all the endpoints
+        profile_data = {}
+        for endpoint in endpoints:
+            profile_data.update(results[endpoint])
+        return select_fields(profile_data, fields)
+
+    async def _fetch_endpoint(self, scope: str, endpoint: str, public_identifier: str) -> dict:
+        """
+        Calls a Voyager endpoint for the profile and caches the result.
+        """
+        endpoint_calls = {
+            "profileView": self._get_profile_view,
+            "profileContactInfo": self._get_contact_details,
+        }
+        endpoint_data = await endpoint_calls[endpoint](public_identifier, scope)
+        await PROFILE_CACHE.set(scope, endpoint, public_identifier, endpoint_data)
+        return endpoint_data
+
+    @retry_voyager_call
+    async def _get_profile_view(self, public_identifier, scope):
+        """
+        Send API request to the profile view and return the data as dict.
+        """
         api_profile_url = (
             "https://www.linkedin.com/voyager/api/identity"
             f"/profiles/{public_identifier}/profileView"
         )
 
         # Sending the Voyagor API requests to get the profile details
-        headers = deepcopy(get_headers(header_type="profile_page"))
-        headers["csrf-token"] = self.cookies["JSESSIONID"].replace('"', "").strip()
-        response = await self.request.fetch(
-            url=api_profile_url,
-            headers=headers,
-            cookies=self.cookies
-        )
+        response = await self._fetch_voyager(api_profile_url, scope)
 
         # Extracting necessary Data
         parser = LinkedinParser(response)
         profile_data = parser.extract_profile_data()
-        conatct_details = await self._get_contact_details(public_identifier)
-        profile_data.update(conatct_details)
         return profile_data
 
-    @retry(stop=stop_after_attempt(10))
-    async def _get_contact_details(self, public_identifier):
+    @retry_voyager_call
+    async def _get_contact_details(self, public_identifier, scope):
         """
         Send API request to the contact details and return the data as dict.
         """
@@ -65,20 +177,43 @@ class LinkedinProfileScraper:
             "https://www.linkedin.com/voyager/api/identity"
             f"/profiles/{public_identifier}/profileContactInfo"
         )
-
-        headers = deepcopy(get_headers(header_type="profile_page"))
-        headers["csrf-token"] = self.cookies["JSESSIONID"].replace('"', "").strip()
-        response = await self.request.fetch(
-            url=api_profile_url,
-            headers=headers,
-            cookies=self.cookies
-        )
+        response = await self._fetch_voyager(api_profile_url, scope)
 
         # Extracting necessary Data
         parser = LinkedinParser(response)
         contact_details = parser.extract_contact_details()
         return contact_details
 
+    async def _fetch_voyager(self, url: str, scope: str):
+        """
+        Sends the Voyager call with an account of the account pool for the
+        pool scope, else with the session of the scraper. The scope is decided
+        before the call, so it never falls back to the other one.
+
+        Raises:
+            ThrottledException: If every pooled account is cooling down,
+                retried until one of them is rested.
+        """
+        if scope != POOL_SCOPE:
+            return await fetch_voyager(self.request, self.session, url)
+
+        pooled_account = self.account_pool.pick()
+        if pooled_account is None:
+            raise ThrottledException("Every pooled account is cooling down")
+        return await self.account_pool.fetch_voyager(pooled_account, url)
+
+    def _get_account_scope(self, endpoint: str) -> str:
+        """
+        Returns whose view of the profiles the calls to the endpoint get.
+        All the scrapers using the account pool share the same view, else
+        it is the account of the session, also when every pooled account
+        is cooling down.
+        """
+        pooled = self.account_pool and self.account_pool.enabled and endpoint in POOLED_ENDPOINTS
+        if pooled and self.account_pool.pick() is not None:
+            return POOL_SCOPE
+        return self.session.account_id
+
     async def _get_public_identifier(self):
         """
         Send a homepage requests with the loggedin cookies
@@ -94,3 +229,19 @@ class LinkedinProfileScraper:
         )
         public_identifier = extract_public_identifier(response)
         return public_identifier
+
+    @staticmethod
+    async def _timed(endpoint, timings, func, *args):
+        """
+        Awaits a Voyager call, including its retries, and records
+        how long it took in `timings` and in the metrics. The call is
+        only made once the task runs, so a task cancelled before it
+        started leaves no coroutine behind.
+        """
+        start_time = time.perf_counter()
+        try:
+            return await func(*args)
+        finally:
+            elapsed_time = time.perf_counter() - start_time
+            timings[endpoint] = elapsed_time
+            METRICS.observe("voyager_call_seconds", elapsed_time, endpoint=endpoint)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from dynaconf_config import settings
+from linkedin_scraper.scraper.sessions import SESSION_REGISTRY
+
+logger = logging.getLogger("linkedin-scraper")
+
+
+class SessionRefresher:
+    """
+    Background task that logs the registered accounts in again before
+    their session cookies expire, so no API request has to wait for a
+    browser login.
+
+    Every session is refreshed `margin` seconds before it expires, at a
+    random time of the last off-peak window before that deadline. The
+    random slot spreads the accounts, so they don't all refresh at once.
+    """
+
+    def __init__(self, registry, margin: float, jitter: float,
+                 off_peak_hours: list, interval: float):
+        """
+        Args:
+            registry (SessionRegistry): Registry holding the sessions to refresh.
+            margin (float): Seconds before the expiry the session must be refreshed.
+            jitter (float): Max random delay, in seconds, when no off-peak window fits.
+            off_peak_hours (list): Start and end hours (UTC) of the off-peak window,
+                which crosses midnight if it ends before it starts (e.g. `[22, 4]`).
+            interval (float): Seconds between two checks of the sessions.
+        """
+        self.registry = registry
+        self.margin = margin
+        self.jitter = jitter
+        self.off_peak_hours = off_peak_hours
+        self.interval = interval
+        self._schedule = {}
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self._refresh_due_sessions()
+            except Exception:
+                logger.exception("Session refresh check failed")
+
+    async def _refresh_due_sessions(self):
+        """
+        Refreshes, one at a time, the sessions whose slot has come.
+        """
+        now = time.time()
+        session_expiries = self.registry.get_session_expiries()
+
+        # Forgetting the sessions that were replaced in the meantime
+        for schedule_key in list(self._schedule):
+            account_id, expires_at = schedule_key
+            if session_expiries.get(account_id) != expires_at:
+                del self._schedule[schedule_key]
+
+        for account_id, expires_at in session_expiries.items():
+            schedule_key = (account_id, expires_at)
+            if schedule_key not in self._schedule:
+                self._schedule[schedule_key] = self._plan_refresh(expires_at, now)
+
+            if self._schedule[schedule_key] > now:
+                continue
+
+            try:
+                await self.registry.refresh(account_id, min_expiry=expires_at)
+                logger.info("Refreshed the session of account %s", account_id)
+                del self._schedule[schedule_key]
+            except Exception:
+                # Trying again later, still before the expiry
+                logger.exception("Failed to refresh the session of account %s", account_id)
+                self._schedule[schedule_key] = now + random.uniform(self.interval, self.jitter)
+
+    def _plan_refresh(self, expires_at: float, now: float) -> float:
+        """
+        Picks the timestamp when the session expiring at `expires_at`
+        should be refreshed.
+        """
+        deadline = expires_at - self.margin
+        if deadline <= now:
+            return now
+
+        # Looking for the last off-peak window before the deadline
+        start_hour, end_hour = self.off_peak_hours
+        if end_hour <= start_hour:
+            # Window crossing midnight, ending the next day
+            end_hour += 24
+        day = datetime.fromtimestamp(deadline, tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        while day.timestamp() + end_hour * 3600 > now:
+            window_start = max(day.timestamp() + start_hour * 3600, now)
+            window_end = min(day.timestamp() + end_hour * 3600, deadline)
+            if window_start < window_end:
+                return random.uniform(window_start, window_end)
+            day -= timedelta(days=1)
+
+        # No off-peak window before the deadline
+        return max(now, deadline - random.uniform(0, self.jitter))
+
+
+SESSION_REFRESHER = SessionRefresher(
+    registry=SESSION_REGISTRY,
+    margin=settings.SESSION_REFRESH_MARGIN,
+    jitter=settings.SESSION_REFRESH_JITTER,
+    off_peak_hours=settings.SESSION_REFRESH_OFF_PEAK_HOURS,
+    interval=settings.SESSION_REFRESH_INTERVAL,
+)
@@ -11,5 +11,7 @@ class AbstractRequest(ABC):
         params: dict = None,
         headers: dict = None,
         cookies: dict = None,
+        allow_redirects: bool = True,
+        hedge: bool = False,
     ):
         raise NotImplementedError("`fetch` Not implemented")
@@ -0,0 +1,229 @@
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from dynaconf_config import settings
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         RequestFailedException)
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.utils import parse_retry_after
+
+logger = logging.getLogger("linkedin-scraper")
+
+# Statuses counted as failures of the upstream
+FAILURE_STATUS_CODES = (429, 999)
+
+# Voyager endpoint families, by path prefix
+ENDPOINT_FAMILIES = {
+    "/voyager/api/identity/profiles": "identity/profiles",
+    "/voyager/api/relationships/dash/connections": "relationships/dash/connections",
+}
+
+# Values of the `circuit_state` gauge
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def get_endpoint_family(url: str) -> str:
+    """
+    Returns the endpoint family of a LinkedIn URL,
+    None for the URLs without a breaker (login, probes...).
+    """
+    path = urlparse(url).path
+    if path in ("", "/"):
+        return "homepage"
+    for prefix, family in ENDPOINT_FAMILIES.items():
+        if path.startswith(prefix):
+            return family
+    return None
+
+
+@dataclass
+class CircuitPermit:
+    """
+    Permission to send a request through the breakers. The status code of
+    the response is set on it, so the breakers can record the outcome.
+    """
+
+    breakers: list
+    probes: list
+    status_code: int = None
+    retry_after: float = None
+
+    def set_response(self, response):
+        self.status_code = response.status_code
+        self.retry_after = parse_retry_after(response.headers.get("retry-after"))
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker. It opens after `failure_threshold`
+    failures in a row and rejects the requests for `open_seconds` (or the
+    `Retry-After` of LinkedIn, if longer). It then lets `half_open_probes`
+    requests through, and closes on a success or opens again on a failure.
+    Without `count_throttles`, the throttled requests (429/999) are neither
+    failures nor successes.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, open_seconds: float,
+                 half_open_probes: int, count_throttles: bool = True):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.count_throttles = count_throttles
+        self.state = "closed"
+        self.failures = 0
+        self.retry_at = 0.0
+        self.probes = 0
+
+    def allow(self) -> bool:
+        """
+        Returns True if a request can go through as a probe of the
+        half-open circuit, False if it goes through a closed circuit.
+        Raises:
+            CircuitOpenException: If the circuit rejects the request.
+        """
+        if self.state == "open":
+            if time.monotonic() < self.retry_at:
+                raise CircuitOpenException(
+                    "Circuit open for %s" % self.name,
+                    retry_after=self.retry_at - time.monotonic(),
+                    circuit=self.name,
+                )
+            self._set_state("half_open")
+            self.probes = 0
+
+        if self.state == "half_open":
+            if self.probes >= self.half_open_probes:
+                raise CircuitOpenException(
+                    "Circuit half-open for %s" % self.name,
+                    retry_after=1.0,
+                    circuit=self.name,
+                )
+            self.probes += 1
+            return True
+        return False
+
+    def record(self, probe: bool, success: bool, retry_after: float = None,
+               throttled: bool = False):
+        """
+        Records the outcome of a request. `success` is None
+        for the requests that didn't finish (cancelled).
+        """
+        if probe and self.state == "half_open":
+            self.probes -= 1
+
+        if success is None or (throttled and not self.count_throttles):
+            return
+
+        if success:
+            self.failures = 0
+            if probe and self.state == "half_open":
+                self._set_state("closed")
+            return
+
+        self.failures += 1
+        if (probe and self.state == "half_open") or (
+                self.state == "closed" and self.failures >= self.failure_threshold):
+            self.retry_at = time.monotonic() + max(self.open_seconds, retry_after or 0)
+            self._set_state("open")
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+
+        if state == "open":
+            logger.warning("Circuit %s opened after %s failures", self.name, self.failures)
+        self.state = state
+        METRICS.increment("circuit_state_changes_total", circuit=self.name, state=state)
+        METRICS.set_gauge("circuit_state", CIRCUIT_STATES[state], circuit=self.name)
+
+
+class CircuitBreakers:
+    """
+    Breakers of the process, one per account, one per proxy (`direct`
+    without proxy) and one per Voyager endpoint family. A request goes
+    through the breakers of its account, proxy and endpoint. A 5xx or
+    network error counts against all of them, but a throttle (429/999)
+    only against the account and proxy: LinkedIn throttles them, not
+    the endpoint, which is shared by every account.
+    """
+
+    def __init__(self, failure_threshold: int, open_seconds: float,
+                 half_open_probes: int):
+        """
+        Args:
+            failure_threshold (int): Failures in a row that open a circuit.
+            open_seconds (float): Seconds a circuit stays open.
+            half_open_probes (int): Requests let through a half-open circuit at once.
+        """
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._breakers = {}
+
+    @contextmanager
+    def guard(self, url: str, account: str = None, proxy: str = None):
+        """
+        Wraps a request in the breakers of its account, proxy and endpoint.
+        Raises:
+            CircuitOpenException: If one of the circuits is open.
+        """
+        names = ["proxy:%s" % (proxy or "direct")]
+        if account:
+            names.insert(0, "account:%s" % account)
+        endpoint_family = get_endpoint_family(url)
+        if endpoint_family:
+            names.append("endpoint:%s" % endpoint_family)
+
+        permit = CircuitPermit(breakers=[], probes=[])
+        try:
+            for name in names:
+                breaker = self._get_breaker(name)
+                permit.probes.append(breaker.allow())
+                permit.breakers.append(breaker)
+        except CircuitOpenException:
+            METRICS.increment("circuit_rejections_total")
+            self._record(permit, success=None)
+            raise
+
+        try:
+            yield permit
+        except RequestFailedException:
+            self._record(permit, success=False)
+            raise
+        except BaseException:
+            self._record(permit, success=None)
+            raise
+
+        status_code = permit.status_code
+        throttled = status_code in FAILURE_STATUS_CODES
+        failed = throttled or bool(status_code and status_code >= 500)
+        self._record(permit, success=not failed, retry_after=permit.retry_after, throttled=throttled)
+
+    def _record(self, permit: CircuitPermit, success: bool, retry_after: float = None,
+                throttled: bool = False):
+        for breaker, probe in zip(permit.breakers, permit.probes):
+            breaker.record(probe, success, retry_after=retry_after, throttled=throttled)
+
+    def _get_breaker(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                name=name,
+                failure_threshold=self.failure_threshold,
+                open_seconds=self.open_seconds,
+                half_open_probes=self.half_open_probes,
+                count_throttles=not name.startswith("endpoint:"),
+            )
+            self._breakers[name] = breaker
+        return breaker
+
+
+CIRCUIT_BREAKERS = CircuitBreakers(
+    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+    open_seconds=settings.CIRCUIT_OPEN_SECONDS,
+    half_open_probes=settings.CIRCUIT_HALF_OPEN_PROBES,
+)
@@ -0,0 +1,70 @@
+from collections import defaultdict, deque
+
+from dynaconf_config import settings
+
+
+class RequestHedger:
+    """
+    Decides when a slow GET gets a duplicate (hedged) request.
+
+    The hedge is sent once the request has been running for longer than
+    the `percentile` of the recent latencies of its endpoint. Every request
+    adds `budget_ratio` to the hedge budget and every hedge spends 1, so
+    hedges stay under that share of the requests.
+    """
+
+    def __init__(self, enabled: bool, percentile: float, min_samples: int,
+                 window: int, budget_ratio: float, max_budget: float):
+        """
+        Args:
+            enabled (bool): Hedges the requests that ask for it.
+            percentile (float): Latency percentile (0-100) the hedge is sent at.
+            min_samples (int): Latencies needed before hedging an endpoint.
+            window (int): Recent latencies kept per endpoint.
+            budget_ratio (float): Hedges allowed per request.
+            max_budget (float): Max hedges saved up.
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self.max_budget = max_budget
+        self.budget = 0.0
+        self._latencies = defaultdict(lambda: deque(maxlen=window))
+
+    def get_delay(self, endpoint: str) -> float:
+        """
+        Adds the request to the budget, and returns how long to wait for it
+        before hedging. None if the endpoint doesn't have enough latencies.
+        """
+        self.budget = min(self.max_budget, self.budget + self.budget_ratio)
+
+        latencies = self._latencies[endpoint]
+        if len(latencies) < self.min_samples:
+            return None
+
+        sorted_latencies = sorted(latencies)
+        index = int(len(sorted_latencies) * self.percentile / 100)
+        return sorted_latencies[min(index, len(sorted_latencies) - 1)]
+
+    def spend(self) -> bool:
+        """
+        Takes a hedge from the budget. False if it is exhausted.
+        """
+        if self.budget < 1:
+            return False
+        self.budget -= 1
+        return True
+
+    def observe(self, endpoint: str, latency: float):
+        self._latencies[endpoint].append(latency)
+
+
+REQUEST_HEDGER = RequestHedger(
+    enabled=settings.HEDGING_ENABLED,
+    percentile=settings.HEDGING_PERCENTILE,
+    min_samples=settings.HEDGING_MIN_SAMPLES,
+    window=settings.HEDGING_WINDOW,
+    budget_ratio=settings.HEDGING_BUDGET_RATIO,
+    max_budget=settings.HEDGING_MAX_BUDGET,
+)
@@ -0,0 +1,223 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+
+# Statuses LinkedIn answers with when it is overloaded or throttling
+BACKOFF_STATUS_CODES = (429, 999)
+
+
+@dataclass
+class LimiterPermit:
+    """
+    Slot in the concurrency windows of a request. The status code of the
+    response is set on it, so the windows can adapt to the outcome.
+    """
+
+    status_code: int = None
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency window. The limit grows by about one request per
+    window of healthy responses, and is cut by `backoff` on a throttled
+    or 5xx response. Latencies above `latency_tolerance` times the usual
+    latency hold the limit where it is.
+    """
+
+    def __init__(self, limit: float, min_limit: float, max_limit: float,
+                 backoff: float, latency_tolerance: float, smoothing: float = 0.1):
+        self.limit = float(limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.in_flight = 0
+        self.latency = None
+        self.last_backoff = 0.0
+        self.last_used = time.monotonic()
+        self._waiters = deque()
+
+    async def acquire(self) -> float:
+        """
+        Waits for a free slot in the window.
+        Returns:
+            float: Timestamp the slot was taken at.
+        """
+        while self.in_flight >= self._window():
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                else:
+                    # Passing the wake-up on to the next waiter
+                    self._wake_waiters()
+                raise
+
+        self.in_flight += 1
+        self.last_used = time.monotonic()
+        return self.last_used
+
+    def release(self, started_at: float, status_code: int, latency: float):
+        self.in_flight -= 1
+
+        if status_code in BACKOFF_STATUS_CODES or (status_code and status_code >= 500):
+            # Backing off once for all the requests sent with the previous limit
+            if started_at >= self.last_backoff:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self.last_backoff = time.monotonic()
+
+        elif status_code:
+            healthy_latency = (
+                self.latency is None
+                or latency <= self.latency * self.latency_tolerance
+            )
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.smoothing * (latency - self.latency)
+
+            # Only growing a window that is actually used
+            if healthy_latency and self.in_flight + 1 >= self._window():
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        self._wake_waiters()
+
+    def snapshot(self) -> dict:
+        return {
+            "limit": round(self.limit, 3),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "latency": round(self.latency, 6) if self.latency is not None else None,
+            "seconds_since_backoff": (
+                round(time.monotonic() - self.last_backoff, 3) if self.last_backoff else None
+            ),
+        }
+
+    def _window(self) -> int:
+        return max(1, int(self.limit))
+
+    def _wake_waiters(self):
+        free_slots = self._window() - self.in_flight
+        while free_slots > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free_slots -= 1
+
+
+class ConcurrencyLimiter:
+    """
+    Adaptive concurrency windows of the worker, one per account and one
+    per proxy, shared by every request so the learned limits outlive the
+    API calls. A request takes a slot in the window of its account and
+    in the window of its proxy (`direct` without proxy).
+    """
+
+    def __init__(self, account_limit: float, proxy_limit: float, min_limit: float,
+                 max_account_limit: float, max_proxy_limit: float, backoff: float,
+                 latency_tolerance: float, idle_timeout: float):
+        """
+        Args:
+            account_limit (float): Initial window of an account.
+            proxy_limit (float): Initial window of a proxy.
+            min_limit (float): Smallest window.
+            max_account_limit (float): Largest window of an account.
+            max_proxy_limit (float): Largest window of a proxy.
+            backoff (float): Factor the window is multiplied by on a throttle.
+            latency_tolerance (float): Latency, relative to the usual one,
+                from which the windows stop growing.
+            idle_timeout (float): Seconds an unused window is kept.
+        """
+        self.account_limit = account_limit
+        self.proxy_limit = proxy_limit
+        self.min_limit = min_limit
+        self.max_account_limit = max_account_limit
+        self.max_proxy_limit = max_proxy_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.idle_timeout = idle_timeout
+        self._windows = {}
+
+    @asynccontextmanager
+    async def slot(self, account: str = None, proxy: str = None):
+        """
+        Holds a slot in the windows of the account and proxy
+        for the duration of a request.
+        """
+        windows = []
+        if account:
+            windows.append(self._get_window("account", account, self.account_limit,
+                                            self.max_account_limit))
+        windows.append(self._get_window("proxy", proxy or "direct", self.proxy_limit,
+                                        self.max_proxy_limit))
+
+        # Always in the same order, account then proxy
+        acquired = []
+        permit = LimiterPermit()
+        start_time = time.perf_counter()
+        try:
+            with METRICS.timer("limiter_wait_seconds"):
+                for window in windows:
+                    acquired.append((window, await window.acquire()))
+
+            start_time = time.perf_counter()
+            yield permit
+
+        finally:
+            latency = time.perf_counter() - start_time
+            for window, started_at in acquired:
+                window.release(started_at, permit.status_code, latency)
+
+    def snapshot(self) -> list:
+        """
+        Returns the current state of every window, for the admin endpoint.
+        """
+        return [
+            {"type": window_type, "key": key, **window.snapshot()}
+            for (window_type, key), window in self._windows.items()
+        ]
+
+    def _get_window(self, window_type: str, key: str, limit: float,
+                    max_limit: float) -> AdaptiveLimit:
+        window = self._windows.get((window_type, key))
+        if window:
+            return window
+
+        self._evict_idle_windows()
+        window = AdaptiveLimit(
+            limit=limit,
+            min_limit=self.min_limit,
+            max_limit=max_limit,
+            backoff=self.backoff,
+            latency_tolerance=self.latency_tolerance,
+        )
+        self._windows[(window_type, key)] = window
+        return window
+
+    def _evict_idle_windows(self):
+        now = time.monotonic()
+        for window_key, window in list(self._windows.items()):
+            if (not window.in_flight and not window._waiters
+                    and now - window.last_used > self.idle_timeout):
+                del self._windows[window_key]
+
+
+CONCURRENCY_LIMITER = ConcurrencyLimiter(
+    account_limit=settings.WORKER,
+    proxy_limit=settings.PROXY_LIMITER_INITIAL_LIMIT,
+    min_limit=settings.LIMITER_MIN_LIMIT,
+    max_account_limit=settings.ACCOUNT_LIMITER_MAX_LIMIT,
+    max_proxy_limit=settings.PROXY_LIMITER_MAX_LIMIT,
+    backoff=settings.LIMITER_BACKOFF,
+    latency_tolerance=settings.LIMITER_LATENCY_TOLERANCE,
+    idle_timeout=settings.LIMITER_IDLE_TIMEOUT,
+)
@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from curl_cffi.requests.errors import CurlError, RequestsError
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.requests.session_pool import SESSION_POOL
+from linkedin_scraper.scraper.requests.utils import get_proxies
+
+logger = logging.getLogger("linkedin-scraper")
+
+# Statuses LinkedIn answers with when it bans or throttles an IP
+BAN_STATUS_CODES = (429, 999)
+
+
+@dataclass
+class ProxyStats:
+    url: str
+    latency: float = None
+    success_rate: float = 1.0
+    bans: int = 0
+    quarantines: int = 0
+    quarantined_until: float = 0.0
+
+    @property
+    def label(self) -> str:
+        # Host and port only, the credentials stay out of the logs and metrics
+        return urlparse(self.url).netloc.rpartition("@")[2]
+
+
+class ProxyPool:
+    """
+    Proxies the requests are sent through, picked by a weighted random
+    draw on their health score (success rate over latency). Every account
+    sticks to its proxy while that proxy is healthy, so its pooled
+    sessions and connections keep being reused.
+
+    A proxy getting `ban_threshold` ban signals in a row (429/999 or
+    network errors) is quarantined, for a time that doubles with every
+    quarantine. Once the quarantine is over, the proxy only comes back
+    after a successful probe request.
+    """
+
+    def __init__(self, proxies: list, smoothing: float, ban_threshold: int,
+                 quarantine_seconds: float, max_quarantine_seconds: float,
+                 probe_url: str, probe_interval: float, probe_impersonate: str):
+        """
+        Args:
+            proxies (list): Proxy URLs.
+            smoothing (float): Weight of the last request in the moving averages.
+            ban_threshold (int): Ban signals in a row that quarantine a proxy.
+            quarantine_seconds (float): Seconds of the first quarantine.
+            max_quarantine_seconds (float): Max seconds of a quarantine.
+            probe_url (str): URL requested to check a quarantined proxy.
+            probe_interval (float): Seconds between two checks of the quarantined proxies.
+            probe_impersonate (str): Browser the probe requests impersonate.
+        """
+        self.smoothing = smoothing
+        self.ban_threshold = ban_threshold
+        self.quarantine_seconds = quarantine_seconds
+        self.max_quarantine_seconds = max_quarantine_seconds
+        self.probe_url = probe_url
+        self.probe_interval = probe_interval
+        self.probe_impersonate = probe_impersonate
+        self.proxies = {proxy: ProxyStats(url=proxy) for proxy in proxies}
+        self._assignments = {}
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.proxies)
+
+    def get_proxy(self, account: str = None) -> str:
+        """
+        Returns the proxy of the account, picking a new one if it has
+        none yet or if its proxy got quarantined. None without proxies.
+        """
+        if not self.proxies:
+            return None
+
+        proxy = self._assignments.get(account)
+        if proxy and not self._is_quarantined(self.proxies[proxy]):
+            return proxy
+
+        proxy = self._pick_proxy()
+        if account:
+            self._assignments[account] = proxy
+        return proxy
+
+    def get_hedge_proxy(self, proxy: str = None) -> str:
+        """
+        Returns another healthy proxy than `proxy` for a hedged request,
+        or `proxy` itself if there is no other one.
+        """
+        other_proxies = [
+            stats for stats in self.proxies.values()
+            if stats.url != proxy and not self._is_quarantined(stats)
+        ]
+        if not other_proxies:
+            return proxy
+        return self._draw_proxy(other_proxies)
+
+    def record_response(self, proxy: str, status_code: int, latency: float):
+        stats = self.proxies.get(proxy)
+        if stats is None:
+            return
+
+        if status_code in BAN_STATUS_CODES:
+            self._record_ban(stats)
+            return
+
+        stats.bans = 0
+        stats.success_rate += self.smoothing * (1 - stats.success_rate)
+        if stats.quarantined_until and stats.quarantined_until <= time.monotonic():
+            # Sent while every proxy was quarantined, and worked
+            self._release(stats)
+        if stats.latency is None:
+            stats.latency = latency
+        else:
+            stats.latency += self.smoothing * (latency - stats.latency)
+
+    def record_failure(self, proxy: str):
+        """
+        Records a request that failed at the network level.
+        """
+        stats = self.proxies.get(proxy)
+        if stats is not None:
+            self._record_ban(stats)
+
+    def start(self):
+        if self._task is None and self.proxies:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def snapshot(self) -> list:
+        now = time.monotonic()
+        return [
+            {
+                "proxy": stats.label,
+                "latency": round(stats.latency, 6) if stats.latency is not None else None,
+                "success_rate": round(stats.success_rate, 3),
+                "quarantined_for": round(max(0.0, stats.quarantined_until - now), 3),
+            }
+            for stats in self.proxies.values()
+        ]
+
+    def _pick_proxy(self) -> str:
+        healthy_proxies = [
+            stats for stats in self.proxies.values() if not self._is_quarantined(stats)
+        ]
+        METRICS.set_gauge("proxy_pool_healthy_proxies", len(healthy_proxies))
+        if not healthy_proxies:
+            # Better a quarantined proxy than no request at all
+            stats = min(self.proxies.values(), key=lambda stats: stats.quarantined_until)
+            return stats.url
+
+        return self._draw_proxy(healthy_proxies)
+
+    @staticmethod
+    def _draw_proxy(proxies: list) -> str:
+        # Proxies without any latency yet are scored with the average one
+        latencies = [stats.latency for stats in proxies if stats.latency]
+        default_latency = sum(latencies) / len(latencies) if latencies else 1.0
+        weights = [
+            max(stats.success_rate, 0.01) / (stats.latency or default_latency)
+            for stats in proxies
+        ]
+        return random.choices(proxies, weights=weights)[0].url
+
+    def _record_ban(self, stats: ProxyStats):
+        stats.bans += 1
+        stats.success_rate *= 1 - self.smoothing
+        if stats.bans >= self.ban_threshold and not self._is_quarantined(stats):
+            self._quarantine(stats)
+
+    def _quarantine(self, stats: ProxyStats):
+        stats.quarantines += 1
+        seconds = min(
+            self.quarantine_seconds * 2 ** (stats.quarantines - 1),
+            self.max_quarantine_seconds,
+        )
+        stats.quarantined_until = time.monotonic() + seconds
+        logger.warning("Proxy %s quarantined for %.0fs", stats.label, seconds)
+        METRICS.increment("proxy_quarantines_total", proxy=stats.label)
+
+        # Moving the accounts of the proxy to other proxies
+        for account, proxy in list(self._assignments.items()):
+            if proxy == stats.url:
+                del self._assignments[account]
+
+    def _release(self, stats: ProxyStats):
+        logger.info("Proxy %s is back from quarantine", stats.label)
+        stats.bans = 0
+        stats.quarantines = 0
+        stats.success_rate = max(stats.success_rate, 0.5)
+        stats.quarantined_until = 0.0
+
+    @staticmethod
+    def _is_quarantined(stats: ProxyStats) -> bool:
+        # A proxy stays out once its quarantine is over, until it is probed
+        return stats.quarantined_until > 0
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.probe_interval)
+            try:
+                await self._probe_quarantined_proxies()
+            except Exception:
+                logger.exception("Proxy probe failed")
+
+    async def _probe_quarantined_proxies(self):
+        now = time.monotonic()
+        for stats in self.proxies.values():
+            if not stats.quarantined_until or stats.quarantined_until > now:
+                continue
+
+            if await self._probe(stats.url):
+                self._release(stats)
+            else:
+                self._quarantine(stats)
+
+    async def _probe(self, proxy: str) -> bool:
+        impersonate = self.probe_impersonate
+        pooled_session = SESSION_POOL.acquire(impersonate=impersonate, proxy=proxy)
+        try:
+            response = await pooled_session.session.request(
+                method="GET", url=self.probe_url, timeout=15, impersonate=impersonate
+            )
+        except (CurlError, RequestsError):
+            # The curl handle of a failed request is lost (see `SessionPool.retire`)
+            SESSION_POOL.retire(pooled_session)
+            return False
+        except asyncio.CancelledError:
+            SESSION_POOL.retire(pooled_session)
+            raise
+        finally:
+            SESSION_POOL.release(pooled_session)
+
+        status_code = response.status_code
+        return status_code < 500 and status_code not in BAN_STATUS_CODES
+
+
+PROXY_POOL = ProxyPool(
+    proxies=get_proxies(),
+    smoothing=settings.PROXY_POOL_SMOOTHING,
+    ban_threshold=settings.PROXY_BAN_THRESHOLD,
+    quarantine_seconds=settings.PROXY_QUARANTINE_SECONDS,
+    max_quarantine_seconds=settings.PROXY_MAX_QUARANTINE_SECONDS,
+    probe_url=settings.PROXY_PROBE_URL,
+    probe_interval=settings.PROXY_PROBE_INTERVAL,
+    probe_impersonate=settings.PROXY_PROBE_IMPERSONATE,
+)
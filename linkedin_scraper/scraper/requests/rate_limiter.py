@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+from dynaconf_config import settings
+from linkedin_scraper.metrics import METRICS
+
+
+class TokenBucket:
+    """
+    Token bucket refilled with `rate` tokens per second, holding at most
+    `burst` tokens. Tokens are reserved ahead, so the callers are paced
+    in the order they came.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns how many seconds
+        to wait before it can be used.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    def refund(self):
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    def is_full(self, now: float) -> bool:
+        """
+        Whether the bucket is refilled, and so is the same as a new one.
+        """
+        return self.tokens + (now - self.updated_at) * self.rate >= self.burst
+
+
+class RateLimiter:
+    """
+    Paces the requests of the process with a token bucket per account
+    and per proxy (`direct` without proxy), so the request rate stays
+    under the limits from which LinkedIn starts throttling.
+    A rate of 0 disables the pacing. The refilled buckets are dropped
+    when a new one is made, so they don't pile up with the accounts.
+    """
+
+    def __init__(self, account_rate: float, account_burst: float,
+                 proxy_rate: float, proxy_burst: float):
+        """
+        Args:
+            account_rate (float): Requests per second of an account.
+            account_burst (float): Requests an account can send at once.
+            proxy_rate (float): Requests per second through a proxy.
+            proxy_burst (float): Requests that can go through a proxy at once.
+        """
+        self.account_rate = account_rate
+        self.account_burst = account_burst
+        self.proxy_rate = proxy_rate
+        self.proxy_burst = proxy_burst
+        self._buckets = {}
+
+    async def wait(self, account: str = None, proxy: str = None):
+        """
+        Waits until the account and the proxy can send one more request.
+        """
+        bucket_count = len(self._buckets)
+        buckets = []
+        if account and self.account_rate:
+            buckets.append(self._get_bucket("account", account, self.account_rate,
+                                            self.account_burst))
+        if self.proxy_rate:
+            buckets.append(self._get_bucket("proxy", proxy or "direct", self.proxy_rate,
+                                            self.proxy_burst))
+
+        delay = max([bucket.reserve() for bucket in buckets], default=0.0)
+        if len(self._buckets) > bucket_count:
+            # After the reservation, so the buckets of this request aren't full
+            self._evict_full_buckets()
+        METRICS.observe("rate_limiter_wait_seconds", delay)
+        if not delay:
+            return
+
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Giving back the tokens that won't be used
+            for bucket in buckets:
+                bucket.refund()
+            raise
+
+    def _get_bucket(self, bucket_type: str, key: str, rate: float,
+                    burst: float) -> TokenBucket:
+        bucket = self._buckets.get((bucket_type, key))
+        if bucket is None:
+            bucket = TokenBucket(rate=rate, burst=burst)
+            self._buckets[(bucket_type, key)] = bucket
+        return bucket
+
+    def _evict_full_buckets(self):
+        now = time.monotonic()
+        for bucket_key, bucket in list(self._buckets.items()):
+            if bucket.is_full(now):
+                del self._buckets[bucket_key]
+
+
+RATE_LIMITER = RateLimiter(
+    account_rate=settings.ACCOUNT_RATE_LIMIT,
+    account_burst=settings.ACCOUNT_RATE_BURST,
+    proxy_rate=settings.PROXY_RATE_LIMIT,
+    proxy_burst=settings.PROXY_RATE_BURST,
+)
@@ -1,15 +1,40 @@
-from curl_cffi.requests import AsyncSession
+import asyncio
+import time
+
+from curl_cffi.requests import Cookies
 from curl_cffi.requests.errors import CurlError, RequestsError
 
 from linkedin_scraper.exceptions import RequestFailedException
+from linkedin_scraper.metrics import METRICS
 from linkedin_scraper.scraper.requests.abstract import AbstractRequest
+from linkedin_scraper.scraper.requests.circuit_breaker import (
+    CIRCUIT_BREAKERS, FAILURE_STATUS_CODES, get_endpoint_family)
+from linkedin_scraper.scraper.requests.hedging import REQUEST_HEDGER
+from linkedin_scraper.scraper.requests.limiter import CONCURRENCY_LIMITER
+from linkedin_scraper.scraper.requests.proxy_pool import PROXY_POOL
+from linkedin_scraper.scraper.requests.rate_limiter import RATE_LIMITER
 from linkedin_scraper.scraper.requests.response import Response
+from linkedin_scraper.scraper.requests.session_pool import SESSION_POOL
 from linkedin_scraper.scraper.requests.utils import (add_user_agent,
                                                      get_browser_details,
                                                      shuffle_headers)
 
 
 class Request(AbstractRequest):
+    def __init__(self, account: str = None, proxy: str = None):
+        """
+        Args:
+            account (str, optional): Account identifier, used to pick the pooled session.
+            proxy (str, optional): Proxy URL for the requests. Defaults to the
+                proxy the proxy pool assigned to the account, if any.
+        """
+        self.account = account
+        self.proxy = proxy
+
+        # Randomizing browser impersonates once, so that the fingerprint
+        # stays consistent and the pooled connection can be reused.
+        self.browser_details = get_browser_details()
+
     async def fetch(
         self,
         method: str = "GET",
@@ -18,11 +43,17 @@ class Request(AbstractRequest):
         params: dict = None,
         headers: dict = None,
         cookies: dict = None,
+        allow_redirects: bool = True,
+        hedge: bool = False,
     ):
         """
         Sends an asynchronous HTTP request with randomized headers and browser impersonation.
-        Uses curl_cffi to perform an HTTP request while spoofing browser details and shuffling headers.
-        Handles CurlError and RequestsError, raising RequestFailedException on failure.
+        Uses a pooled curl_cffi session to perform an HTTP request while spoofing browser details and
+        shuffling headers. Handles CurlError and RequestsError, raising RequestFailedException on failure.
+        Without an explicit proxy, the request goes through the proxy the proxy pool assigned to the
+        account. It is paced by the token buckets of its account and proxy, then waits for a slot
+        in their adaptive concurrency windows. It fails fast with CircuitOpenException when the
+        circuit of its account, proxy or endpoint is open.
 
         Args:
             method (str, optional): HTTP method (e.g., "GET", "POST"). Defaults to "GET".
@@ -31,33 +62,35 @@ class Request(AbstractRequest):
             params (dict, optional): Query parameters. Defaults to None.
             headers (dict, optional): Custom headers. Defaults to None.
             cookies (dict, optional): Cookies. Defaults to None.
+            allow_redirects (bool, optional): Follow the redirects. Defaults to True.
+            hedge (bool, optional): Hedge a slow GET, when the `HEDGING_ENABLED`
+                setting is on (see `_send_hedged`). Defaults to False.
 
         Returns:
             Response: Custom Response object with status_code, content, text, headers, and cookies.
         """
 
-        # Randomizing browser impersonates and user-agent
-        browser_details = get_browser_details()
-        headers = add_user_agent(headers, browser_details)
+        # Randomizing user-agent
+        headers = add_user_agent(headers, self.browser_details)
         headers = shuffle_headers(headers)
 
-        # Sending HTTP request in async mode
-        async with AsyncSession() as session:
-            try:
-                response = await session.request(
-                    url=url,
-                    data=data,
-                    timeout=60,
-                    params=params,
-                    method=method,
-                    headers=headers,
-                    cookies=cookies,
-                    impersonate=browser_details["impersonate"],
-                )
+        # Using the proxy of the account, sticky while the proxy is healthy
+        proxy = self.proxy or PROXY_POOL.get_proxy(self.account)
+
+        send = self._send_guarded
+        if hedge and method == "GET" and REQUEST_HEDGER.enabled:
+            send = self._send_hedged
 
-            except (CurlError, RequestsError) as exe:
-                error_message = "Curl-CFFI failed to send request - %s" % exe
-                raise RequestFailedException(error_message)
+        response, response_cookies = await send(
+            proxy=proxy,
+            url=url,
+            data=data,
+            params=params,
+            method=method,
+            headers=headers,
+            cookies=cookies,
+            allow_redirects=allow_redirects,
+        )
 
         # Returning custom response wrapper
         custom_response = Response(
@@ -65,6 +98,143 @@ class Request(AbstractRequest):
             content=response.content,
             text=response.text,
             headers=response.headers,
-            cookies=response.cookies,
+            cookies=response_cookies,
         )
         return custom_response
+
+    async def _send_guarded(self, proxy: str = None, lane: str = None, **request_kwargs):
+        """
+        Sends the request through the circuit breakers, the token buckets and
+        the concurrency windows of the account and proxy, and records its
+        outcome in them.
+
+        Returns:
+            tuple: curl_cffi response, and its cookies.
+        """
+
+        # Failing fast while LinkedIn is throttling the account, proxy or endpoint
+        url = request_kwargs["url"]
+        with CIRCUIT_BREAKERS.guard(url=url, account=self.account, proxy=proxy) as circuit:
+
+            # Pacing the requests, before taking a slot so the wait doesn't hold it
+            await RATE_LIMITER.wait(account=self.account, proxy=proxy)
+
+            # Waiting for a slot in the concurrency windows of the account and proxy
+            async with CONCURRENCY_LIMITER.slot(account=self.account, proxy=proxy) as permit:
+                response, response_cookies = await self._send(
+                    proxy=proxy, lane=lane, **request_kwargs
+                )
+                permit.status_code = response.status_code
+            circuit.set_response(response)
+
+        return response, response_cookies
+
+    async def _send_hedged(self, proxy: str = None, **request_kwargs):
+        """
+        Sends the request, and a duplicate through another proxy (or another
+        pooled connection without other proxy) if the request is slower than
+        the hedging percentile of its endpoint and the hedge budget allows it.
+        The first usable response wins and the other request is cancelled.
+        Both go through the guards of their own proxy (see `_send_guarded`).
+
+        Returns:
+            tuple: curl_cffi response, and its cookies.
+        """
+        endpoint = get_endpoint_family(request_kwargs["url"]) or "other"
+        delay = REQUEST_HEDGER.get_delay(endpoint)
+
+        start_time = time.perf_counter()
+        primary = asyncio.ensure_future(self._send_guarded(proxy=proxy, **request_kwargs))
+
+        def observe_latency():
+            REQUEST_HEDGER.observe(endpoint, time.perf_counter() - start_time)
+
+        # A failed or cancelled request says nothing of the latency
+        if delay is None:
+            result = await primary
+            observe_latency()
+            return result
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not REQUEST_HEDGER.spend():
+            result = await primary
+            observe_latency()
+            return result
+
+        METRICS.increment("hedged_requests_total", endpoint=endpoint)
+        hedge_proxy = PROXY_POOL.get_hedge_proxy(proxy)
+        hedged = asyncio.ensure_future(
+            self._send_guarded(proxy=hedge_proxy, lane="hedge", **request_kwargs)
+        )
+        pending = {primary, hedged}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if primary in done and not primary.exception():
+                    observe_latency()
+
+                for task in done:
+                    if not task.exception() and self._is_usable(task.result()[0]):
+                        if task is hedged:
+                            METRICS.increment("hedge_wins_total", endpoint=endpoint)
+                            if not primary.done():
+                                # The request ran at least this long, keeping it as
+                                # a lower bound so the slow tail stays in the percentile
+                                observe_latency()
+                        return task.result()
+
+            # Neither response is usable, going on with the one of the request
+            return primary.result()
+
+        finally:
+            for task in (primary, hedged):
+                if not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _is_usable(response) -> bool:
+        status_code = response.status_code
+        return status_code not in FAILURE_STATUS_CODES and status_code < 500
+
+    async def _send(self, proxy: str = None, lane: str = None, **request_kwargs):
+        """
+        Sends the request over the pooled session of the account and proxy,
+        and records the outcome in the proxy pool.
+
+        Returns:
+            tuple: curl_cffi response, and its cookies.
+        """
+
+        # Sending HTTP request in async mode over the pooled session
+        impersonate = self.browser_details["impersonate"]
+        pooled_session = SESSION_POOL.acquire(
+            account=self.account, impersonate=impersonate, proxy=proxy, lane=lane
+        )
+        session = pooled_session.session
+        start_time = time.perf_counter()
+        try:
+            response = await session.request(
+                timeout=60, impersonate=impersonate, **request_kwargs
+            )
+
+            # The session is shared, so the cookies of this response are
+            # moved out of its jar and are not sent with later requests.
+            response_cookies = Cookies(session.cookies)
+            session.cookies.clear()
+
+        except (CurlError, RequestsError) as exe:
+            SESSION_POOL.retire(pooled_session)
+            PROXY_POOL.record_failure(proxy)
+            error_message = "Curl-CFFI failed to send request - %s" % exe
+            raise RequestFailedException(error_message)
+
+        except asyncio.CancelledError:
+            SESSION_POOL.retire(pooled_session)
+            raise
+
+        finally:
+            SESSION_POOL.release(pooled_session)
+
+        latency = time.perf_counter() - start_time
+        PROXY_POOL.record_response(proxy, response.status_code, latency)
+        return response, response_cookies
@@ -0,0 +1,132 @@
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass, field
+
+from curl_cffi.requests import AsyncSession
+
+from dynaconf_config import settings
+
+
+@dataclass
+class PooledSession:
+    session: AsyncSession
+    last_used: float = field(default_factory=time.monotonic)
+    in_flight: int = 0
+    retired: bool = False
+
+
+class SessionPool:
+    """
+    Keeps long-lived curl_cffi `AsyncSession` objects, keyed by
+    account, impersonation fingerprint and proxy.
+
+    Every `AsyncSession` owns a curl multi handle, and curl keeps the
+    connection cache on the multi handle. Reusing the session therefore
+    reuses the TCP+TLS connection (keep-alive) and, as the impersonated
+    browsers negotiate HTTP/2 through ALPN, multiplexes concurrent
+    requests over a single connection.
+    """
+
+    def __init__(self, max_clients: int = 10, idle_timeout: float = 300,
+                 max_sessions: int = 64):
+        """
+        Args:
+            max_clients (int): Max concurrent connections (curl handles) per session.
+            idle_timeout (float): Seconds after which an unused session is closed.
+            max_sessions (int): Max number of sessions kept open at the same time.
+        """
+        self.max_clients = max_clients
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self._sessions = {}
+
+    def acquire(self, account: str = None, impersonate: str = None,
+                proxy: str = None, lane: str = None) -> PooledSession:
+        """
+        Returns the pooled session for the given key, creating it if needed.
+        The caller must hand it back with `release` once the request is done.
+        A `lane` gives a separate session, and so separate connections,
+        for the same account, fingerprint and proxy.
+        """
+        self._evict_idle_sessions()
+
+        key = (account, impersonate, proxy, lane)
+        pooled_session = self._sessions.get(key)
+        if pooled_session is None:
+            pooled_session = PooledSession(session=self._create_session(impersonate, proxy))
+            self._sessions[key] = pooled_session
+
+        pooled_session.in_flight += 1
+        pooled_session.last_used = time.monotonic()
+        return pooled_session
+
+    def release(self, pooled_session: PooledSession):
+        pooled_session.in_flight -= 1
+        pooled_session.last_used = time.monotonic()
+        if pooled_session.retired and not pooled_session.in_flight:
+            asyncio.ensure_future(self._close_session(pooled_session.session))
+
+    def retire(self, pooled_session: PooledSession):
+        """
+        Stops handing out a session, and closes it once its requests are done.
+        Used after a cancelled or failed request, as curl_cffi only gives the
+        curl handle of a successful request back to the session.
+        """
+        pooled_session.retired = True
+        for key, session in list(self._sessions.items()):
+            if session is pooled_session:
+                del self._sessions[key]
+
+    async def close(self):
+        """
+        Closes every pooled session. Called on application shutdown.
+        """
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        for pooled_session in sessions:
+            await self._close_session(pooled_session.session)
+
+    def _create_session(self, impersonate: str = None, proxy: str = None) -> AsyncSession:
+        proxies = {"http": proxy, "https": proxy} if proxy else None
+        return AsyncSession(
+            max_clients=self.max_clients,
+            impersonate=impersonate,
+            proxies=proxies,
+        )
+
+    def _evict_idle_sessions(self):
+        """
+        Closes sessions idle for longer than `idle_timeout`, and the least
+        recently used idle ones while the pool is still over `max_sessions`.
+        """
+        now = time.monotonic()
+        idle_sessions = sorted(
+            [(key, pooled_session) for key, pooled_session in self._sessions.items()
+             if not pooled_session.in_flight],
+            key=lambda item: item[1].last_used,
+        )
+        # Leaving room for the session that is about to be opened
+        open_sessions = len(self._sessions) + 1
+        for key, pooled_session in idle_sessions:
+            expired = now - pooled_session.last_used > self.idle_timeout
+            if not expired and open_sessions <= self.max_sessions:
+                continue
+
+            del self._sessions[key]
+            open_sessions -= 1
+            asyncio.ensure_future(self._close_session(pooled_session.session))
+
+    @staticmethod
+    async def _close_session(session: AsyncSession):
+        # `close` became a coroutine in later curl_cffi releases
+        result = session.close()
+        if inspect.isawaitable(result):
+            await result
+
+
+SESSION_POOL = SessionPool(
+    max_clients=settings.SESSION_POOL_MAX_CLIENTS,
+    idle_timeout=settings.SESSION_POOL_IDLE_TIMEOUT,
+    max_sessions=settings.SESSION_POOL_MAX_SESSIONS,
+)
@@ -1,5 +1,4 @@
 import random
-from itertools import cycle
 
 from dynaconf_config import settings
 from linkedin_scraper.scraper.requests.user_agents import USER_AGENTS
@@ -48,12 +47,14 @@ def shuffle_headers(headers):
     return shuffled_headers
 
 
-def get_proxies():
-    proxy_1 = settings.PROXY_1
-    proxy_2 = settings.PROXY_2
-    proxy_3 = settings.PROXY_3
+def get_proxies() -> list:
+    """
+    Returns the proxy URLs of the `PROXIES` setting,
+    followed by the legacy `PROXY_n` settings that are set.
+    """
+    proxies = list(settings.PROXIES)
+    proxies += [settings.PROXY_1, settings.PROXY_2, settings.PROXY_3]
+    proxies = [proxy for proxy in proxies if proxy and proxy != "None"]
 
-    proxies = [proxy_1, proxy_2, proxy_3]
-    proxies = [i for i in proxies if proxies != "None"]
-    proxies = [{"http": i, "https": i} for i in proxies]
-    return cycle(proxies)
+    # Removing the duplicates, keeping the order
+    return list(dict.fromkeys(proxies))
@@ -0,0 +1,159 @@
+import contextvars
+import functools
+import logging
+import random
+from contextlib import contextmanager
+
+from tenacity import retry
+
+from dynaconf_config import settings
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         InvalidFieldsException,
+                                         InvalidResponseException,
+                                         LoginChallengeException,
+                                         LoginFailedException,
+                                         NotFoundException,
+                                         RequestFailedException,
+                                         SessionExpiredException,
+                                         ThrottledException)
+from linkedin_scraper.metrics import METRICS
+
+logger = logging.getLogger("linkedin-scraper")
+
+# Failures worth another attempt
+RETRYABLE_FAILURES = ("throttled", "transient", "unknown")
+
+_retry_budget = contextvars.ContextVar("retry_budget", default=None)
+_in_retry = contextvars.ContextVar("in_retry", default=False)
+
+
+class RetryBudget:
+    """
+    Retries left to an API request, shared by all of its calls.
+    """
+
+    def __init__(self, retries: int):
+        self.remaining = retries
+
+    def spend(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+@contextmanager
+def retry_budget(retries: int = None, budget: RetryBudget = None):
+    """
+    Gives the calls made in the block a shared budget of `retries`
+    retries (`RETRY_BUDGET` setting by default), or the given `budget`
+    so the block shares a budget opened in another task. Nested blocks
+    use the budget of the outermost one.
+    """
+    if _retry_budget.get() is not None:
+        yield _retry_budget.get()
+        return
+
+    if budget is None:
+        budget = RetryBudget(settings.RETRY_BUDGET if retries is None else retries)
+    token = _retry_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _retry_budget.reset(token)
+
+
+def classify_failure(exception: Exception) -> str:
+    """
+    Sorts a failed call into:
+        - "auth": LinkedIn rejected the session, the credentials or asked
+          for a challenge, another login wouldn't do better.
+        - "not_found": The requested entity doesn't exist.
+        - "throttled": LinkedIn throttled the account or proxy.
+        - "circuit_open": The circuit of the account, proxy or endpoint is open.
+        - "transient": Network errors, 5xx and unreadable responses.
+        - "fatal": Errors of the caller, like unknown fields.
+        - "cancelled": The call was cancelled (asyncio.CancelledError).
+        - "unknown": Anything else, like a parser error on an unexpected page.
+    """
+    if not isinstance(exception, Exception):
+        return "cancelled"
+    if isinstance(exception, (SessionExpiredException, LoginFailedException,
+                              LoginChallengeException)):
+        return "auth"
+    if isinstance(exception, NotFoundException):
+        return "not_found"
+    if isinstance(exception, ThrottledException):
+        return "throttled"
+    if isinstance(exception, CircuitOpenException):
+        return "circuit_open"
+    if isinstance(exception, (RequestFailedException, InvalidResponseException)):
+        return "transient"
+    if isinstance(exception, InvalidFieldsException):
+        return "fatal"
+    return "unknown"
+
+
+def retry_voyager_call(func):
+    """
+    Retries an async Voyager call with the shared retry policy:
+        - Up to `RETRY` attempts, only for the retryable failures.
+        - Exponential backoff with full jitter, between `RETRY_BASE_WAIT`
+          and `RETRY_MAX_WAIT` seconds, or the `Retry-After` of LinkedIn.
+        - Every retry is taken from the budget of the API request.
+
+    A decorated call made inside another one doesn't retry on its own,
+    the outer call retries it, so the attempts never multiply.
+    The last exception is raised once the attempts are over.
+    """
+    retrying_func = retry(retry=_should_retry, wait=_get_wait, reraise=True)(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        if _in_retry.get():
+            return await func(*args, **kwargs)
+
+        token = _in_retry.set(True)
+        try:
+            return await retrying_func(*args, **kwargs)
+        finally:
+            _in_retry.reset(token)
+
+    return wrapper
+
+
+def _should_retry(retry_state) -> bool:
+    if not retry_state.outcome.failed:
+        return False
+
+    exception = retry_state.outcome.exception()
+    failure = classify_failure(exception)
+    if failure not in RETRYABLE_FAILURES:
+        return False
+    if retry_state.attempt_number >= settings.RETRY:
+        return False
+
+    # Not waiting longer than the max wait for LinkedIn to lift the throttle
+    retry_after = getattr(exception, "retry_after", None)
+    if retry_after and retry_after > settings.RETRY_MAX_WAIT:
+        return False
+
+    budget = _retry_budget.get()
+    if budget is not None and not budget.spend():
+        METRICS.increment("retry_budget_exhausted_total")
+        return False
+
+    METRICS.increment("retries_total", failure=failure)
+    logger.debug(
+        "Retrying %s after a %s failure (attempt %s) - %s",
+        retry_state.fn.__name__, failure, retry_state.attempt_number, exception,
+    )
+    return True
+
+
+def _get_wait(retry_state) -> float:
+    max_backoff = settings.RETRY_BASE_WAIT * 2 ** (retry_state.attempt_number - 1)
+    backoff = random.uniform(0, min(settings.RETRY_MAX_WAIT, max_backoff))
+
+    retry_after = getattr(retry_state.outcome.exception(), "retry_after", None)
+    return max(retry_after or 0, backoff)
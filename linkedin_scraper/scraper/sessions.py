@@ -0,0 +1,171 @@
+import asyncio
+import hashlib
+import time
+import weakref
+from dataclasses import dataclass, field
+
+from dynaconf_config import settings
+from linkedin_scraper.scraper.login import Login
+from linkedin_scraper.scraper.validator import SESSION_VALIDATOR
+
+
+@dataclass
+class LinkedinSession:
+    """
+    Logged-in LinkedIn session shared by every scraper of an account.
+    """
+
+    account_id: str
+    cookies: dict
+    csrf_token: str
+    created_at: float = field(default_factory=time.monotonic)
+    expires_at: float = None
+
+
+def get_csrf_token(cookies: dict) -> str:
+    """
+    LinkedIn expects the `JSESSIONID` cookie value,
+    without quotes, as the CSRF token.
+    """
+    return cookies["JSESSIONID"].replace('"', "").strip()
+
+
+class SessionRegistry:
+    """
+    In-memory registry of the logged-in sessions of the process, keyed by
+    the credentials hash. Every scraper of an account gets the same
+    session, so `Login` only runs once per account until the session
+    reaches its TTL or gets invalidated. Cached cookies are only handed
+    out after LinkedIn accepted them (see `SessionValidator`).
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Args:
+            ttl (float): Seconds a session is handed out before reloading it.
+        """
+        self.ttl = ttl
+        self._sessions = {}
+        self._logins = {}
+        # Dropped once no coroutine holds or waits for them
+        self._locks = weakref.WeakValueDictionary()
+
+    async def resolve(self, email: str = None, password: str = None,
+                      cookies: dict = None) -> LinkedinSession:
+        """
+        Returns the session of a scraping request: the cookie bundle given
+        by the caller, which skips the login, else the session of the account.
+        """
+        if cookies:
+            return self.get_session_from_cookies(cookies)
+        return await self.get_session(email=email, password=password)
+
+    async def get_session(self, email: str, password: str) -> LinkedinSession:
+        """
+        Returns the session of the account, logging in only if
+        there is no live session in the registry.
+        """
+        login = Login(email=email, password=password)
+        session = self._get_live_session(login.account_id)
+        if session:
+            return session
+
+        # Only one coroutine loads the session of an account,
+        # the others wait for it and take the same session.
+        async with self._get_lock(login.account_id):
+            session = self._get_live_session(login.account_id)
+            if session:
+                return session
+
+            # Loading the cookies from the cache, checking that LinkedIn
+            # still accepts them, or logging in
+            cookies = await login.aget_cached_cookie()
+            if cookies and not await SESSION_VALIDATOR.is_valid(login.account_id, cookies):
+                await asyncio.to_thread(login.discard_cached_cookies, cookies)
+                cookies = {}
+            if not cookies:
+                cookies = await login.alogin()
+            return await self._store_session(login, cookies)
+
+    async def refresh(self, account_id: str, min_expiry: float):
+        """
+        Logs the account in again before its session expires, and
+        replaces the session handed out to the scrapers.
+
+        Args:
+            account_id (str): Credentials hash of the account.
+            min_expiry (float): The new session must expire after this timestamp.
+        """
+        login = self._logins.get(account_id)
+        if not login:
+            return
+
+        async with self._get_lock(account_id):
+            cookies = await login.alogin(min_expiry=min_expiry)
+            await self._store_session(login, cookies)
+
+    def _get_lock(self, account_id: str) -> asyncio.Lock:
+        lock = self._locks.get(account_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[account_id] = lock
+        return lock
+
+    def get_session_expiries(self) -> dict:
+        """
+        Returns the expiry timestamp of the session of every account
+        the registry can log in again, keyed by account id.
+        """
+        return {
+            account_id: session.expires_at
+            for account_id, session in self._sessions.items()
+            if account_id in self._logins and session.expires_at
+        }
+
+    async def _store_session(self, login: Login, cookies: dict) -> LinkedinSession:
+        session = LinkedinSession(
+            account_id=login.account_id,
+            cookies=cookies,
+            csrf_token=get_csrf_token(cookies),
+            expires_at=await asyncio.to_thread(login.get_session_expiry),
+        )
+        self._sessions[login.account_id] = session
+        self._logins[login.account_id] = login
+        return session
+
+    def _get_live_session(self, account_id: str) -> LinkedinSession:
+        session = self._sessions.get(account_id)
+        if session and time.monotonic() - session.created_at < self.ttl:
+            return session
+        return None
+
+    def get_session_from_cookies(self, cookies: dict) -> LinkedinSession:
+        """
+        Wraps a pre-authenticated cookie bundle given by the caller in a
+        session, without any login. The session is not kept in the registry,
+        it is identified by the hash of its `li_at` cookie.
+        """
+        return LinkedinSession(
+            account_id=hashlib.md5(cookies["li_at"].encode()).hexdigest(),
+            cookies=cookies,
+            csrf_token=get_csrf_token(cookies),
+        )
+
+    async def invalidate(self, session: LinkedinSession):
+        """
+        Drops a session rejected by LinkedIn (401/403), along with its
+        cached cookies, so the next `get_session` logs in again.
+        The session is dropped right away, and the cookie store is
+        updated off the event loop. A stale session, already replaced
+        by a newer one, leaves the account untouched.
+        """
+        if self._sessions.get(session.account_id) is not session:
+            return
+
+        del self._sessions[session.account_id]
+        login = self._logins.pop(session.account_id, None)
+        if login:
+            await asyncio.to_thread(login.discard_cached_cookies, session.cookies)
+
+
+SESSION_REGISTRY = SessionRegistry(ttl=settings.SESSION_REGISTRY_TTL)
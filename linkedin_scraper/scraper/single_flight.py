@@ -0,0 +1,68 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from linkedin_scraper.metrics import METRICS
+
+logger = logging.getLogger("linkedin-scraper")
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Coalesces identical calls in flight: the callers of a key that is
+    already being fetched await the same upstream task instead of
+    sending their own requests.
+
+    Every caller awaits the task through `asyncio.shield`, so a caller
+    going away doesn't cancel the call of the others. The upstream task
+    is only cancelled once its last caller went away.
+    """
+
+    def __init__(self):
+        self._flights = {}
+
+    async def run(self, key: tuple, func, *args, **kwargs):
+        """
+        Awaits `func(*args, **kwargs)`, or the call of `key` already in flight.
+
+        Args:
+            key (tuple): Identifies the identical calls.
+            func: Async function making the call.
+
+        Returns:
+            The result of the call, shared by all its callers.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(func(*args, **kwargs)))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+        else:
+            METRICS.increment("single_flight_coalesced_total", endpoint=key[1])
+            logger.debug("Joining the call in flight for %s", key)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if not flight.task.done() and flight.waiters == 1:
+                # Last caller gone, nobody needs the call anymore. Forgetting
+                # it right away, so a new caller doesn't join a cancelled call.
+                self._forget(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _forget(self, key: tuple, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+VOYAGER_CALLS = SingleFlight()
@@ -0,0 +1,36 @@
+import sqlite3
+import threading
+
+
+class SQLiteDatabase:
+    """
+    SQLite database in WAL mode, so that the gunicorn workers of a host
+    can read and write it concurrently. Every thread gets its own
+    connection, as SQLite connections can't be shared between threads.
+    """
+
+    def __init__(self, path: str, timeout: float = 10):
+        """
+        Args:
+            path (str): Path of the database file.
+            timeout (float): Seconds to wait for the lock of another writer.
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def execute(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+        """
+        Runs a query in its own transaction, committed on success.
+        """
+        with self._get_connection() as connection:
+            return connection.execute(query, params)
+
+    def _get_connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
@@ -1,6 +1,14 @@
+import asyncio
 import base64
+import fcntl
+import html
 import json
+import os
 import re
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
 
 
 def get_headers(header_type: str) -> dict:
@@ -61,33 +69,131 @@ def extract_public_identifier(response) -> str:
         return None
 
 
-def encode_pagination_id(page_number: int) -> str:
+def extract_hidden_inputs(response) -> dict:
+    """
+    Extracts the hidden inputs of the forms of an HTML page,
+    like the CSRF parameters of the LinkedIn login form.
+
+    Args:
+        response (Response): The HTTP response object containing the HTML page.
+
+    Returns:
+        dict: Input names mapped to their values.
+    """
+    hidden_inputs = {}
+    for input_tag in re.findall(r'<input[^>]*type="hidden"[^>]*>', response.text):
+        name = re.search(r'name="(.*?)"', input_tag)
+        value = re.search(r'value="(.*?)"', input_tag)
+        if not name:
+            continue
+        hidden_inputs[name.group(1)] = html.unescape(value.group(1)) if value else ""
+    return hidden_inputs
+
+
+def encode_pagination_id(page_number: int, snapshot_id: str = None,
+                         offset: int = None) -> str:
     """
     Encodes a pagination ID for LinkedIn profile data navigation.
 
     Args:
         page_number (int): The page number to encode.
+        snapshot_id (str, optional): Connections snapshot the next page is cut from.
+        offset (int, optional): Offset of the next page in the listing.
 
     Returns:
         str: A Base64-encoded string representing the pagination ID.
     """
     raw_data = {"next_page_number": page_number}
+    if snapshot_id:
+        raw_data["snapshot_id"] = snapshot_id
+        raw_data["offset"] = offset
     raw_data = json.dumps(raw_data)
     pagination_id = base64.b64encode(raw_data.encode("utf-8")).decode("utf-8")
     return pagination_id
 
 
-def decode_pagination_id(pagination_id: str) -> int:
+def decode_pagination_id(pagination_id: str) -> dict:
     """
-    Decodes a Base64-encoded pagination ID to retrieve the next page number.
+    Decodes a Base64-encoded pagination ID. The IDs encoded before the
+    connections snapshots only have the page number, their offset is
+    the start of that page.
 
     Args:
         pagination_id (str): The Base64-encoded pagination string.
 
     Returns:
-        int: The extracted page number.
+        dict: The `next_page_number`, `snapshot_id` (None if not set) and `offset`.
     """
     decoded_data = base64.b64decode(pagination_id).decode("utf-8")
     json_data = json.loads(decoded_data)
     next_page_number = int(json_data["next_page_number"])
-    return next_page_number
+    offset = json_data.get("offset")
+    return {
+        "next_page_number": next_page_number,
+        "snapshot_id": json_data.get("snapshot_id"),
+        "offset": int(offset) if offset is not None else 40 * next_page_number,
+    }
+
+
+@asynccontextmanager
+async def async_file_lock(lock_path: str):
+    """
+    Exclusive lock on a lock file, shared by every process of the host.
+    The lock is awaited in a thread, so waiting for it doesn't block the
+    event loop.
+
+    Args:
+        lock_path (str): Path of the lock file, created if missing.
+    """
+    lock_file = open(lock_path, "a")
+    try:
+        await asyncio.to_thread(fcntl.flock, lock_file.fileno(), fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the file also releases the lock
+        lock_file.close()
+
+
+def dump_json_atomically(data, path: str):
+    """
+    Writes the data as a JSON file through a temp file and a rename,
+    so readers never load a half-written file.
+
+    Args:
+        data: JSON serializable data.
+        path (str): Destination path.
+    """
+    directory = os.path.dirname(path)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(file_descriptor, "w") as file:
+            json.dump(data, file, indent=4)
+        os.replace(temp_path, path)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+
+def parse_retry_after(value: str) -> float:
+    """
+    Parses a `Retry-After` header, given in seconds or as an HTTP date.
+
+    Args:
+        value (str): Header value.
+
+    Returns:
+        float: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - time.time())
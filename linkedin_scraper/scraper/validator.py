@@ -1,5 +1,90 @@
+import time
+from copy import deepcopy
 
+from dynaconf_config import settings
+from linkedin_scraper.exceptions import RequestFailedException
+from linkedin_scraper.scraper.requests import Request
+from linkedin_scraper.scraper.utils import get_headers
 
-def validate_session_cookies(cookies: dict):
-    return True
+# Cookies a LinkedIn session can't work without
+SESSION_COOKIES = ["li_at", "JSESSIONID"]
 
+
+def get_session_expiry(raw_cookies: list) -> float:
+    """
+    Returns the timestamp when the first session cookie expires,
+    from the `expiry` metadata of the raw selenium cookies.
+    None if none of the session cookies has an expiry.
+    """
+    expiries = [
+        cookie["expiry"] for cookie in raw_cookies or []
+        if cookie.get("name") in SESSION_COOKIES and cookie.get("expiry")
+    ]
+    return min(expiries) if expiries else None
+
+
+def validate_session_cookies(raw_cookies: list) -> bool:
+    """
+    Offline check of the raw selenium cookies. The session cookies must
+    be present and must not be expired.
+    """
+    if not raw_cookies:
+        return False
+
+    cookie_names = [cookie.get("name") for cookie in raw_cookies]
+    if not all(cookie_name in cookie_names for cookie_name in SESSION_COOKIES):
+        return False
+
+    session_expiry = get_session_expiry(raw_cookies)
+    return not session_expiry or session_expiry > time.time()
+
+
+class SessionValidator:
+    """
+    Checks that LinkedIn still accepts the session cookies with a cheap
+    authenticated request. The verdict is cached per account and cookie
+    for `ttl` seconds, so the probe is not sent on every login lookup.
+    """
+
+    probe_url = "https://www.linkedin.com/voyager/api/me"
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._verdicts = {}
+
+    async def is_valid(self, account_id: str, cookies: dict) -> bool:
+        """
+        Returns False only if LinkedIn rejected the session.
+        Inconclusive probes (network errors, 5xx...) are not
+        cached and count as valid.
+        """
+        verdict_key = (account_id, cookies.get("li_at"))
+        verdict = self._verdicts.get(verdict_key)
+        if verdict and time.monotonic() - verdict[1] < self.ttl:
+            return verdict[0]
+
+        valid = await self._probe(account_id, cookies)
+        if valid is None:
+            return True
+
+        self._verdicts[verdict_key] = (valid, time.monotonic())
+        return valid
+
+    async def _probe(self, account_id: str, cookies: dict):
+        headers = deepcopy(get_headers(header_type="profile_page"))
+        headers["csrf-token"] = cookies.get("JSESSIONID", "").replace('"', "").strip()
+        try:
+            response = await Request(account=account_id).fetch(
+                url=self.probe_url, headers=headers, cookies=cookies
+            )
+        except RequestFailedException:
+            return None
+
+        if response.status_code in (401, 403):
+            return False
+        if response.status_code == 200:
+            return True
+        return None
+
+
+SESSION_VALIDATOR = SessionValidator(ttl=settings.SESSION_VALIDATION_TTL)
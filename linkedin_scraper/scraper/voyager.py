@@ -0,0 +1,57 @@
+from copy import deepcopy
+
+from linkedin_scraper.exceptions import (NotFoundException,
+                                         RequestFailedException,
+                                         SessionExpiredException,
+                                         ThrottledException)
+from linkedin_scraper.scraper.requests.response import Response
+from linkedin_scraper.scraper.sessions import (SESSION_REGISTRY,
+                                               LinkedinSession)
+from linkedin_scraper.scraper.utils import get_headers, parse_retry_after
+
+
+async def fetch_voyager(request, session: LinkedinSession, url: str,
+                        params: dict = None) -> Response:
+    """
+    Sends an authenticated Voyager API request with the session
+    cookies and CSRF token.
+
+    Args:
+        request (Request): Request object used to send the request.
+        session (LinkedinSession): Logged-in session.
+        url (str): Voyager API URL.
+        params (dict, optional): Query parameters.
+
+    Returns:
+        Response: Custom Response object.
+
+    Raises:
+        SessionExpiredException: If LinkedIn rejects the session (401/403).
+            The session is invalidated, so the next scraper logs in again.
+        ThrottledException: If LinkedIn throttles the account (429/999).
+        NotFoundException: If the requested entity doesn't exist (404).
+        RequestFailedException: If LinkedIn failed to answer (5xx).
+    """
+    headers = deepcopy(get_headers(header_type="profile_page"))
+    headers["csrf-token"] = session.csrf_token
+    response = await request.fetch(
+        url=url, params=params, headers=headers, cookies=session.cookies, hedge=True
+    )
+
+    if response.status_code in (401, 403):
+        await SESSION_REGISTRY.invalidate(session)
+        error_message = "LinkedIn rejected the session - %s" % response.status_code
+        raise SessionExpiredException(error_message)
+
+    if response.status_code in (429, 999):
+        error_message = "LinkedIn throttled the account - %s" % response.status_code
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        raise ThrottledException(error_message, retry_after=retry_after)
+
+    if response.status_code == 404:
+        raise NotFoundException("LinkedIn entity not found - %s" % url)
+
+    if response.status_code >= 500:
+        raise RequestFailedException("LinkedIn server error - %s" % response.status_code)
+
+    return response
@@ -1,10 +1,59 @@
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from dynaconf_config import settings
+from linkedin_scraper.scraper.browser_pool import BROWSER_POOL
+from linkedin_scraper.scraper.connections_prefetcher import \
+    CONNECTIONS_PREFETCHER
+from linkedin_scraper.scraper.login import LOGIN_EXECUTOR
+from linkedin_scraper.scraper.refresher import SESSION_REFRESHER
+from linkedin_scraper.scraper.requests.proxy_pool import PROXY_POOL
+from linkedin_scraper.scraper.requests.session_pool import SESSION_POOL
 from linkedin_scraper.web.routes import router
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Startup and shutdown hooks of the web app.
+    Starts the session refresher and the proxy prober, warms up the browser
+    pool if `BROWSER_POOL_PRELAUNCH` is set (else it fills with the logins),
+    and cancels the connections prefetches and closes the pooled HTTP
+    sessions, browsers and login threads when the worker stops.
+    """
+    SESSION_REFRESHER.start()
+    PROXY_POOL.start()
+    warm_up_task = None
+    if settings.BROWSER_POOL_PRELAUNCH:
+        warm_up_task = asyncio.create_task(warm_up_browser_pool())
+    yield
+    await SESSION_REFRESHER.stop()
+    await PROXY_POOL.stop()
+    await CONNECTIONS_PREFETCHER.stop()
+    await SESSION_POOL.close()
+    await asyncio.to_thread(BROWSER_POOL.close)
+    if warm_up_task is not None:
+        # Closing the pool stops the warm-up after the driver being launched,
+        # waiting for it so no Chrome process outlives the worker
+        await warm_up_task
+    LOGIN_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+
+
+async def warm_up_browser_pool():
+    """
+    Launches the pooled browsers in the login threads, without
+    holding the startup. A failure only means cold logins.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(LOGIN_EXECUTOR, BROWSER_POOL.warm_up)
+    except Exception:
+        logging.getLogger("linkedin-scraper").exception("Failed to warm up the browser pool")
+
+
 def main():
     """
     Initializes the web app
@@ -13,6 +62,6 @@ def main():
     uvicorn_logger = logging.getLogger("linkedin-scraper")
     uvicorn_logger.setLevel(logging.DEBUG)
 
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
     app.include_router(router)
     return app
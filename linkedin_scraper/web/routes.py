@@ -1,60 +1,273 @@
+import json
+import math
+
 from fastapi import APIRouter, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from linkedin_scraper.auth.authenticator import authenticate
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         InvalidFieldsException,
+                                         LoginChallengeException,
+                                         LoginFailedException,
+                                         NotFoundException,
+                                         SessionExpiredException,
+                                         ThrottledException)
+from linkedin_scraper.metrics import METRICS
 from linkedin_scraper.scraper.connections_scraper import \
     LinkedinConnectionsScraper
 from linkedin_scraper.scraper.profile_scraper import LinkedinProfileScraper
-from linkedin_scraper.web.schema import ConnectionsModel, ProfileModel
+from linkedin_scraper.scraper.requests.limiter import CONCURRENCY_LIMITER
+from linkedin_scraper.scraper.requests.proxy_pool import PROXY_POOL
+from linkedin_scraper.web.schema import (AuthModel, ConnectionsCrawlModel,
+                                         ConnectionsModel,
+                                         ConnectionsStreamModel, ProfileModel)
 
 router = APIRouter()
 
+# Media types of the streamed responses
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+# Status codes of the scraper errors, the others are 500
+ERROR_STATUS_CODES = {
+    InvalidFieldsException: status.HTTP_400_BAD_REQUEST,
+    SessionExpiredException: status.HTTP_401_UNAUTHORIZED,
+    LoginFailedException: status.HTTP_401_UNAUTHORIZED,
+    LoginChallengeException: status.HTTP_403_FORBIDDEN,
+    NotFoundException: status.HTTP_404_NOT_FOUND,
+    ThrottledException: status.HTTP_429_TOO_MANY_REQUESTS,
+    CircuitOpenException: status.HTTP_503_SERVICE_UNAVAILABLE,
+}
+
+
+def validate_request(item: ProfileModel) -> JSONResponse:
+    """
+    Checks the API key and the LinkedIn account details of a scraping
+    request. Returns the error response, None if the request is valid.
+    """
+    # Validating API call
+    valid_call = authenticate(item)
+    if not valid_call:
+        return JSONResponse(content={"Error": "Invalid API Key"},
+                            status_code=status.HTTP_401_UNAUTHORIZED)
+
+    # Validating LinkedIn account details
+    if not item.session_cookies and not (item.email and item.password):
+        return JSONResponse(content={"Error": "Email and password, or session cookies are required"},
+                            status_code=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
+def get_error_response(exe: Exception) -> JSONResponse:
+    """
+    Error response of a failed scraping request, with the status code
+    of the error (see `ERROR_STATUS_CODES`).
+    """
+    for exception_type, status_code in ERROR_STATUS_CODES.items():
+        if not isinstance(exe, exception_type):
+            continue
+        if isinstance(exe, (ThrottledException, CircuitOpenException)):
+            return retry_later_response(exe, status_code)
+        return JSONResponse(content={"Error": exe.message}, status_code=status_code)
+
+    return JSONResponse(content={"Error": "Something went wrong"},
+                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def retry_later_response(exe, status_code: int) -> JSONResponse:
+    """
+    Error response telling the client when to try again, if known.
+    Used for the throttles (429) and the open circuits (503).
+    """
+    headers = {}
+    if exe.retry_after:
+        headers["Retry-After"] = str(math.ceil(exe.retry_after))
+    return JSONResponse(content={"Error": exe.message},
+                        status_code=status_code,
+                        headers=headers)
+
 
 @router.post("/api/connections")
 async def get_connections_data(item: ConnectionsModel):
-    try:
-        # Validating API call
-        valid_call = authenticate(item)
-        if not valid_call:
-            return JSONResponse(content={"Error": "Invalid API Key"},
-                                status_code=status.HTTP_401_UNAUTHORIZED)
+    error_response = validate_request(item)
+    if error_response:
+        return error_response
 
+    try:
         # Creating a linkedin-scraper object
         scraper = LinkedinConnectionsScraper(
             email=item.email,
             password=item.password,
-            pagination_id=item.pagination_id
+            pagination_id=item.pagination_id,
+            fields=item.fields,
+            cookies=item.get_cookies(),
+            max_age=item.max_age,
+            no_cache=item.no_cache,
+            prefetch=item.prefetch,
         )
 
         # Scraping connections data
         connections_profile_data = await scraper.get_connections_data()
         return JSONResponse(content=connections_profile_data, status_code=status.HTTP_200_OK)
 
-    except Exception:
-        return JSONResponse(content={"Error": "Something went wrong"},
-                                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    except Exception as exe:
+        return get_error_response(exe)
+
+
+def encode_stream_record(record: dict, stream_format: str) -> str:
+    """
+    Encodes a record of a streamed response as a NDJSON line, or as a
+    Server-Sent Event named `profile`, `failed`, `end` or `error` after the record.
+    """
+    data = json.dumps(record)
+    if stream_format != "sse":
+        return data + "\n"
+
+    if "profile" in record:
+        event = "profile"
+    elif "failed" in record:
+        event = "failed"
+    elif "Error" in record:
+        event = "error"
+    else:
+        event = "end"
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/api/connections/stream")
+async def stream_connections_data(item: ConnectionsStreamModel):
+    error_response = validate_request(item)
+    if error_response:
+        return error_response
+
+    try:
+        # Creating a linkedin-scraper object
+        scraper = LinkedinConnectionsScraper(
+            email=item.email,
+            password=item.password,
+            pagination_id=item.pagination_id,
+            fields=item.fields,
+            cookies=item.get_cookies(),
+            max_age=item.max_age,
+            no_cache=item.no_cache,
+            prefetch=item.prefetch,
+        )
+
+        records = scraper.stream_connections_data()
+        return await get_stream_response(records, item.stream_format)
+
+    except Exception as exe:
+        return get_error_response(exe)
+
+
+async def get_stream_response(records, stream_format: str) -> StreamingResponse:
+    """
+    Streams the records, encoded with `encode_stream_record`. The first
+    record is scraped before answering, so the login and listing errors
+    are raised here and still get their status code.
+    """
+    first_record = await records.__anext__()
+
+    async def encode_records():
+        try:
+            yield encode_stream_record(first_record, stream_format)
+            async for record in records:
+                yield encode_stream_record(record, stream_format)
+        except Exception:
+            # The status code is already sent, ending the stream with an error record
+            yield encode_stream_record({"Error": "Something went wrong"}, stream_format)
+        finally:
+            # Stopping the scraping if the client went away
+            await records.aclose()
+
+    return StreamingResponse(encode_records(),
+                             media_type=STREAM_MEDIA_TYPES[stream_format],
+                             headers={"Cache-Control": "no-cache"})
+
+
+@router.post("/api/connections/crawl")
+async def crawl_connections_data(item: ConnectionsCrawlModel):
+    error_response = validate_request(item)
+    if error_response:
+        return error_response
+
+    try:
+        # Creating a linkedin-scraper object
+        scraper = LinkedinConnectionsScraper(
+            email=item.email,
+            password=item.password,
+            fields=item.fields,
+            cookies=item.get_cookies(),
+            max_age=item.max_age,
+            no_cache=item.no_cache,
+        )
+
+        # Crawling all the connections, streamed as they are scraped
+        records = scraper.stream_crawl_records()
+        return await get_stream_response(records, item.stream_format)
+
+    except Exception as exe:
+        return get_error_response(exe)
 
 
 @router.post("/api/profile")
 async def get_profile_data(item: ProfileModel):
-    try:
-        # Validating API call
-        valid_call = authenticate(item)
-        if not valid_call:
-            return JSONResponse(content={"Error": "Invalid API Key"},
-                                status_code=status.HTTP_401_UNAUTHORIZED)
+    error_response = validate_request(item)
+    if error_response:
+        return error_response
 
+    try:
         # Creating a linkedin-scraper object
         scraper = LinkedinProfileScraper(
             email=item.email,
-            password=item.password
+            password=item.password,
+            cookies=item.get_cookies()
         )
 
         # Scraping profile data
-        profile_data = await scraper.get_profile_data()
+        profile_data = await scraper.get_profile_data(
+            fields=item.fields, max_age=item.max_age, no_cache=item.no_cache
+        )
         return JSONResponse(content=profile_data,
                                 status_code=status.HTTP_200_OK)
 
-    except Exception:
-        return JSONResponse(content={"Error": "Something went wrong"},
-                                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    except Exception as exe:
+        return get_error_response(exe)
+
+
+@router.post("/api/admin/metrics")
+async def get_metrics(item: AuthModel):
+    # Validating API call
+    valid_call = authenticate(item)
+    if not valid_call:
+        return JSONResponse(content={"Error": "Invalid API Key"},
+                            status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return JSONResponse(content=METRICS.snapshot(),
+                        status_code=status.HTTP_200_OK)
+
+
+@router.post("/api/admin/limiter")
+async def get_limiter_windows(item: AuthModel):
+    # Validating API call
+    valid_call = authenticate(item)
+    if not valid_call:
+        return JSONResponse(content={"Error": "Invalid API Key"},
+                            status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return JSONResponse(content={"windows": CONCURRENCY_LIMITER.snapshot()},
+                        status_code=status.HTTP_200_OK)
+
+
+@router.post("/api/admin/proxies")
+async def get_proxies_health(item: AuthModel):
+    # Validating API call
+    valid_call = authenticate(item)
+    if not valid_call:
+        return JSONResponse(content={"Error": "Invalid API Key"},
+                            status_code=status.HTTP_401_UNAUTHORIZED)
+
+    return JSONResponse(content={"proxies": PROXY_POOL.snapshot()},
+                        status_code=status.HTTP_200_OK)
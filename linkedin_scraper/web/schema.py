@@ -1,3 +1,5 @@
+from typing import List, Literal
+
 from pydantic import BaseModel
 
 
@@ -5,10 +7,46 @@ class AuthModel(BaseModel):
     x_api_key: str
 
 
+class SessionCookiesModel(BaseModel):
+    li_at: str
+    JSESSIONID: str
+    bcookie: str = None
+    bscookie: str = None
+    lang: str = None
+    liap: str = None
+
+    def to_cookies(self) -> dict:
+        cookies = {
+            "li_at": self.li_at,
+            "JSESSIONID": self.JSESSIONID,
+            "bcookie": self.bcookie,
+            "bscookie": self.bscookie,
+            "lang": self.lang,
+            "liap": self.liap,
+        }
+        return {name: value for name, value in cookies.items() if value}
+
+
 class ProfileModel(AuthModel):
-    email: str
-    password: str
+    email: str = None
+    password: str = None
+    session_cookies: SessionCookiesModel = None
+    fields: List[str] = None
+    max_age: int = None
+    no_cache: bool = False
+
+    def get_cookies(self) -> dict:
+        return self.session_cookies.to_cookies() if self.session_cookies else None
 
 
 class ConnectionsModel(ProfileModel):
     pagination_id: str = None
+    prefetch: bool = False
+
+
+class ConnectionsStreamModel(ConnectionsModel):
+    stream_format: Literal["ndjson", "sse"] = "ndjson"
+
+
+class ConnectionsCrawlModel(ProfileModel):
+    stream_format: Literal["ndjson", "sse"] = "ndjson"
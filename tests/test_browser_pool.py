@@ -0,0 +1,57 @@
+import time
+
+from linkedin_scraper.scraper.browser_pool import BrowserPool, PooledDriver
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class FakeBrowserPool(BrowserPool):
+    def _launch_driver(self) -> PooledDriver:
+        return PooledDriver(driver=FakeDriver(), profile_dir="")
+
+    @staticmethod
+    def _reset_driver(driver):
+        pass
+
+
+def test_idle_drivers_are_quit_after_the_idle_timeout():
+    pool = FakeBrowserPool(size=2, max_uses=10, idle_timeout=0.05)
+    with pool.driver() as driver:
+        pass
+
+    assert not driver.quit_called
+    time.sleep(0.2)
+    assert driver.quit_called
+    assert pool._alive_drivers == 0
+    assert pool._idle_drivers.empty()
+
+
+def test_recently_used_drivers_are_kept():
+    pool = FakeBrowserPool(size=1, max_uses=10, idle_timeout=60)
+    with pool.driver() as driver:
+        pass
+
+    pool._close_idle_drivers()
+    assert not driver.quit_called
+    with pool.driver() as reused_driver:
+        assert reused_driver is driver
+    pool.close()
+
+
+def test_closing_the_pool_stops_the_warm_up():
+    class ClosedWhileLaunchingPool(FakeBrowserPool):
+        def _launch_driver(self) -> PooledDriver:
+            self.close()
+            return super()._launch_driver()
+
+    pool = ClosedWhileLaunchingPool(size=3, max_uses=10)
+    pool.warm_up()
+
+    assert pool._alive_drivers == 0
+    assert pool._idle_drivers.empty()
@@ -0,0 +1,111 @@
+import time
+
+import pytest
+
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         RequestFailedException)
+from linkedin_scraper.scraper.requests.circuit_breaker import (CircuitBreaker,
+                                                               CircuitBreakers)
+
+PROFILE_URL = "https://www.linkedin.com/voyager/api/identity/profiles/jane/profileView"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.headers = {}
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    options = {"failure_threshold": 2, "open_seconds": 60, "half_open_probes": 1}
+    options.update(kwargs)
+    return CircuitBreaker(name="test", **options)
+
+
+def send(breakers: CircuitBreakers, status_code: int, account: str = "a", proxy: str = None):
+    with breakers.guard(url=PROFILE_URL, account=account, proxy=proxy) as permit:
+        permit.set_response(FakeResponse(status_code))
+
+
+def test_breaker_opens_after_the_failure_threshold():
+    breaker = make_breaker()
+    breaker.record(breaker.allow(), success=False)
+    assert breaker.state == "closed"
+
+    breaker.record(breaker.allow(), success=False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenException):
+        breaker.allow()
+
+
+def test_half_open_breaker_closes_on_a_successful_probe():
+    breaker = make_breaker(failure_threshold=1)
+    breaker.record(breaker.allow(), success=False)
+    breaker.retry_at = time.monotonic()
+
+    probe = breaker.allow()
+    assert probe and breaker.state == "half_open"
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenException):
+        breaker.allow()
+
+    breaker.record(probe, success=True)
+    assert breaker.state == "closed"
+    assert breaker.allow() is False
+
+
+def test_half_open_breaker_opens_again_on_a_failed_probe():
+    breaker = make_breaker(failure_threshold=1)
+    breaker.record(breaker.allow(), success=False)
+    breaker.retry_at = time.monotonic()
+
+    breaker.record(breaker.allow(), success=False)
+    assert breaker.state == "open"
+    assert breaker.retry_at > time.monotonic()
+
+
+def test_cancelled_probe_frees_its_slot():
+    breaker = make_breaker(failure_threshold=1)
+    breaker.record(breaker.allow(), success=False)
+    breaker.retry_at = time.monotonic()
+
+    breaker.record(breaker.allow(), success=None)
+    assert breaker.state == "half_open"
+    assert breaker.allow() is True
+
+
+def test_rejection_by_a_later_breaker_frees_the_earlier_probes():
+    breakers = CircuitBreakers(failure_threshold=1, open_seconds=60, half_open_probes=1)
+    with pytest.raises(RequestFailedException):
+        with breakers.guard(url=PROFILE_URL, account="a"):
+            raise RequestFailedException("network error")
+
+    account_breaker = breakers._get_breaker("account:a")
+    account_breaker.retry_at = time.monotonic()
+    # The endpoint breaker is still open and rejects the probe of the account
+    with pytest.raises(CircuitOpenException):
+        send(breakers, 200)
+
+    assert account_breaker.state == "half_open"
+    assert account_breaker.probes == 0
+
+
+def test_throttles_dont_open_the_endpoint_breaker():
+    breakers = CircuitBreakers(failure_threshold=2, open_seconds=60, half_open_probes=1)
+    for _ in range(2):
+        send(breakers, 429, account="a", proxy="http://proxy-a")
+
+    assert breakers._get_breaker("account:a").state == "open"
+    assert breakers._get_breaker("endpoint:identity/profiles").state == "closed"
+    # The other accounts can still call the endpoint
+    send(breakers, 200, account="b", proxy="http://proxy-b")
+
+
+def test_server_errors_open_the_endpoint_breaker():
+    breakers = CircuitBreakers(failure_threshold=2, open_seconds=60, half_open_probes=1)
+    send(breakers, 503, account="a", proxy="http://proxy-a")
+    send(breakers, 503, account="b", proxy="http://proxy-b")
+
+    assert breakers._get_breaker("endpoint:identity/profiles").state == "open"
+    with pytest.raises(CircuitOpenException):
+        send(breakers, 200, account="c", proxy="http://proxy-c")
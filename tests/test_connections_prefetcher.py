@@ -0,0 +1,103 @@
+import asyncio
+
+from linkedin_scraper.metrics import METRICS
+from linkedin_scraper.scraper.connections_prefetcher import \
+    ConnectionsPrefetcher
+
+
+def count(name: str) -> float:
+    return METRICS._counters.get((name, ()), 0)
+
+
+async def prefetch_page(calls: list):
+    calls.append(1)
+
+
+async def hang():
+    await asyncio.Event().wait()
+
+
+def test_budget_caps_the_prefetches_and_refunds_the_skipped_ones():
+    prefetcher = ConnectionsPrefetcher(pages_per_hour=3600, burst=2, ttl=60)
+    skipped = count("connections_prefetch_skipped_total")
+    calls = []
+
+    async def schedule_pages():
+        scheduled = [
+            prefetcher.schedule("account", "snapshot", offset, prefetch_page, calls)
+            for offset in (40, 80, 120, 160)
+        ]
+        # One page per second, the skipped pages didn't spend the refilled token
+        prefetcher._budgets["account"].updated_at -= 1
+        scheduled.append(prefetcher.schedule("account", "snapshot", 200, prefetch_page, calls))
+        await prefetcher.stop()
+        return scheduled
+
+    assert asyncio.run(schedule_pages()) == [True, True, False, False, True]
+    assert count("connections_prefetch_skipped_total") == skipped + 2
+
+
+def test_page_already_prefetched_isnt_scheduled_again():
+    prefetcher = ConnectionsPrefetcher(pages_per_hour=3600, burst=1, ttl=60)
+
+    async def schedule_twice():
+        scheduled = [
+            prefetcher.schedule("account", "snapshot", 40, hang) for _ in range(2)
+        ]
+        await prefetcher.stop()
+        return scheduled
+
+    assert asyncio.run(schedule_twice()) == [True, True]
+
+
+def test_unclaimed_running_prefetch_is_cancelled_after_the_ttl():
+    prefetcher = ConnectionsPrefetcher(pages_per_hour=3600, burst=1, ttl=0.01)
+    cancelled = count("connections_prefetch_cancelled_total")
+
+    async def expire():
+        prefetcher.schedule("account", "snapshot", 40, hang)
+        task = prefetcher._prefetches[("account", "snapshot", 40)].task
+        await asyncio.sleep(0.05)
+        return task
+
+    task = asyncio.run(expire())
+    assert task.cancelled()
+    assert not prefetcher._prefetches
+    assert count("connections_prefetch_cancelled_total") == cancelled + 1
+
+
+def test_unclaimed_finished_prefetch_is_wasted():
+    prefetcher = ConnectionsPrefetcher(pages_per_hour=3600, burst=1, ttl=0.01)
+    wasted = count("connections_prefetch_wasted_total")
+    calls = []
+
+    async def expire():
+        prefetcher.schedule("account", "snapshot", 40, prefetch_page, calls)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(expire())
+    assert calls == [1]
+    assert count("connections_prefetch_wasted_total") == wasted + 1
+
+
+def test_claimed_prefetch_is_neither_cancelled_nor_wasted():
+    prefetcher = ConnectionsPrefetcher(pages_per_hour=3600, burst=1, ttl=0.01)
+    counts = [count(name) for name in (
+        "connections_prefetch_claimed_total",
+        "connections_prefetch_wasted_total",
+        "connections_prefetch_cancelled_total",
+    )]
+    calls = []
+
+    async def claim():
+        prefetcher.schedule("account", "snapshot", 40, prefetch_page, calls)
+        prefetcher.claim("account", "snapshot", 40)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(claim())
+    assert calls == [1]
+    assert [count(name) for name in (
+        "connections_prefetch_claimed_total",
+        "connections_prefetch_wasted_total",
+        "connections_prefetch_cancelled_total",
+    )] == [counts[0] + 1, counts[1], counts[2]]
@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.exceptions import SessionExpiredException
+from linkedin_scraper.scraper import connections_scraper, retry_policy
+from linkedin_scraper.scraper.connections_scraper import \
+    LinkedinConnectionsScraper
+from linkedin_scraper.scraper.sessions import LinkedinSession
+
+
+class StubProfileScraper:
+    def __init__(self, failing: set = ()):
+        self.failing = failing
+        self.budgets = []
+
+    async def get_profile_data(self, public_identifier=None, fields=None,
+                               max_age=None, no_cache=False):
+        self.budgets.append(retry_policy._retry_budget.get())
+        await asyncio.sleep(0)
+        if public_identifier in self.failing:
+            raise RuntimeError("failed %s" % public_identifier)
+        return {"public_id": public_identifier}
+
+
+def make_scraper(profile_scraper: StubProfileScraper) -> LinkedinConnectionsScraper:
+    scraper = LinkedinConnectionsScraper()
+    scraper.session = LinkedinSession(account_id="account", cookies={"li_at": "x"}, csrf_token="token")
+    scraper._get_profile_scraper = lambda: profile_scraper
+    return scraper
+
+
+def test_streamed_page_shares_one_retry_budget():
+    profile_scraper = StubProfileScraper()
+    scraper = make_scraper(profile_scraper)
+    listing_budgets = []
+
+    async def get_listing_data(start_index):
+        listing_budgets.append(retry_policy._retry_budget.get())
+        return ["p%s" % index for index in range(5)] if not start_index else []
+
+    scraper._get_listing_data = get_listing_data
+
+    async def stream():
+        return [record async for record in scraper.stream_connections_data()]
+
+    records = asyncio.run(stream())
+
+    assert len(records) == 6
+    assert records[-1]["errors"] == []
+    assert len(profile_scraper.budgets) == 5
+    assert {id(budget) for budget in profile_scraper.budgets} == {id(listing_budgets[0])}
+
+
+def make_listing(pages: int, failing_start: int = None):
+    starts = []
+
+    async def get_listing_data(start_index):
+        starts.append(start_index)
+        if start_index == failing_start:
+            raise RuntimeError("listing failed")
+        if start_index >= pages * 40:
+            return []
+        return ["p%s" % index for index in range(start_index, start_index + 40)]
+
+    return get_listing_data, starts
+
+
+def crawl(scraper: LinkedinConnectionsScraper) -> list:
+    async def collect():
+        return [result async for result in scraper.crawl_connections()]
+
+    return asyncio.run(collect())
+
+
+def test_crawl_yields_every_profile_and_the_failed_ones():
+    scraper = make_scraper(StubProfileScraper(failing={"p3"}))
+    scraper._get_listing_data, starts = make_listing(pages=2)
+
+    results = crawl(scraper)
+
+    assert starts == [0, 40, 80]
+    assert sorted(result.public_identifier for result in results) == sorted(
+        "p%s" % index for index in range(80)
+    )
+    errors = [result for result in results if result.error]
+    assert [(error.public_identifier, error.error) for error in errors] == [("p3", "failed p3")]
+
+
+def test_crawl_raises_the_error_of_the_first_listing_page():
+    scraper = make_scraper(StubProfileScraper())
+    scraper._get_listing_data, _ = make_listing(pages=2, failing_start=0)
+
+    with pytest.raises(RuntimeError):
+        crawl(scraper)
+
+
+def test_crawl_keeps_the_profiles_before_a_failed_listing_page():
+    scraper = make_scraper(StubProfileScraper())
+    scraper._get_listing_data, _ = make_listing(pages=3, failing_start=40)
+
+    results = crawl(scraper)
+
+    profiles = [result for result in results if result.error is None]
+    assert len(profiles) == 40
+    assert [result.error for result in results if result.error] == ["listing failed"]
+
+
+def test_closing_the_crawl_cancels_the_pipeline(monkeypatch):
+    monkeypatch.setattr(connections_scraper.settings, "CONNECTIONS_CRAWL_WORKERS", 2)
+    monkeypatch.setattr(connections_scraper.settings, "CONNECTIONS_CRAWL_QUEUE_SIZE", 2)
+    cancelled = []
+
+    class BlockingProfileScraper(StubProfileScraper):
+        async def get_profile_data(self, public_identifier=None, **kwargs):
+            if public_identifier == "p0":
+                return {"public_id": public_identifier}
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(public_identifier)
+                raise
+
+    scraper = make_scraper(BlockingProfileScraper())
+    scraper._get_listing_data, starts = make_listing(pages=100)
+
+    async def read_one_result():
+        results = scraper.crawl_connections()
+        result = await results.__anext__()
+        await results.aclose()
+        return result
+
+    result = asyncio.run(read_one_result())
+
+    assert result.public_identifier == "p0"
+    # The bounded queues held the listing back, and the workers were cancelled
+    assert starts == [0]
+    assert sorted(cancelled) == ["p1", "p2"]
+
+
+def test_rejected_session_stops_the_crawl():
+    sent_profile_ids = []
+
+    class ExpiringProfileScraper(StubProfileScraper):
+        async def get_profile_data(self, public_identifier=None, **kwargs):
+            sent_profile_ids.append(public_identifier)
+            raise SessionExpiredException("Session expired")
+
+    scraper = make_scraper(ExpiringProfileScraper())
+    scraper._get_listing_data, _ = make_listing(pages=10)
+
+    with pytest.raises(SessionExpiredException):
+        crawl(scraper)
+    # Only the profiles already in flight were sent
+    assert len(sent_profile_ids) <= connections_scraper.settings.CONNECTIONS_CRAWL_WORKERS
+
+
+def test_streamed_crawl_ends_with_the_counts():
+    scraper = make_scraper(StubProfileScraper(failing={"p3"}))
+    scraper._get_listing_data, _ = make_listing(pages=1)
+
+    async def stream():
+        return [record async for record in scraper.stream_crawl_records()]
+
+    records = asyncio.run(stream())
+
+    assert sum("profile" in record for record in records) == 39
+    assert {"failed": {"public_identifier": "p3", "error": "failed p3"}} in records
+    assert records[-1] == {"profiles": 39, "errors": 1}
@@ -0,0 +1,52 @@
+import asyncio
+
+from linkedin_scraper.scraper.connections_snapshots import (LISTING_PAGE_SIZE,
+                                                            ConnectionsSnapshots)
+
+
+def make_listing(size: int):
+    starts = []
+
+    async def fetch_listing_page(start: int) -> list:
+        starts.append(start)
+        return [f"p{index}" for index in range(start, min(start + LISTING_PAGE_SIZE, size))]
+
+    return fetch_listing_page, starts
+
+
+def test_first_page_fetches_one_listing_page():
+    snapshots = ConnectionsSnapshots(max_size=10, ttl=60, batch_pages=3)
+    fetch_listing_page, starts = make_listing(200)
+    snapshot = snapshots.get_snapshot("account")
+
+    profile_ids = asyncio.run(
+        snapshots.get_profile_ids(snapshot, 0, LISTING_PAGE_SIZE, fetch_listing_page)
+    )
+
+    assert profile_ids == [f"p{index}" for index in range(LISTING_PAGE_SIZE)]
+    assert starts == [0]
+
+
+def test_snapshot_miss_fetches_one_listing_page():
+    snapshots = ConnectionsSnapshots(max_size=10, ttl=60, batch_pages=3)
+    fetch_listing_page, starts = make_listing(200)
+    snapshot = snapshots.get_snapshot("account", snapshot_id="unknown", offset=40)
+
+    asyncio.run(snapshots.get_profile_ids(snapshot, 40, LISTING_PAGE_SIZE, fetch_listing_page))
+
+    assert starts == [40]
+
+
+def test_paginating_fetches_listing_pages_in_batches():
+    snapshots = ConnectionsSnapshots(max_size=10, ttl=60, batch_pages=3)
+    fetch_listing_page, starts = make_listing(200)
+    snapshot = snapshots.get_snapshot("account")
+    asyncio.run(snapshots.get_profile_ids(snapshot, 0, LISTING_PAGE_SIZE, fetch_listing_page))
+
+    snapshot = snapshots.get_snapshot("account", snapshot_id=snapshot.snapshot_id, offset=40)
+    profile_ids = asyncio.run(
+        snapshots.get_profile_ids(snapshot, 40, LISTING_PAGE_SIZE, fetch_listing_page)
+    )
+
+    assert profile_ids == [f"p{index}" for index in range(40, 80)]
+    assert starts == [0, 40, 80, 120]
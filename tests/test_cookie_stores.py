@@ -0,0 +1,59 @@
+from linkedin_scraper.scraper.cookie_stores import (CachedCookieStore,
+                                                    KeyValueCookieStore,
+                                                    LocalKeyValueClient,
+                                                    MemoryCookieStore,
+                                                    SQLiteCookieStore)
+
+OLD_COOKIES = [{"name": "li_at", "value": "old"}]
+NEW_COOKIES = [{"name": "li_at", "value": "new"}]
+
+
+def test_sqlite_workers_see_cookies_set_again_after_delete(tmp_path):
+    # Two workers of a host, each with its own cached store on the same database
+    path = str(tmp_path / "cookies.db")
+    worker_a = CachedCookieStore(SQLiteCookieStore(path))
+    worker_b = CachedCookieStore(SQLiteCookieStore(path))
+
+    worker_a.set("account", OLD_COOKIES)
+    assert worker_b.get("account") == OLD_COOKIES
+
+    worker_a.delete("account")
+    worker_a.set("account", NEW_COOKIES)
+    assert worker_b.get("account") == NEW_COOKIES
+
+
+def test_sqlite_version_changes_on_every_write(tmp_path):
+    store = SQLiteCookieStore(str(tmp_path / "cookies.db"))
+    assert store.version("account") is None
+
+    store.set("account", OLD_COOKIES)
+    first_version = store.version("account")
+    store.delete("account")
+    assert store.version("account") is None
+
+    store.set("account", OLD_COOKIES)
+    assert store.version("account") != first_version
+
+
+def test_key_value_workers_see_cookies_set_again_after_delete():
+    client = LocalKeyValueClient()
+    worker_a = CachedCookieStore(KeyValueCookieStore(client))
+    worker_b = CachedCookieStore(KeyValueCookieStore(client))
+
+    worker_a.set("account", OLD_COOKIES)
+    assert worker_b.get("account") == OLD_COOKIES
+
+    worker_a.delete("account")
+    worker_a.set("account", NEW_COOKIES)
+    assert worker_b.get("account") == NEW_COOKIES
+
+
+def test_memory_version_is_not_reused_after_delete():
+    store = MemoryCookieStore(max_size=2)
+    store.set("account", OLD_COOKIES)
+    first_version = store.version("account")
+    store.delete("account")
+
+    store.set("account", NEW_COOKIES)
+    assert store.version("account") != first_version
+    assert store.get("account") == NEW_COOKIES
@@ -0,0 +1,13 @@
+from linkedin_scraper.scraper.fields import keep_identifier, select_fields
+
+
+def test_keep_identifier_adds_the_public_id_left_out_by_the_fields():
+    profile_data = select_fields({"public_id": "jane", "email": "jane@example.com"}, ["email"])
+
+    assert keep_identifier(profile_data, "jane") == {"public_id": "jane", "email": "jane@example.com"}
+
+
+def test_keep_identifier_keeps_the_scraped_public_id():
+    profile_data = {"public_id": "jane", "full_name": "Jane Doe"}
+
+    assert keep_identifier(profile_data, "other") is profile_data
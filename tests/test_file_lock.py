@@ -0,0 +1,33 @@
+import asyncio
+
+from linkedin_scraper.scraper.utils import async_file_lock
+
+
+def test_file_lock_lets_one_coroutine_in_at_a_time(tmp_path):
+    lock_path = str(tmp_path / "account.lock")
+    events = []
+
+    async def login(name: str):
+        async with async_file_lock(lock_path):
+            events.append("enter %s" % name)
+            # Not blocking the event loop, the other coroutine keeps waiting
+            await asyncio.sleep(0.05)
+            events.append("exit %s" % name)
+
+    async def ticker():
+        ticks = 0
+        while len(events) < 4:
+            ticks += 1
+            await asyncio.sleep(0.005)
+        return ticks
+
+    async def contend():
+        results = await asyncio.gather(login("a"), login("b"), ticker())
+        return results[2]
+
+    ticks = asyncio.run(contend())
+    assert events in (
+        ["enter a", "exit a", "enter b", "exit b"],
+        ["enter b", "exit b", "enter a", "exit a"],
+    )
+    assert ticks > 5
@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.exceptions import RequestFailedException
+from linkedin_scraper.scraper.requests import request as request_module
+from linkedin_scraper.scraper.requests.circuit_breaker import CircuitBreakers
+from linkedin_scraper.scraper.requests.hedging import RequestHedger
+from linkedin_scraper.scraper.requests.limiter import ConcurrencyLimiter
+from linkedin_scraper.scraper.requests.request import Request
+
+PROFILE_URL = "https://www.linkedin.com/voyager/api/identity/profiles/jane/profileView"
+ENDPOINT = "identity/profiles"
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {}
+
+
+class StubRequest(Request):
+    def __init__(self, primary_fails: bool = False, primary_hangs: bool = False):
+        super().__init__(account="account")
+        self.primary_fails = primary_fails
+        self.primary_hangs = primary_hangs
+
+    async def _send(self, proxy: str = None, lane: str = None, **request_kwargs):
+        if lane is None and self.primary_hangs:
+            await asyncio.Event().wait()
+        if lane is None and self.primary_fails:
+            raise RequestFailedException("network error")
+        return FakeResponse(), {}
+
+
+def make_hedger(monkeypatch, latencies: list = ()) -> RequestHedger:
+    hedger = RequestHedger(enabled=True, percentile=95, min_samples=1, window=10,
+                           budget_ratio=1, max_budget=10)
+    for latency in latencies:
+        hedger.observe(ENDPOINT, latency)
+    monkeypatch.setattr(request_module, "REQUEST_HEDGER", hedger)
+    return hedger
+
+
+def send_hedged(request: Request):
+    async def send():
+        result = await request._send_hedged(url=PROFILE_URL, method="GET")
+        # Letting the done callbacks of the cancelled request run
+        await asyncio.sleep(0)
+        return result
+
+    return asyncio.run(send())
+
+
+def test_completed_requests_are_observed(monkeypatch):
+    hedger = make_hedger(monkeypatch)
+
+    send_hedged(StubRequest())
+
+    assert len(hedger._latencies[ENDPOINT]) == 1
+
+
+def test_failed_requests_are_not_observed(monkeypatch):
+    hedger = make_hedger(monkeypatch)
+
+    with pytest.raises(RequestFailedException):
+        send_hedged(StubRequest(primary_fails=True))
+
+    assert not hedger._latencies[ENDPOINT]
+
+
+def test_requests_cancelled_by_a_winning_hedge_are_observed_as_a_lower_bound(monkeypatch):
+    hedger = make_hedger(monkeypatch, latencies=[0.05])
+
+    response, _ = send_hedged(StubRequest(primary_hangs=True))
+
+    assert response.status_code == 200
+    latencies = list(hedger._latencies[ENDPOINT])
+    assert len(latencies) == 2
+    # The request was only cancelled once it had run for the hedging delay
+    assert latencies[1] >= 0.05
+
+
+def test_hedges_go_through_the_guards_of_their_proxy(monkeypatch):
+    make_hedger(monkeypatch, latencies=[0.0])
+    breakers = CircuitBreakers(failure_threshold=5, open_seconds=60, half_open_probes=1)
+    limiter = ConcurrencyLimiter(
+        account_limit=5, proxy_limit=5, min_limit=1, max_account_limit=5, max_proxy_limit=5,
+        backoff=0.5, latency_tolerance=2.0, idle_timeout=60,
+    )
+    monkeypatch.setattr(request_module, "CIRCUIT_BREAKERS", breakers)
+    monkeypatch.setattr(request_module, "CONCURRENCY_LIMITER", limiter)
+    monkeypatch.setattr(request_module.PROXY_POOL, "get_hedge_proxy", lambda proxy: "http://hedge")
+
+    send_hedged(StubRequest(primary_hangs=True))
+
+    assert "proxy:http://hedge" in breakers._breakers
+    assert ("proxy", "http://hedge") in limiter._windows
+    # The cancelled request left no outcome on its own proxy
+    assert limiter._windows[("proxy", "direct")].latency is None
@@ -0,0 +1,149 @@
+import asyncio
+
+import pytest
+from curl_cffi.requests import Cookies
+
+from linkedin_scraper.exceptions import (LoginChallengeException,
+                                         LoginFailedException)
+from linkedin_scraper.scraper import login as login_module
+from linkedin_scraper.scraper.cookie_stores import MemoryCookieStore
+from linkedin_scraper.scraper.http_login import HttpLogin
+from linkedin_scraper.scraper.login import Login
+from linkedin_scraper.scraper.requests.response import Response
+from linkedin_scraper.scraper.utils import extract_hidden_inputs
+
+LOGIN_PAGE = """
+<form class="login__form" action="/checkpoint/lg/login-submit" method="post">
+  <input name="session_key" type="text">
+  <input type="hidden" name="loginCsrfParam" value="csrf-123">
+  <input type="hidden" name="ac" value="0">
+  <input type="hidden" name="sIdString" value="a&amp;b">
+  <input type="hidden" name="controlId">
+</form>
+"""
+
+
+def make_response(text: str = "", status_code: int = 200, headers: dict = None,
+                  cookies: dict = None) -> Response:
+    response_cookies = Cookies()
+    for name, value in (cookies or {}).items():
+        response_cookies.set(name, value, domain=".linkedin.com")
+    return Response(status_code=status_code, content=text.encode(), text=text,
+                    cookies=response_cookies, headers=headers or {})
+
+
+class StubRequest:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.sent = []
+
+    async def fetch(self, **kwargs):
+        self.sent.append(kwargs)
+        return self.responses.pop(0)
+
+
+def login_with(*responses) -> tuple:
+    http_login = HttpLogin(email="jane@example.com", password="secret")
+    http_login.request = StubRequest(*responses)
+    return http_login, asyncio.run(http_login.login())
+
+
+def test_hidden_inputs_are_extracted_and_unescaped():
+    hidden_inputs = extract_hidden_inputs(make_response(LOGIN_PAGE))
+
+    assert hidden_inputs == {
+        "loginCsrfParam": "csrf-123", "ac": "0", "sIdString": "a&b", "controlId": "",
+    }
+
+
+def test_login_submits_the_form_and_returns_the_cookies():
+    login_page = make_response(LOGIN_PAGE, cookies={"bcookie": "b", "JSESSIONID": '"ajax:1"'})
+    submit = make_response(status_code=303, headers={"location": "https://www.linkedin.com/feed/"},
+                           cookies={"li_at": "token"})
+
+    http_login, raw_cookies = login_with(login_page, submit)
+
+    submitted = http_login.request.sent[1]
+    assert submitted["data"]["loginCsrfParam"] == "csrf-123"
+    assert submitted["data"]["session_key"] == "jane@example.com"
+    assert submitted["cookies"] == {"bcookie": "b", "JSESSIONID": '"ajax:1"'}
+    assert {cookie["name"]: cookie["value"] for cookie in raw_cookies} == {
+        "bcookie": "b", "JSESSIONID": '"ajax:1"', "li_at": "token",
+    }
+
+
+def test_challenge_redirect_raises_a_challenge():
+    submit = make_response(status_code=303, headers={
+        "location": "https://www.linkedin.com/checkpoint/challenge/AgE"
+    })
+
+    with pytest.raises(LoginChallengeException):
+        login_with(make_response(LOGIN_PAGE), submit)
+
+
+def test_login_page_without_form_raises_a_challenge():
+    with pytest.raises(LoginChallengeException):
+        login_with(make_response("<html>captcha</html>"))
+
+
+def test_rejected_credentials_raise_a_failed_login():
+    submit = make_response('<div id="error-for-password">Wrong password</div>')
+
+    with pytest.raises(LoginFailedException):
+        login_with(make_response(LOGIN_PAGE), submit)
+
+
+class StubLogin(Login):
+    def __init__(self, http_error: Exception = None):
+        super().__init__(email="jane@example.com", password="secret",
+                         cookie_store=MemoryCookieStore())
+        self.http_error = http_error
+        self.browser_logins = 0
+
+    async def _login_with_http(self) -> dict:
+        if self.http_error:
+            raise self.http_error
+        return {"li_at": "http"}
+
+    def _login_with_browser(self) -> dict:
+        self.browser_logins += 1
+        return {"li_at": "browser"}
+
+
+@pytest.fixture
+def lock_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(login_module, "CACHE_DIR", str(tmp_path))
+
+
+def test_http_first_falls_back_to_the_browser_on_a_challenge(lock_dir, monkeypatch):
+    monkeypatch.setattr(login_module.settings, "LOGIN_STRATEGY", "http_first")
+    login = StubLogin(http_error=LoginChallengeException("challenge"))
+
+    assert asyncio.run(login.alogin()) == {"li_at": "browser"}
+    assert login.browser_logins == 1
+
+
+def test_http_first_doesnt_use_the_browser_after_an_http_login(lock_dir, monkeypatch):
+    monkeypatch.setattr(login_module.settings, "LOGIN_STRATEGY", "http_first")
+    login = StubLogin()
+
+    assert asyncio.run(login.alogin()) == {"li_at": "http"}
+    assert login.browser_logins == 0
+
+
+def test_http_first_doesnt_fall_back_on_rejected_credentials(lock_dir, monkeypatch):
+    monkeypatch.setattr(login_module.settings, "LOGIN_STRATEGY", "http_first")
+    login = StubLogin(http_error=LoginFailedException("rejected"))
+
+    with pytest.raises(LoginFailedException):
+        asyncio.run(login.alogin())
+    assert login.browser_logins == 0
+
+
+def test_http_strategy_never_uses_the_browser(lock_dir, monkeypatch):
+    monkeypatch.setattr(login_module.settings, "LOGIN_STRATEGY", "http")
+    login = StubLogin(http_error=LoginChallengeException("challenge"))
+
+    with pytest.raises(LoginChallengeException):
+        asyncio.run(login.alogin())
+    assert login.browser_logins == 0
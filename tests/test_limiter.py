@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+
+from linkedin_scraper.scraper.requests.limiter import (AdaptiveLimit,
+                                                       ConcurrencyLimiter)
+
+
+def make_limit(limit: float = 4, **kwargs) -> AdaptiveLimit:
+    options = {"min_limit": 1, "max_limit": 8, "backoff": 0.5, "latency_tolerance": 2.0}
+    options.update(kwargs)
+    return AdaptiveLimit(limit=limit, **options)
+
+
+def send(limit: AdaptiveLimit, status_code: int, latency: float = 0.1, in_flight: int = None):
+    """
+    Takes and gives back a slot, with `in_flight` other requests running.
+    """
+    started_at = time.monotonic()
+    limit.in_flight = (limit._window() - 1 if in_flight is None else in_flight) + 1
+    limit.release(started_at, status_code, latency)
+
+
+def test_healthy_responses_grow_a_full_window_additively():
+    limit = make_limit(limit=4)
+    send(limit, 200)
+
+    assert limit.limit == pytest.approx(4.25)
+
+
+def test_unused_window_doesnt_grow():
+    limit = make_limit(limit=4)
+    send(limit, 200, in_flight=0)
+
+    assert limit.limit == 4
+
+
+def test_slow_responses_hold_the_window():
+    limit = make_limit(limit=4)
+    send(limit, 200, latency=0.1)
+    grown_limit = limit.limit
+    send(limit, 200, latency=1.0)
+
+    assert limit.limit == grown_limit
+
+
+def test_window_grows_up_to_the_ceiling():
+    limit = make_limit(limit=7.9, max_limit=8)
+    for _ in range(10):
+        send(limit, 200)
+
+    assert limit.limit == 8
+
+
+@pytest.mark.parametrize("status_code", [429, 999, 503])
+def test_throttles_and_server_errors_cut_the_window(status_code):
+    limit = make_limit(limit=4)
+    send(limit, status_code)
+
+    assert limit.limit == 2
+
+
+def test_window_is_cut_down_to_the_floor():
+    limit = make_limit(limit=4, min_limit=1.5)
+    for _ in range(5):
+        limit.last_backoff = 0.0
+        send(limit, 429)
+
+    assert limit.limit == 1.5
+
+
+def test_throttle_burst_cuts_the_window_once():
+    limit = make_limit(limit=8)
+    started_at = time.monotonic()
+    limit.in_flight = 8
+    for _ in range(8):
+        # All sent with the previous limit
+        limit.release(started_at, 429, 0.1)
+
+    assert limit.limit == 4
+    assert limit.in_flight == 0
+
+
+def test_cancelled_requests_leave_the_window_alone():
+    limit = make_limit(limit=4)
+    send(limit, None)
+
+    assert limit.limit == 4
+    assert limit.latency is None
+
+
+def test_requests_wait_for_a_free_slot():
+    limiter = ConcurrencyLimiter(
+        account_limit=1, proxy_limit=4, min_limit=1, max_account_limit=1, max_proxy_limit=4,
+        backoff=0.5, latency_tolerance=2.0, idle_timeout=60,
+    )
+    order = []
+
+    async def request(name: str):
+        async with limiter.slot(account="account") as permit:
+            order.append("start %s" % name)
+            await asyncio.sleep(0.01)
+            order.append("end %s" % name)
+            permit.status_code = 200
+
+    async def send_two_requests():
+        await asyncio.gather(request("a"), request("b"))
+
+    asyncio.run(send_two_requests())
+    assert order == ["start a", "end a", "start b", "end b"]
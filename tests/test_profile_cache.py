@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+from linkedin_scraper.scraper.profile_cache import ProfileCache, SQLiteProfileStore
+
+
+class ThreadRecordingStore(SQLiteProfileStore):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.threads = []
+
+    def get(self, key: str) -> tuple:
+        self.threads.append(threading.current_thread())
+        return super().get(key)
+
+    def set(self, key: str, data: dict, stored_at: float, expires_at: float):
+        self.threads.append(threading.current_thread())
+        super().set(key, data, stored_at, expires_at)
+
+
+def test_disk_tier_runs_off_the_event_loop(tmp_path):
+    disk_store = ThreadRecordingStore(str(tmp_path / "profiles.db"))
+    writer = ProfileCache(enabled=True, max_size=10, ttl=60, disk_store=disk_store)
+    reader = ProfileCache(enabled=True, max_size=10, ttl=60, disk_store=disk_store)
+    data = {"full_name": "Jane Doe"}
+
+    asyncio.run(writer.set("account", "profileView", "jane", data))
+    assert asyncio.run(reader.get("account", "profileView", "jane")) == data
+
+    assert len(disk_store.threads) == 2
+    assert threading.main_thread() not in disk_store.threads
+
+
+def test_profile_details_are_shared_and_contact_details_scoped():
+    cache = ProfileCache(enabled=True, max_size=10, ttl=60)
+
+    async def fill_and_read():
+        await cache.set("account_a", "profileView", "jane", {"full_name": "Jane Doe"})
+        await cache.set("account_a", "profileContactInfo", "jane", {"email": "jane@example.com"})
+        return (await cache.get("account_b", "profileView", "jane"),
+                await cache.get("account_b", "profileContactInfo", "jane"))
+
+    profile_view, contact_info = asyncio.run(fill_and_read())
+
+    assert profile_view == {"full_name": "Jane Doe"}
+    assert contact_info is None
@@ -0,0 +1,29 @@
+import time
+
+from linkedin_scraper.scraper.account_pool import AccountPool
+from linkedin_scraper.scraper.profile_scraper import (POOL_SCOPE,
+                                                      LinkedinProfileScraper)
+from linkedin_scraper.scraper.sessions import LinkedinSession
+
+
+def make_scraper() -> LinkedinProfileScraper:
+    account_pool = AccountPool(
+        accounts=[{"email": "service@example.com", "password": "secret"}],
+        cooldown=60, max_cooldown=900, max_error_rate=0.5, smoothing=0.2,
+    )
+    session = LinkedinSession(account_id="caller", cookies={"li_at": "x"}, csrf_token="token")
+    return LinkedinProfileScraper(session=session, account_pool=account_pool)
+
+
+def test_only_the_profile_view_uses_the_account_pool():
+    scraper = make_scraper()
+
+    assert scraper._get_account_scope("profileView") == POOL_SCOPE
+    assert scraper._get_account_scope("profileContactInfo") == "caller"
+
+
+def test_resting_account_pool_falls_back_to_the_caller_scope():
+    scraper = make_scraper()
+    scraper.account_pool.accounts[0].cooldown_until = time.monotonic() + 60
+
+    assert scraper._get_account_scope("profileView") == "caller"
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.scraper.requests.rate_limiter import (RateLimiter,
+                                                            TokenBucket)
+
+
+def test_bucket_lets_the_burst_through_then_paces():
+    bucket = TokenBucket(rate=2, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+    # Tokens are reserved ahead, so the next caller waits behind it
+    assert bucket.reserve() == pytest.approx(1.0, abs=0.01)
+
+
+def test_bucket_refills_up_to_the_burst():
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.reserve()
+
+    bucket.updated_at -= 60
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+def test_zero_rate_disables_the_pacing():
+    limiter = RateLimiter(account_rate=0, account_burst=1, proxy_rate=0, proxy_burst=1)
+
+    async def send_requests():
+        for _ in range(100):
+            await asyncio.wait_for(limiter.wait(account="account"), timeout=1)
+
+    asyncio.run(send_requests())
+    assert not limiter._buckets
+
+
+def test_cancelled_wait_refunds_its_tokens():
+    limiter = RateLimiter(account_rate=1, account_burst=1, proxy_rate=1, proxy_burst=1)
+
+    async def cancel_a_wait():
+        await limiter.wait(account="account")
+        waiting = asyncio.ensure_future(limiter.wait(account="account"))
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+    asyncio.run(cancel_a_wait())
+    for bucket in limiter._buckets.values():
+        # Only the first request spent a token
+        assert bucket.tokens == pytest.approx(0, abs=0.05)
+
+
+def test_refilled_buckets_are_evicted():
+    limiter = RateLimiter(account_rate=2, account_burst=3, proxy_rate=0, proxy_burst=1)
+
+    async def send_requests():
+        await limiter.wait(account="idle")
+        await limiter.wait(account="busy")
+        limiter._buckets[("account", "idle")].updated_at -= 60
+        await limiter.wait(account="new")
+
+    asyncio.run(send_requests())
+    assert set(limiter._buckets) == {("account", "busy"), ("account", "new")}
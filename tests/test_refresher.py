@@ -0,0 +1,61 @@
+from datetime import datetime, timezone
+
+from linkedin_scraper.scraper.refresher import SessionRefresher
+
+JANUARY_1 = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def make_refresher(off_peak_hours: list) -> SessionRefresher:
+    return SessionRefresher(registry=None, margin=0, jitter=HOUR,
+                            off_peak_hours=off_peak_hours, interval=60)
+
+
+def test_refresh_is_planned_in_the_last_window_before_the_deadline():
+    refresher = make_refresher([1, 5])
+
+    for _ in range(20):
+        planned_at = refresher._plan_refresh(JANUARY_1 + 2 * DAY + 12 * HOUR, JANUARY_1)
+        assert JANUARY_1 + 2 * DAY + HOUR <= planned_at <= JANUARY_1 + 2 * DAY + 5 * HOUR
+
+
+def test_window_is_cut_at_the_deadline():
+    refresher = make_refresher([1, 5])
+
+    for _ in range(20):
+        planned_at = refresher._plan_refresh(JANUARY_1 + 2 * DAY + 3 * HOUR, JANUARY_1)
+        assert JANUARY_1 + 2 * DAY + HOUR <= planned_at <= JANUARY_1 + 2 * DAY + 3 * HOUR
+
+
+def test_window_crossing_midnight():
+    refresher = make_refresher([22, 4])
+
+    for _ in range(20):
+        planned_at = refresher._plan_refresh(JANUARY_1 + 2 * DAY + 12 * HOUR, JANUARY_1)
+        assert JANUARY_1 + DAY + 22 * HOUR <= planned_at <= JANUARY_1 + 2 * DAY + 4 * HOUR
+
+
+def test_window_crossing_midnight_started_before_now():
+    refresher = make_refresher([22, 4])
+    now = JANUARY_1 + 2 * HOUR
+
+    for _ in range(20):
+        planned_at = refresher._plan_refresh(JANUARY_1 + 12 * HOUR, now)
+        assert now <= planned_at <= JANUARY_1 + 4 * HOUR
+
+
+def test_without_window_before_the_deadline_the_refresh_is_jittered():
+    refresher = make_refresher([1, 5])
+    now = JANUARY_1 + 6 * HOUR
+    deadline = JANUARY_1 + 12 * HOUR
+
+    for _ in range(20):
+        planned_at = refresher._plan_refresh(deadline, now)
+        assert deadline - HOUR <= planned_at <= deadline
+
+
+def test_passed_deadline_refreshes_now():
+    refresher = make_refresher([1, 5])
+
+    assert refresher._plan_refresh(JANUARY_1 - HOUR, JANUARY_1) == JANUARY_1
@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         InvalidFieldsException,
+                                         InvalidResponseException,
+                                         LoginChallengeException,
+                                         LoginFailedException,
+                                         NotFoundException,
+                                         RequestFailedException,
+                                         SessionExpiredException,
+                                         ThrottledException)
+from linkedin_scraper.scraper import retry_policy
+from linkedin_scraper.scraper.retry_policy import (classify_failure,
+                                                   retry_budget,
+                                                   retry_voyager_call)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(retry_policy.settings, "RETRY", 3)
+    monkeypatch.setattr(retry_policy.settings, "RETRY_BASE_WAIT", 0)
+    monkeypatch.setattr(retry_policy.settings, "RETRY_MAX_WAIT", 30)
+
+
+def make_call(exception: BaseException):
+    attempts = []
+
+    @retry_voyager_call
+    async def call():
+        attempts.append(1)
+        raise exception
+
+    return call, attempts
+
+
+@pytest.mark.parametrize("exception, failure", [
+    (SessionExpiredException(), "auth"),
+    (LoginFailedException(), "auth"),
+    (LoginChallengeException(), "auth"),
+    (NotFoundException(), "not_found"),
+    (ThrottledException(), "throttled"),
+    (CircuitOpenException(), "circuit_open"),
+    (RequestFailedException(), "transient"),
+    (InvalidResponseException(), "transient"),
+    (InvalidFieldsException(), "fatal"),
+    (asyncio.CancelledError(), "cancelled"),
+    (KeyError("data"), "unknown"),
+])
+def test_classify_failure(exception, failure):
+    assert classify_failure(exception) == failure
+
+
+def test_retryable_failures_stop_at_the_attempt_cap():
+    call, attempts = make_call(RequestFailedException("network error"))
+
+    with pytest.raises(RequestFailedException):
+        asyncio.run(call())
+    assert len(attempts) == 3
+
+
+def test_fatal_failures_are_not_retried():
+    call, attempts = make_call(NotFoundException("gone"))
+
+    with pytest.raises(NotFoundException):
+        asyncio.run(call())
+    assert len(attempts) == 1
+
+
+def test_failed_logins_are_not_retried():
+    call, attempts = make_call(LoginFailedException("Wrong password"))
+
+    with pytest.raises(LoginFailedException):
+        asyncio.run(call())
+    assert len(attempts) == 1
+
+
+def test_retry_after_over_the_max_wait_is_not_retried():
+    call, attempts = make_call(ThrottledException("throttled", retry_after=60))
+
+    with pytest.raises(ThrottledException):
+        asyncio.run(call())
+    assert len(attempts) == 1
+
+
+def test_retries_stop_when_the_budget_is_spent():
+    call, attempts = make_call(RequestFailedException("network error"))
+
+    async def call_with_budget():
+        with retry_budget(1) as budget:
+            try:
+                await call()
+            finally:
+                assert budget.remaining == 0
+
+    with pytest.raises(RequestFailedException):
+        asyncio.run(call_with_budget())
+    assert len(attempts) == 2
+
+
+def test_cancelled_calls_are_not_retried():
+    call, attempts = make_call(asyncio.CancelledError())
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(call())
+    assert len(attempts) == 1
+
+
+def test_nested_calls_dont_multiply_the_attempts():
+    inner_call, inner_attempts = make_call(RequestFailedException("network error"))
+    outer_attempts = []
+
+    @retry_voyager_call
+    async def outer_call():
+        outer_attempts.append(1)
+        await inner_call()
+
+    with pytest.raises(RequestFailedException):
+        asyncio.run(outer_call())
+    assert len(outer_attempts) == 3
+    assert len(inner_attempts) == 3
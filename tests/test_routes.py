@@ -0,0 +1,45 @@
+import pytest
+from pydantic import ValidationError
+
+from linkedin_scraper.exceptions import (CircuitOpenException,
+                                         InvalidFieldsException,
+                                         LoginChallengeException,
+                                         LoginFailedException,
+                                         NotFoundException,
+                                         SessionExpiredException,
+                                         ThrottledException)
+from linkedin_scraper.web.routes import encode_stream_record, get_error_response
+from linkedin_scraper.web.schema import ConnectionsStreamModel
+
+
+@pytest.mark.parametrize("exe, status_code", [
+    (InvalidFieldsException("Unknown fields: nope"), 400),
+    (SessionExpiredException("Session expired"), 401),
+    (LoginFailedException("Wrong password"), 401),
+    (LoginChallengeException("Checkpoint challenge"), 403),
+    (NotFoundException("Profile not found"), 404),
+    (ThrottledException("Throttled", retry_after=1.5), 429),
+    (CircuitOpenException("Circuit open", retry_after=30), 503),
+    (ValueError("unexpected"), 500),
+])
+def test_error_responses(exe, status_code):
+    response = get_error_response(exe)
+
+    assert response.status_code == status_code
+
+
+def test_retry_later_errors_tell_when_to_retry():
+    response = get_error_response(ThrottledException("Throttled", retry_after=1.5))
+
+    assert response.headers["Retry-After"] == "2"
+
+
+def test_unknown_stream_format_is_rejected():
+    with pytest.raises(ValidationError):
+        ConnectionsStreamModel(x_api_key="key", stream_format="xml")
+
+
+def test_failed_profiles_are_their_own_server_sent_event():
+    record = {"failed": {"public_identifier": "p3", "error": "failed p3"}}
+
+    assert encode_stream_record(record, "sse").startswith("event: failed\n")
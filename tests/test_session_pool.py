@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.exceptions import RequestFailedException
+from linkedin_scraper.scraper.requests import request as request_module
+from linkedin_scraper.scraper.requests.request import Request
+from linkedin_scraper.scraper.requests.session_pool import SessionPool
+
+
+def test_failed_requests_dont_starve_the_pooled_session(monkeypatch):
+    pool = SessionPool(max_clients=2)
+    monkeypatch.setattr(request_module, "SESSION_POOL", pool)
+
+    async def send_three_requests():
+        request = Request(account="account")
+        for _ in range(3):
+            with pytest.raises(RequestFailedException):
+                await asyncio.wait_for(
+                    request._send(method="GET", url="http://127.0.0.1:9/"), timeout=10
+                )
+        await pool.close()
+
+    asyncio.run(send_three_requests())
+    assert not pool._sessions
+
+
+def test_retired_sessions_are_not_handed_out_again():
+    async def acquire_after_retire():
+        pool = SessionPool(max_clients=1)
+        pooled_session = pool.acquire(account="account")
+        pool.retire(pooled_session)
+        pool.release(pooled_session)
+        fresh_session = pool.acquire(account="account")
+        pool.release(fresh_session)
+        await pool.close()
+        return pooled_session, fresh_session
+
+    pooled_session, fresh_session = asyncio.run(acquire_after_retire())
+    assert fresh_session is not pooled_session
+    assert pooled_session.retired
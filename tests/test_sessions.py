@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from linkedin_scraper.scraper.sessions import LinkedinSession, SessionRegistry
+
+
+class FakeLogin:
+    def __init__(self):
+        self.discarded = []
+
+    def discard_cached_cookies(self, cookies: dict):
+        self.discarded.append((cookies, threading.current_thread()))
+
+
+def test_invalidate_discards_the_cookies_off_the_event_loop():
+    registry = SessionRegistry(ttl=60)
+    session = LinkedinSession(account_id="account", cookies={"li_at": "x"}, csrf_token="token")
+    login = FakeLogin()
+    registry._sessions["account"] = session
+    registry._logins["account"] = login
+
+    asyncio.run(registry.invalidate(session))
+
+    assert "account" not in registry._sessions
+    assert login.discarded == [({"li_at": "x"}, login.discarded[0][1])]
+    assert login.discarded[0][1] is not threading.main_thread()
+
+
+def test_invalidating_a_stale_session_keeps_the_current_one():
+    registry = SessionRegistry(ttl=60)
+    stale_session = LinkedinSession(account_id="account", cookies={"li_at": "old"}, csrf_token="token")
+    session = LinkedinSession(account_id="account", cookies={"li_at": "new"}, csrf_token="token")
+    login = FakeLogin()
+    registry._sessions["account"] = session
+    registry._logins["account"] = login
+
+    asyncio.run(registry.invalidate(stale_session))
+
+    assert registry._sessions["account"] is session
+    assert registry._logins["account"] is login
+    assert login.discarded == []
+
+
+def test_resolve_wraps_the_given_cookies_without_login():
+    registry = SessionRegistry(ttl=60)
+    cookies = {"li_at": "x", "JSESSIONID": '"ajax:1"'}
+
+    session = asyncio.run(registry.resolve(email="jane@example.com", password="secret", cookies=cookies))
+
+    assert session.cookies == cookies
+    assert session.csrf_token == "ajax:1"
+    assert not registry._sessions
+
+
+def test_account_locks_are_dropped_once_released():
+    registry = SessionRegistry(ttl=60)
+
+    async def lock_accounts():
+        async with registry._get_lock("account"):
+            # Every coroutine of an account waits on the same lock
+            assert registry._get_lock("account") is registry._get_lock("account")
+            assert len(registry._locks) == 1
+
+    asyncio.run(lock_accounts())
+    assert len(registry._locks) == 0
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from linkedin_scraper.scraper.single_flight import SingleFlight
+
+KEY = ("account", "profileView", "jane")
+
+
+class SlowCall:
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = False
+        self.release = None
+
+    async def __call__(self, value):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return value
+
+
+def test_identical_callers_share_one_call():
+    flights = SingleFlight()
+    call = SlowCall()
+
+    async def run_twice():
+        call.release = asyncio.Event()
+        first = asyncio.ensure_future(flights.run(KEY, call, "first"))
+        second = asyncio.ensure_future(flights.run(KEY, call, "second"))
+        await asyncio.sleep(0)
+        call.release.set()
+        return await asyncio.gather(first, second)
+
+    assert asyncio.run(run_twice()) == ["first", "first"]
+    assert call.calls == 1
+    assert not flights._flights
+
+
+def test_cancelled_caller_leaves_the_call_to_the_others():
+    flights = SingleFlight()
+    call = SlowCall()
+
+    async def cancel_one_caller():
+        call.release = asyncio.Event()
+        first = asyncio.ensure_future(flights.run(KEY, call, "first"))
+        second = asyncio.ensure_future(flights.run(KEY, call, "second"))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        call.release.set()
+        return await second
+
+    assert asyncio.run(cancel_one_caller()) == "first"
+    assert call.calls == 1
+    assert not call.cancelled
+
+
+def test_last_cancelled_caller_cancels_the_call():
+    flights = SingleFlight()
+    call = SlowCall()
+
+    async def cancel_every_caller():
+        call.release = asyncio.Event()
+        callers = [asyncio.ensure_future(flights.run(KEY, call, "first")) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        # Not joining the cancelled call
+        assert not flights._flights
+        await asyncio.sleep(0)
+
+        call.release.set()
+        return await flights.run(KEY, call, "second")
+
+    assert asyncio.run(cancel_every_caller()) == "second"
+    assert call.cancelled
+    assert call.calls == 2
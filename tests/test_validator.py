@@ -0,0 +1,68 @@
+import asyncio
+
+from linkedin_scraper.exceptions import RequestFailedException
+from linkedin_scraper.scraper import validator as validator_module
+from linkedin_scraper.scraper.validator import SessionValidator
+
+COOKIES = {"li_at": "token", "JSESSIONID": '"ajax:1"'}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+def stub_probe(monkeypatch, outcome) -> list:
+    """
+    Answers the probes with the `outcome` status code, or raises it.
+    """
+    probes = []
+
+    class StubRequest:
+        def __init__(self, account: str = None):
+            pass
+
+        async def fetch(self, **kwargs):
+            probes.append(kwargs)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return FakeResponse(outcome)
+
+    monkeypatch.setattr(validator_module, "Request", StubRequest)
+    return probes
+
+
+def check_twice(validator: SessionValidator) -> list:
+    async def check():
+        return [await validator.is_valid("account", COOKIES) for _ in range(2)]
+
+    return asyncio.run(check())
+
+
+def test_accepted_session_is_valid_and_cached(monkeypatch):
+    probes = stub_probe(monkeypatch, 200)
+
+    assert check_twice(SessionValidator(ttl=60)) == [True, True]
+    assert len(probes) == 1
+    assert probes[0]["headers"]["csrf-token"] == "ajax:1"
+
+
+def test_rejected_session_is_invalid_and_cached(monkeypatch):
+    probes = stub_probe(monkeypatch, 401)
+
+    assert check_twice(SessionValidator(ttl=60)) == [False, False]
+    assert len(probes) == 1
+
+
+def test_network_errors_count_as_valid_and_arent_cached(monkeypatch):
+    probes = stub_probe(monkeypatch, RequestFailedException("network error"))
+
+    assert check_twice(SessionValidator(ttl=60)) == [True, True]
+    assert len(probes) == 2
+
+
+def test_verdict_expires_after_the_ttl(monkeypatch):
+    probes = stub_probe(monkeypatch, 200)
+
+    check_twice(SessionValidator(ttl=0))
+    assert len(probes) == 2